@@ -28,7 +28,7 @@ if config.config_file_name is not None:
 
 # Import your models here for autogenerate support
 from app.db.base import Base
-from app.db.models import User, Resume, Analysis  # noqa: F401
+from app.db.models import User, Resume, JobDescription, Analysis  # noqa: F401
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,28 @@
+"""Add analysis stage results
+
+Revision ID: 3c1f7e2a9b84
+Revises: a90cff73c35d
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f7e2a9b84'
+down_revision: Union[str, Sequence[str], None] = 'a90cff73c35d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analyses', sa.Column('stage_results', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analyses', 'stage_results')
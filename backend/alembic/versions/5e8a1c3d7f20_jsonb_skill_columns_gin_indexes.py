@@ -0,0 +1,63 @@
+"""Store skill JSON as JSONB with GIN indexes
+
+Revision ID: 5e8a1c3d7f20
+Revises: 7d2b4f0c1e55
+Create Date: 2026-10-19 13:42:05.118730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a1c3d7f20'
+down_revision: Union[str, Sequence[str], None] = '7d2b4f0c1e55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return  # JSON columns are queried with JSON1 expressions elsewhere
+
+    op.alter_column(
+        'resumes', 'parsed_data',
+        type_=postgresql.JSONB(), existing_type=sa.JSON(),
+        postgresql_using='parsed_data::jsonb',
+    )
+    op.alter_column(
+        'analyses', 'skill_gaps',
+        type_=postgresql.JSONB(), existing_type=sa.JSON(),
+        postgresql_using='skill_gaps::jsonb',
+    )
+    op.create_index(
+        'ix_resumes_parsed_data', 'resumes', ['parsed_data'],
+        unique=False, postgresql_using='gin', postgresql_ops={'parsed_data': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_analyses_skill_gaps', 'analyses', ['skill_gaps'],
+        unique=False, postgresql_using='gin', postgresql_ops={'skill_gaps': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_analyses_skill_gaps', table_name='analyses')
+    op.drop_index('ix_resumes_parsed_data', table_name='resumes')
+    op.alter_column(
+        'analyses', 'skill_gaps',
+        type_=sa.JSON(), existing_type=postgresql.JSONB(),
+        postgresql_using='skill_gaps::json',
+    )
+    op.alter_column(
+        'resumes', 'parsed_data',
+        type_=sa.JSON(), existing_type=postgresql.JSONB(),
+        postgresql_using='parsed_data::json',
+    )
@@ -0,0 +1,40 @@
+"""Add user/created_at keyset indexes
+
+Revision ID: 7d2b4f0c1e55
+Revises: 3c1f7e2a9b84
+Create Date: 2026-10-19 11:03:27.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b4f0c1e55'
+down_revision: Union[str, Sequence[str], None] = '3c1f7e2a9b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_resumes_user_id_created_at_id',
+        'resumes',
+        ['user_id', sa.text('created_at DESC'), 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_analyses_user_id_created_at_id',
+        'analyses',
+        ['user_id', sa.text('created_at DESC'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_analyses_user_id_created_at_id', table_name='analyses')
+    op.drop_index('ix_resumes_user_id_created_at_id', table_name='resumes')
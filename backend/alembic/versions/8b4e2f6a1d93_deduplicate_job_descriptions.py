@@ -0,0 +1,114 @@
+"""Deduplicate job descriptions into their own table
+
+Revision ID: 8b4e2f6a1d93
+Revises: 5e8a1c3d7f20
+Create Date: 2026-10-19 14:25:51.604417
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e2f6a1d93'
+down_revision: Union[str, Sequence[str], None] = '5e8a1c3d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+analyses = sa.table(
+    'analyses',
+    sa.column('id', sa.UUID()),
+    sa.column('job_description', sa.Text()),
+    sa.column('job_description_id', sa.String(64)),
+)
+job_descriptions = sa.table(
+    'job_descriptions',
+    sa.column('id', sa.String(64)),
+    sa.column('text', sa.Text()),
+)
+
+
+# SQLite rebuilds the table in batch mode; keep UUID columns typed as UUID
+# rather than the NUMERIC affinity reflection would give them. Columns given
+# here replace the reflected ones, so their foreign keys must be restated.
+UUID_COLUMNS = [
+    sa.Column('id', sa.UUID(), primary_key=True),
+    sa.Column('user_id', sa.UUID(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+    sa.Column('resume_id', sa.UUID(), sa.ForeignKey('resumes.id', ondelete='CASCADE'), nullable=False),
+]
+
+
+def _content_hash(text: str) -> str:
+    # Frozen copy of app.db.repositories.job_descriptions.job_description_hash
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.create_table('job_descriptions',
+    sa.Column('id', sa.String(length=64), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('parsed_data', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('analyses', sa.Column('job_description_id', sa.String(length=64), nullable=True))
+
+    # Backfill in batches: hash each analysis's text, store each distinct text once
+    seen = set()
+    last_id = None
+    while True:
+        query = sa.select(analyses.c.id, analyses.c.job_description).order_by(analyses.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(analyses.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+
+        new_jobs = []
+        for row in rows:
+            content_hash = _content_hash(row.job_description)
+            if content_hash not in seen:
+                seen.add(content_hash)
+                new_jobs.append({'id': content_hash, 'text': row.job_description})
+            bind.execute(
+                analyses.update()
+                .where(analyses.c.id == row.id)
+                .values(job_description_id=content_hash)
+            )
+        if new_jobs:
+            bind.execute(job_descriptions.insert(), new_jobs)
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('analyses', reflect_args=UUID_COLUMNS) as batch_op:
+        batch_op.alter_column('job_description_id', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index(batch_op.f('ix_analyses_job_description_id'), ['job_description_id'], unique=False)
+        batch_op.create_foreign_key(
+            'analyses_job_description_id_fkey', 'job_descriptions', ['job_description_id'], ['id']
+        )
+        batch_op.drop_column('job_description')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('analyses', sa.Column('job_description', sa.Text(), nullable=True))
+    op.execute(
+        analyses.update().values(
+            job_description=sa.select(job_descriptions.c.text)
+            .where(job_descriptions.c.id == analyses.c.job_description_id)
+            .scalar_subquery()
+        )
+    )
+    with op.batch_alter_table('analyses', reflect_args=UUID_COLUMNS) as batch_op:
+        batch_op.alter_column('job_description', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint('analyses_job_description_id_fkey', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_analyses_job_description_id'))
+        batch_op.drop_column('job_description_id')
+    op.drop_table('job_descriptions')
@@ -1,18 +1,32 @@
 # Agents Module
-from app.agents.base import get_llm_model, AGENT_RETRIES, DEFAULT_MODEL
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES, DEFAULT_MODEL
+from app.agents.cassette import Cassette, CassetteMissError
+from app.agents.retry import RetryBudget, RetryPolicy, retry_policy
 from app.agents.resume_parser import parse_resume, parse_resume_file, ParsedResumeData
 from app.agents.job_analyzer import analyze_job_description, ParsedJobData, RequiredSkill
 from app.agents.skill_gap import analyze_skill_gap, MatchAnalysis, SkillGap
 from app.agents.strategy_planner import plan_strategy, ImprovementStrategy, ImprovementAction
 from app.agents.content_generator import generate_content, GeneratedContent
 
-from app.agents.pipeline import run_analysis_pipeline, PipelineResult
+from app.agents.pipeline import (
+    run_analysis_pipeline,
+    PipelineResult,
+    PIPELINE_STAGES,
+    StageRecords,
+    stage_fingerprint,
+)
 
 __all__ = [
     # ... previous exports ...
     "get_llm_model",
+    "run_agent",
     "AGENT_RETRIES",
     "DEFAULT_MODEL",
+    "Cassette",
+    "CassetteMissError",
+    "RetryBudget",
+    "RetryPolicy",
+    "retry_policy",
     "parse_resume",
     "parse_resume_file",
     "ParsedResumeData",
@@ -29,4 +43,7 @@ __all__ = [
     "GeneratedContent",
     "run_analysis_pipeline",
     "PipelineResult",
+    "PIPELINE_STAGES",
+    "StageRecords",
+    "stage_fingerprint",
 ]
@@ -4,9 +4,15 @@ Pydantic AI Agent Base Configuration
 Configures the LLM model provider (OpenRouter) and common agent settings.
 """
 
+from openai import AsyncOpenAI
+from pydantic_ai import Agent
+from pydantic_ai.agent import AgentRunResult
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openai import OpenAIProvider
+from app.agents.cassette import cassette
+from app.agents.retry import retry_policy
 from app.core.config import settings
+from app.core.tracing import span
 from loguru import logger
 
 
@@ -23,19 +29,39 @@ def get_llm_model(model_name: str = "meta-llama/llama-3.3-70b-instruct:free") ->
     Returns:
         OpenAIChatModel configured for OpenRouter
     """
-    logger.debug(f"Initializing LLM model: {model_name}")
+    logger.debug("Initializing LLM model: {}", model_name)
     
-    # Create OpenAI-compatible provider pointing to OpenRouter
+    # Create OpenAI-compatible provider pointing to OpenRouter. The client's
+    # own retries are off: run_agent retries through the retry policy.
     provider = OpenAIProvider(
-        base_url=settings.openrouter_base_url,
-        api_key=settings.openrouter_api_key,
+        openai_client=AsyncOpenAI(
+            base_url=settings.openrouter_base_url,
+            api_key=settings.openrouter_api_key,
+            max_retries=0,
+        ),
     )
     
     return OpenAIChatModel(model_name, provider=provider)
 
 
+async def run_agent(agent: Agent, prompt: str) -> AgentRunResult:
+    """
+    Run an agent on a prompt inside an "agent.run" tracing span.
+
+    All agent calls go through here, so the span covers the model request
+    and pydantic-ai's own retries. Failed runs are retried by the retry
+    policy (app.agents.retry). With LLM_CASSETTE_MODE set, runs are
+    recorded to or replayed from a cassette (app.agents.cassette).
+    """
+    name = agent.name or "agent"
+    async with span("agent.run", agent=name):
+        if cassette is not None:
+            return await retry_policy.call(name, lambda: cassette.run(agent, prompt))
+        return await retry_policy.call(name, lambda: agent.run(prompt))
+
+
 # Common agent configuration
-AGENT_RETRIES = 3  # Number of retries for failed agent calls
+AGENT_RETRIES = 3  # Re-asks when the model's output fails validation (transport errors: app.agents.retry)
 DEFAULT_MODEL = "meta-llama/llama-3.3-70b-instruct:free"  # Free tier model
 
 
@@ -0,0 +1,196 @@
+"""
+LLM Cassettes
+
+Record agent interactions to a file and replay them later, so the pipeline
+can be debugged, profiled and regression-tested offline with real model
+outputs.
+
+- record: agents call the real model; every run is appended to the cassette
+  as one JSON line (agent, model, system prompt hash, prompt, output, usage,
+  latency). Paths ending in ".gz" are gzip-compressed.
+- replay: agents are answered from the cassette by a function model, matched
+  on (agent, system prompt hash, prompt hash). Repeated recordings of the
+  same request are served in recorded order, cycling. A request that was
+  never recorded raises CassetteMissError rather than calling the network.
+
+Only text-output agents are supported (all agents here use output_type=str).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import IO, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic_ai import Agent
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+from app.core.config import settings
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# (agent name, system prompt hash, prompt hash)
+InteractionKey = Tuple[str, str, str]
+
+
+class CassetteMissError(LookupError):
+    """Replay found no recorded interaction for a request."""
+
+
+def prompt_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _prompts(messages: List[ModelMessage]) -> Tuple[str, str]:
+    """(system prompt, user prompt) of a run's request messages."""
+    system, user = [], []
+    for message in messages:
+        if not isinstance(message, ModelRequest):
+            continue
+        for part in message.parts:
+            if isinstance(part, SystemPromptPart):
+                system.append(part.content)
+            elif isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                user.append(part.content)
+    return "\n".join(system), "\n".join(user)
+
+
+@dataclass
+class Interaction:
+    """One recorded agent run."""
+    agent: str
+    model: str
+    system_prompt_sha: str
+    prompt_sha: str
+    prompt: str
+    output: str
+    usage: Dict[str, int] = field(default_factory=dict)
+    latency_ms: float = 0.0
+
+    @property
+    def key(self) -> InteractionKey:
+        return (self.agent, self.system_prompt_sha, self.prompt_sha)
+
+
+class Cassette:
+    """
+    Records agent runs to, or replays them from, a JSON-lines file.
+
+    Args:
+        path: Cassette file (gzip-compressed if it ends in ".gz")
+        mode: MODE_RECORD or MODE_REPLAY
+        latency_scale: In replay, sleep this fraction of each recorded
+            latency before answering (0 = answer immediately)
+    """
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 0.0):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.interactions: Dict[InteractionKey, List[Interaction]] = defaultdict(list)
+        self._served: Dict[InteractionKey, int] = defaultdict(int)
+        if mode == MODE_REPLAY:
+            self.load()
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def load(self) -> None:
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    interaction = Interaction(**json.loads(line))
+                    self.interactions[interaction.key].append(interaction)
+        logger.info(f"Loaded {sum(map(len, self.interactions.values()))} interactions from cassette {self.path}")
+
+    def append(self, interaction: Interaction) -> None:
+        self.interactions[interaction.key].append(interaction)
+        # One short line per model call, which itself takes seconds
+        with self._open("a") as f:
+            f.write(json.dumps(asdict(interaction), separators=(",", ":")) + "\n")
+
+    def lookup(self, key: InteractionKey) -> Interaction:
+        recorded = self.interactions.get(key)
+        if not recorded:
+            raise CassetteMissError(
+                f"No recorded interaction for agent '{key[0]}' (system prompt {key[1]}, prompt {key[2]})"
+            )
+        index = self._served[key]
+        self._served[key] = index + 1
+        return recorded[index % len(recorded)]
+
+    async def run(self, agent: Agent, prompt: str) -> AgentRunResult:
+        if self.mode == MODE_RECORD:
+            return await self._record(agent, prompt)
+        return await self._replay(agent, prompt)
+
+    async def _record(self, agent: Agent, prompt: str) -> AgentRunResult:
+        start = time.perf_counter()
+        result = await agent.run(prompt)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        system, _ = _prompts(result.all_messages())
+        usage = result.usage()
+        self.append(Interaction(
+            agent=agent.name or "agent",
+            model=result.response.model_name or "",
+            system_prompt_sha=prompt_hash(system),
+            prompt_sha=prompt_hash(prompt),
+            prompt=prompt,
+            output=str(result.output),
+            usage={
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "requests": usage.requests,
+            },
+            latency_ms=round(latency_ms, 1),
+        ))
+        return result
+
+    async def _replay(self, agent: Agent, prompt: str) -> AgentRunResult:
+        name = agent.name or "agent"
+
+        async def respond(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+            system, user = _prompts(messages)
+            interaction = self.lookup((name, prompt_hash(system), prompt_hash(user)))
+            if self.latency_scale:
+                await asyncio.sleep(interaction.latency_ms / 1000 * self.latency_scale)
+            return ModelResponse(
+                parts=[TextPart(interaction.output)],
+                usage=RequestUsage(
+                    input_tokens=interaction.usage.get("input_tokens", 0),
+                    output_tokens=interaction.usage.get("output_tokens", 0),
+                ),
+                model_name=interaction.model,
+            )
+
+        with agent.override(model=FunctionModel(respond, model_name=f"cassette-{name}")):
+            return await agent.run(prompt)
+
+
+def _configured_cassette() -> Optional[Cassette]:
+    if not settings.llm_cassette_mode:
+        return None
+    return Cassette(settings.llm_cassette_path, settings.llm_cassette_mode, settings.llm_cassette_latency_scale)
+
+
+cassette = _configured_cassette()
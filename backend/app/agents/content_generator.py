@@ -10,7 +10,8 @@ from pydantic_ai import Agent
 from typing import List
 from loguru import logger
 
-from app.agents.base import get_llm_model, AGENT_RETRIES
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES
+from app.core.tracing import span
 from app.agents.resume_parser import ParsedResumeData
 from app.agents.job_analyzer import ParsedJobData
 from app.agents.strategy_planner import ImprovementStrategy
@@ -95,6 +96,7 @@ You MUST respond with ONLY valid JSON. Use this structure:
 
 content_agent = Agent(
     get_llm_model(),
+    name="content_generator",
     output_type=str,
     retries=AGENT_RETRIES,
     system_prompt=SYSTEM_PROMPT,
@@ -138,10 +140,11 @@ Generate the cold email, DM, interview questions, and pitch as valid JSON.
 """
 
     try:
-        result = await content_agent.run(prompt)
+        result = await run_agent(content_agent, prompt)
         
         json_data = extract_json_from_response(result.output)
-        content = GeneratedContent.model_validate(json_data)
+        with span("llm.validate", model="GeneratedContent"):
+            content = GeneratedContent.model_validate(json_data)
         
         logger.info("Content generation complete")
         return content
@@ -12,7 +12,8 @@ from pydantic_ai import Agent
 from typing import List, Optional
 from loguru import logger
 
-from app.agents.base import get_llm_model, AGENT_RETRIES
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES
+from app.core.tracing import span, traced
 
 
 class RequiredSkill(BaseModel):
@@ -68,12 +69,14 @@ Use this exact structure:
 # Create the agent
 job_analyzer_agent = Agent(
     get_llm_model(),
+    name="job_analyzer",
     output_type=str,  # String output for manual parsing
     retries=AGENT_RETRIES,
     system_prompt=SYSTEM_PROMPT,
 )
 
 
+@traced("llm.extract_json")
 def _extract_json_from_response(response: str) -> dict:
     """Helper to extract JSON from LLM response (handling markdown)."""
     # Try to extract JSON from markdown code blocks first
@@ -112,7 +115,8 @@ async def analyze_job_description(job_text: str) -> ParsedJobData:
     logger.info("Analyzing job description with AI agent")
     
     try:
-        result = await job_analyzer_agent.run(
+        result = await run_agent(
+            job_analyzer_agent,
             f"Analyze the following job description and extract requirements. Respond with ONLY valid JSON:\n\n{job_text}"
         )
         
@@ -120,7 +124,8 @@ async def analyze_job_description(job_text: str) -> ParsedJobData:
         json_data = _extract_json_from_response(result.output)
         
         # Validate with Pydantic
-        parsed_data = ParsedJobData.model_validate(json_data)
+        with span("llm.validate", model="ParsedJobData"):
+            parsed_data = ParsedJobData.model_validate(json_data)
         
         logger.info(f"Job analyzed successfully: {parsed_data.title} "
                    f"({len(parsed_data.required_skills)} skills found)")
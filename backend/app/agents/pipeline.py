@@ -3,17 +3,62 @@ Pipeline Orchestrator
 
 Orchestrates the flow of data between all agents:
 Resume -> Job -> Skill Gap -> Strategy -> Content
+
+Every stage output is recorded together with a fingerprint of its inputs, so
+a later run can reuse stages whose inputs have not changed.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+from pydantic import BaseModel
 from loguru import logger
 import asyncio
+import hashlib
+import json
 
-from app.agents.resume_parser import parse_resume, parse_resume_file, ParsedResumeData
+from app.agents.resume_parser import parse_resume, ParsedResumeData
 from app.agents.job_analyzer import analyze_job_description, ParsedJobData
 from app.agents.skill_gap import analyze_skill_gap, MatchAnalysis
 from app.agents.strategy_planner import plan_strategy, ImprovementStrategy
 from app.agents.content_generator import generate_content, GeneratedContent
+from app.utils.file_extraction import extract_text_from_file
+from app.core.tracing import span
+
+M = TypeVar("M", bound=BaseModel)
+
+# Stage names, in execution order
+STAGE_RESUME = "resume"
+STAGE_JOB = "job"
+STAGE_MATCH = "match"
+STAGE_STRATEGY = "strategy"
+STAGE_CONTENT = "content"
+PIPELINE_STAGES = (STAGE_RESUME, STAGE_JOB, STAGE_MATCH, STAGE_STRATEGY, STAGE_CONTENT)
+
+# Bump to invalidate every stored fingerprint (e.g. after prompt changes)
+FINGERPRINT_VERSION = 1
+
+# Stage statuses recorded in the checkpoint
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_PENDING = "pending"
+
+# Stored stage records:
+# {stage: {"fingerprint": str, "output": dict | None, "status": str, "error": str | None}}
+StageRecords = Dict[str, Dict[str, Any]]
+
+
+def stage_fingerprint(stage: str, *inputs: Any) -> str:
+    """
+    Compute a stable fingerprint for a stage and its inputs.
+
+    Inputs may be strings or Pydantic models (hashed by their JSON dump).
+    """
+    payload = [
+        value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+        for value in inputs
+    ]
+    raw = json.dumps([FINGERPRINT_VERSION, stage, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
 @dataclass
@@ -24,61 +69,196 @@ class PipelineResult:
     match_analysis: MatchAnalysis
     strategy: Optional[ImprovementStrategy] = None
     content: Optional[GeneratedContent] = None
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    reused_stages: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def failed_stages(self) -> List[str]:
+        return [stage for stage in PIPELINE_STAGES if stage in self.errors]
+
+    def to_stage_records(self) -> StageRecords:
+        """Serialize every stage output with its input fingerprint and status for storage."""
+        outputs = {
+            STAGE_RESUME: self.resume_data,
+            STAGE_JOB: self.job_data,
+            STAGE_MATCH: self.match_analysis,
+            STAGE_STRATEGY: self.strategy,
+            STAGE_CONTENT: self.content,
+        }
+        return {
+            stage: {
+                "fingerprint": self.fingerprints.get(stage),
+                "output": output.model_dump(mode="json") if output is not None else None,
+                "status": (
+                    STATUS_COMPLETED if output is not None
+                    else STATUS_FAILED if stage in self.errors
+                    else STATUS_PENDING
+                ),
+                "error": self.errors.get(stage),
+            }
+            for stage, output in outputs.items()
+        }
+
+
+class _StageRunner:
+    """Runs stages, reusing stored outputs whose fingerprint still matches."""
+
+    def __init__(self, previous: Optional[StageRecords], force: Iterable[str]):
+        self.previous = previous or {}
+        self.force = set(force)
+        self.fingerprints: Dict[str, str] = {}
+        self.reused: List[str] = []
+        self.errors: Dict[str, str] = {}
+
+    async def run(
+        self,
+        stage: str,
+        fingerprint: str,
+        model: Type[M],
+        compute: Callable[[], Awaitable[M]],
+    ) -> M:
+        self.fingerprints[stage] = fingerprint
+        record = self.previous.get(stage) or {}
+
+        async with span(f"stage.{stage}") as stage_span:
+            if (
+                stage not in self.force
+                and record.get("fingerprint") == fingerprint
+                and record.get("output") is not None
+            ):
+                try:
+                    output = model.model_validate(record["output"])
+                    logger.debug("Reusing stored output for stage '{}'", stage)
+                    self.reused.append(stage)
+                    stage_span.set(reused=True)
+                    return output
+                except Exception as e:
+                    logger.warning(f"Stored output for stage '{stage}' is invalid, recomputing: {e}")
+
+            return await compute()
+
+    async def attempt(
+        self,
+        stage: str,
+        fingerprint: str,
+        model: Type[M],
+        compute: Callable[[], Awaitable[M]],
+    ) -> Optional[M]:
+        """Like run(), but records a failure for the stage instead of raising."""
+        try:
+            return await self.run(stage, fingerprint, model, compute)
+        except Exception as e:
+            logger.error(f"Stage '{stage}' failed: {e}")
+            self.errors[stage] = f"{type(e).__name__}: {e}"
+            return None
+
+    def result(self, **outputs: Any) -> PipelineResult:
+        return PipelineResult(
+            **outputs,
+            fingerprints=dict(self.fingerprints),
+            reused_stages=list(self.reused),
+            errors=dict(self.errors),
+        )
+
+
+# Called with the partial result each time a stage after the skill gap analysis
+# completes or fails, so callers can persist progress.
+Checkpoint = Callable[[PipelineResult], Awaitable[None]]
 
 
 async def run_analysis_pipeline(
-    resume_text: str, 
-    job_description: str
+    resume_text: str,
+    job_description: str,
+    previous: Optional[StageRecords] = None,
+    force: Iterable[str] = (),
+    quick: bool = False,
+    checkpoint: Optional[Checkpoint] = None,
 ) -> PipelineResult:
     """
     Run the complete analysis pipeline with text inputs.
-    
+
     Args:
         resume_text: Raw resume text
         job_description: Raw job description
-        
+        previous: Stage records from an earlier run; stages whose input
+            fingerprint is unchanged are reused instead of re-run
+        force: Stage names to recompute even if their fingerprint matches
+        quick: Stop after the skill gap analysis; strategy and content are
+            left for a later (lazy) run
+        checkpoint: Awaited with the partial result after the skill gap
+            analysis and after each later stage completes or fails
+
     Returns:
         PipelineResult: Complete analysis artifact
     """
     logger.info("Starting analysis pipeline (Text Mode)")
-    
+    runner = _StageRunner(previous, force)
+
     # Run Parse and Analyze in parallel (they don't depend on each other)
     logger.debug("Step 1: Parsing Resume and Job Description")
-    resume_task = parse_resume(resume_text)
-    job_task = analyze_job_description(job_description)
-    
+    resume_task = runner.run(
+        STAGE_RESUME, stage_fingerprint(STAGE_RESUME, resume_text),
+        ParsedResumeData, lambda: parse_resume(resume_text),
+    )
+    job_task = runner.run(
+        STAGE_JOB, stage_fingerprint(STAGE_JOB, job_description),
+        ParsedJobData, lambda: analyze_job_description(job_description),
+    )
+
     resume_data, job_data = await asyncio.gather(resume_task, job_task)
-    
+
     # Step 2: Skill Gap Analysis (Validation)
     logger.debug("Step 2: Analyzing Skill Gap")
-    match_analysis = await analyze_skill_gap(resume_data, job_data)
-    
-    # Step 3: Strategy & Content (dependent on Gap Analysis)
-    # Wrapped in try/except to be robust against LLM failures (500s)
-    strategy = None
-    content = None
-    
-    try:
-        logger.debug("Step 3: Generating Strategy")
-        strategy = await plan_strategy(match_analysis, job_data)
-        
-        logger.debug("Step 4: Generating Content")
-        content = await generate_content(resume_data, job_data, strategy)
-        
-    except Exception as e:
-        logger.error(f"Strategy/Content generation failed: {e}")
-        # We continue with partial results (Analysis Score matches)
-    
-    logger.info(f"Pipeline complete. Match Score: {match_analysis.match_score}/100")
-    
-    return PipelineResult(
+    match_analysis = await runner.run(
+        STAGE_MATCH, stage_fingerprint(STAGE_MATCH, resume_data, job_data),
+        MatchAnalysis, lambda: analyze_skill_gap(resume_data, job_data),
+    )
+
+    outputs: Dict[str, Any] = dict(
         resume_data=resume_data,
         job_data=job_data,
         match_analysis=match_analysis,
-        strategy=strategy,
-        content=content
     )
 
+    result = runner.result(**outputs)
+    if checkpoint:
+        await checkpoint(result)
+
+    if quick:
+        logger.info(f"Pipeline complete (quick mode). Match Score: {match_analysis.match_score}/100")
+        return result
+
+    # Step 3: Strategy & Content (dependent on Gap Analysis)
+    # Failures are recorded per stage so they can be retried from the checkpoint
+    # later; the analysis is still saved with partial results (score and gaps).
+    logger.debug("Step 3: Generating Strategy")
+    strategy = await runner.attempt(
+        STAGE_STRATEGY, stage_fingerprint(STAGE_STRATEGY, match_analysis, job_data),
+        ImprovementStrategy, lambda: plan_strategy(match_analysis, job_data),
+    )
+    outputs["strategy"] = strategy
+
+    if strategy is not None:
+        if checkpoint:
+            await checkpoint(runner.result(**outputs))
+
+        logger.debug("Step 4: Generating Content")
+        outputs["content"] = await runner.attempt(
+            STAGE_CONTENT, stage_fingerprint(STAGE_CONTENT, resume_data, job_data, strategy),
+            GeneratedContent, lambda: generate_content(resume_data, job_data, strategy),
+        )
+
+    result = runner.result(**outputs)
+    if checkpoint:
+        await checkpoint(result)
+
+    logger.info(f"Pipeline complete. Match Score: {match_analysis.match_score}/100 "
+                f"(reused stages: {', '.join(runner.reused) or 'none'}; "
+                f"failed stages: {', '.join(result.failed_stages) or 'none'})")
+
+    return result
+
 
 async def run_file_analysis_pipeline(
     file_content: bytes,
@@ -89,37 +269,6 @@ async def run_file_analysis_pipeline(
     Run the complete analysis pipeline with a file input.
     """
     logger.info(f"Starting analysis pipeline (File Mode: {filename})")
-    
-    # Step 1: Parse
-    logger.debug("Step 1: Parsing Resume File and Job Description")
-    resume_task = parse_resume_file(file_content, filename)
-    job_task = analyze_job_description(job_description)
-    
-    resume_data, job_data = await asyncio.gather(resume_task, job_task)
-    
-    # Step 2: Analysis
-    logger.debug("Step 2: Analyzing Skill Gap")
-    match_analysis = await analyze_skill_gap(resume_data, job_data)
-    
-    # Step 3 & 4: Strategy/Content (Partial Failure Allowed)
-    strategy = None
-    content = None
-    
-    try:
-        logger.debug("Step 3: Generating Strategy")
-        strategy = await plan_strategy(match_analysis, job_data)
-        
-        logger.debug("Step 4: Generating Content")
-        content = await generate_content(resume_data, job_data, strategy)
-    except Exception as e:
-        logger.error(f"Strategy/Content generation failed: {e}")
 
-    logger.info(f"Pipeline complete. Match Score: {match_analysis.match_score}/100")
-    
-    return PipelineResult(
-        resume_data=resume_data,
-        job_data=job_data,
-        match_analysis=match_analysis,
-        strategy=strategy,
-        content=content
-    )
+    resume_text = extract_text_from_file(file_content, filename)
+    return await run_analysis_pipeline(resume_text, job_description)
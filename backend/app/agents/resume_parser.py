@@ -5,15 +5,18 @@ Extracts structured data from raw resume text using AI.
 Uses a manual JSON parsing approach for compatibility with free-tier OpenRouter models.
 """
 
+import asyncio
 import json
 import re
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from loguru import logger
 
-from app.agents.base import get_llm_model, AGENT_RETRIES
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES
+from app.core.tracing import span, traced
 from app.utils.file_extraction import extract_text_from_file, extract_text_from_upload
+from app.utils.resume_sections import segment_resume, HEADER_SECTION
 
 
 class Experience(BaseModel):
@@ -128,15 +131,36 @@ Use this exact structure:
 Be thorough but accurate. Only extract information that is explicitly stated in the resume."""
 
 
+# Section-aware parsing: resumes at least this long are split by section headers
+# and parsed with concurrent sub-prompts instead of one large prompt.
+SECTIONED_PARSE_MIN_CHARS = 4000
+
+# Section group -> (sections from segment_resume, ParsedResumeData fields it fills)
+SECTION_GROUPS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "profile": (
+        (HEADER_SECTION, "summary", "skills", "certifications", "languages"),
+        ("name", "email", "phone", "location", "summary", "skills", "certifications", "languages"),
+    ),
+    "experience": (("experience",), ("experience",)),
+    "education": (("education",), ("education",)),
+    "projects": (("projects", "extra_curricular"), ("projects", "extra_curricular")),
+}
+
+# Sections whose presence makes a split worthwhile (everything outside "profile")
+SECTIONED_PARSE_TRIGGERS = ("experience", "education", "projects", "extra_curricular")
+
+
 # Create the agent with string output (for free tier model compatibility)
 resume_parser_agent = Agent(
     get_llm_model(),
+    name="resume_parser",
     output_type=str,  # Use string output for free tier compatibility
     retries=AGENT_RETRIES,
     system_prompt=SYSTEM_PROMPT,
 )
 
 
+@traced("llm.extract_json")
 def _extract_json_from_response(response: str) -> dict:
     """
     Extract JSON from LLM response, handling markdown code blocks.
@@ -173,35 +197,115 @@ def _extract_json_from_response(response: str) -> dict:
         raise ValueError(f"Could not extract valid JSON from LLM response: {e}")
 
 
+async def _parse_section_group(group: str, fields: Tuple[str, ...], text: str) -> Dict[str, Any]:
+    """
+    Extract a subset of resume fields from the text of one section group.
+
+    Args:
+        group: Section group name (for logging)
+        fields: ParsedResumeData fields this group is responsible for
+        text: Resume text belonging to the group's sections
+
+    Returns:
+        Dictionary containing only the requested fields that the LLM returned
+    """
+    logger.debug("Parsing resume section group '{}' ({} characters)", group, len(text))
+
+    result = await run_agent(
+        resume_parser_agent,
+        f"Parse the following resume excerpt. Extract ONLY these fields: {', '.join(fields)}. "
+        f"Respond with ONLY valid JSON containing exactly those keys:\n\n{text}"
+    )
+    json_data = _extract_json_from_response(result.output)
+
+    return {field: json_data[field] for field in fields if json_data.get(field) is not None}
+
+
+async def _parse_resume_by_sections(sections: Dict[str, str]) -> ParsedResumeData:
+    """
+    Parse a segmented resume with one concurrent sub-prompt per section group.
+
+    Args:
+        sections: Output of segment_resume()
+
+    Returns:
+        ParsedResumeData merged from all section group results
+    """
+    group_texts = {}
+    for group, (section_names, fields) in SECTION_GROUPS.items():
+        text = "\n\n".join(sections[name] for name in section_names if name in sections)
+        if text:
+            group_texts[group] = (fields, text)
+
+    logger.info(f"Parsing resume by sections: {', '.join(group_texts)}")
+
+    # A TaskGroup cancels the other groups' LLM calls as soon as one fails,
+    # instead of letting them run (and spend tokens) behind the fallback
+    try:
+        async with asyncio.TaskGroup() as tasks:
+            results = [
+                tasks.create_task(_parse_section_group(group, fields, text))
+                for group, (fields, text) in group_texts.items()
+            ]
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0]
+
+    merged: Dict[str, Any] = {}
+    for partial in results:
+        merged.update(partial.result())
+
+    with span("llm.validate", model="ParsedResumeData"):
+        return ParsedResumeData.model_validate(merged)
+
+
 async def parse_resume(resume_text: str) -> ParsedResumeData:
     """
     Parse raw resume text into structured data.
-    
+
+    Long resumes with recognizable section headers are split into section
+    groups that are parsed concurrently, so latency tracks the largest
+    section rather than the whole document. Short resumes use a single call,
+    as do long ones whose sectioned parse fails.
+
     Args:
         resume_text: The raw text extracted from a resume PDF
-        
+
     Returns:
         ParsedResumeData with structured resume information
-        
+
     Raises:
         Exception: If parsing fails after retries
     """
     logger.info("Parsing resume with AI agent")
-    logger.debug(f"Resume text length: {len(resume_text)} characters")
-    
+    logger.debug("Resume text length: {} characters", len(resume_text))
+
+    if len(resume_text) >= SECTIONED_PARSE_MIN_CHARS:
+        sections = segment_resume(resume_text)
+        # Only worth splitting when something beyond the profile group was found
+        if any(name in sections for name in SECTIONED_PARSE_TRIGGERS):
+            try:
+                parsed_data = await _parse_resume_by_sections(sections)
+                logger.info(f"Resume parsed successfully. Found {len(parsed_data.skills)} skills, "
+                           f"{len(parsed_data.experience)} experiences")
+                return parsed_data
+            except Exception as e:
+                logger.warning(f"Sectioned resume parse failed, falling back to a single prompt: {e}")
+
     try:
-        result = await resume_parser_agent.run(
+        result = await run_agent(
+            resume_parser_agent,
             f"Parse the following resume and extract all relevant information. Respond with ONLY valid JSON:\n\n{resume_text}"
         )
         
         # Extract and parse JSON from response
         raw_response = result.output
-        logger.debug(f"Raw LLM response: {raw_response[:500]}...")
+        logger.debug("Raw LLM response: {}...", raw_response[:500])
         
         json_data = _extract_json_from_response(raw_response)
         
         # Validate with Pydantic model
-        parsed_data = ParsedResumeData.model_validate(json_data)
+        with span("llm.validate", model="ParsedResumeData"):
+            parsed_data = ParsedResumeData.model_validate(json_data)
         
         logger.info(f"Resume parsed successfully. Found {len(parsed_data.skills)} skills, "
                    f"{len(parsed_data.experience)} experiences")
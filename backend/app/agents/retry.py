@@ -0,0 +1,221 @@
+"""
+Agent Retry Policy
+
+Retries failed model calls according to why they failed, instead of a flat
+retry count:
+- rate_limit (429): wait for Retry-After (plus a little jitter) if the
+  provider sends one, else back off exponentially; a Retry-After longer
+  than the maximum delay fails fast.
+- server_error (5xx), timeout, connection: exponential backoff with full
+  jitter (a random delay between 0 and base * 2^attempt, capped).
+- client_error (other 4xx), validation (the model's output could not be
+  used; pydantic-ai already re-asks the model up to AGENT_RETRIES times)
+  and anything else: not retried.
+
+Retries draw from a process-wide budget: each call deposits `ratio` of a
+token and each retry spends one, so retries stay at about LLM_RETRY_BUDGET_RATIO
+of calls (plus a small burst allowance) and cannot multiply the load on a
+provider that is already failing. Failures, retries and denials are counted
+per class and reported at /health/llm.
+
+The OpenAI client's own retries are disabled (app.agents.base), so this is
+the only retry layer.
+"""
+
+import asyncio
+import random
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import openai
+from loguru import logger
+from pydantic import ValidationError
+from pydantic_ai.exceptions import ModelAPIError, ModelHTTPError, UnexpectedModelBehavior
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+RATE_LIMIT = "rate_limit"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+CLIENT_ERROR = "client_error"
+VALIDATION = "validation"
+OTHER = "other"
+
+RETRYABLE = frozenset({RATE_LIMIT, SERVER_ERROR, TIMEOUT, CONNECTION})
+
+
+def _causes(exc: BaseException):
+    """The exception and the chain of exceptions it was raised from."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def classify(exc: BaseException) -> str:
+    """Failure class of an exception raised by an agent run."""
+    if isinstance(exc, ModelHTTPError):
+        if exc.status_code == 429:
+            return RATE_LIMIT
+        if exc.status_code == 408:
+            return TIMEOUT
+        return SERVER_ERROR if exc.status_code >= 500 else CLIENT_ERROR
+    if any(isinstance(e, (openai.APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError)) for e in _causes(exc)):
+        return TIMEOUT
+    if isinstance(exc, ModelAPIError):
+        return CONNECTION
+    if isinstance(exc, (UnexpectedModelBehavior, ValidationError, ValueError)):
+        return VALIDATION
+    return OTHER
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Seconds the provider asked us to wait (Retry-After), if any.
+
+    pydantic-ai's ModelHTTPError does not carry the response headers; they
+    are read from the openai.APIStatusError it was raised from.
+    """
+    for cause in _causes(exc):
+        if isinstance(cause, openai.APIStatusError):
+            value = cause.response.headers.get("retry-after")
+            try:
+                return float(value) if value is not None else None
+            except ValueError:  # HTTP-date form: treat as absent
+                return None
+    return None
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of calls.
+
+    Every call adds `ratio` tokens (up to `burst`); a retry needs a whole
+    token. The bucket starts full, so a process with little traffic can
+    still retry a few times.
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self.calls = 0
+        self.retries = 0
+        self.denied = 0
+
+    def record_call(self) -> None:
+        self.calls += 1
+        self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "tokens": round(self.tokens, 2),
+            "calls": self.calls,
+            "retries": self.retries,
+            "denied": self.denied,
+        }
+
+
+class RetryPolicy:
+    """
+    Runs agent calls, retrying retryable failures with backoff.
+
+    Args:
+        max_retries: Retries per call after the first attempt
+        base_delay: Backoff for the first retry, doubled for each further one (seconds)
+        max_delay: Longest wait before a retry, Retry-After included (seconds)
+        budget: Process-wide retry budget
+        seed: Seed for the jitter (tests)
+        sleep: Coroutine used to wait (tests)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        budget: Optional[RetryBudget] = None,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        # class -> {"failures", "retries", "gave_up", "wait_seconds"}
+        self.metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def delay(self, failure: str, attempt: int, exc: BaseException) -> Optional[float]:
+        """Seconds to wait before retry number `attempt` (0-based), or None to give up."""
+        if failure == RATE_LIMIT:
+            after = retry_after(exc)
+            if after is not None:
+                if after > self.max_delay:
+                    return None
+                return after + self._random.uniform(0, self.base_delay)
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self, name: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` (one agent call, named `name` for logs), retrying per the policy."""
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as exc:
+                failure = classify(exc)
+                counters = self.metrics[failure]
+                counters["failures"] += 1
+                if failure not in RETRYABLE or attempt >= self.max_retries:
+                    counters["gave_up"] += 1
+                    raise
+                wait = self.delay(failure, attempt, exc)
+                if wait is None or not self.budget.try_spend():
+                    counters["gave_up"] += 1
+                    logger.warning(
+                        "Agent {} failed ({}), not retrying: {}",
+                        name, failure, "Retry-After too long" if wait is None else "retry budget exhausted",
+                    )
+                    raise
+                counters["retries"] += 1
+                counters["wait_seconds"] += wait
+                attempt += 1
+                logger.warning(
+                    "Agent {} failed ({}: {}), retry {}/{} in {:.2f}s",
+                    name, failure, exc, attempt, self.max_retries, wait,
+                )
+                await self._sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_retries": self.max_retries,
+            "budget": self.budget.stats(),
+            "failures": {
+                failure: {key: round(value, 3) for key, value in counters.items()}
+                for failure, counters in self.metrics.items()
+            },
+        }
+
+
+retry_policy = RetryPolicy(
+    max_retries=settings.llm_retry_max_retries,
+    base_delay=settings.llm_retry_base_delay,
+    max_delay=settings.llm_retry_max_delay,
+    budget=RetryBudget(settings.llm_retry_budget_ratio, settings.llm_retry_budget_burst),
+)
@@ -12,7 +12,8 @@ from pydantic_ai import Agent
 from typing import List
 from loguru import logger
 
-from app.agents.base import get_llm_model, AGENT_RETRIES
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES
+from app.core.tracing import span, traced
 from app.agents.resume_parser import ParsedResumeData
 from app.agents.job_analyzer import ParsedJobData
 
@@ -76,12 +77,14 @@ You MUST respond with ONLY valid JSON. Use this structure:
 
 skill_gap_agent = Agent(
     get_llm_model(),
+    name="skill_gap",
     output_type=str,
     retries=AGENT_RETRIES,
     system_prompt=SYSTEM_PROMPT,
 )
 
 
+@traced("llm.extract_json")
 def _extract_json_from_response(response: str) -> dict:
     """Helper to extract JSON from LLM response."""
     # Try to extract JSON from markdown code blocks first
@@ -145,10 +148,11 @@ Analyze the fit and provide the output as valid JSON.
 """
 
     try:
-        result = await skill_gap_agent.run(prompt)
+        result = await run_agent(skill_gap_agent, prompt)
         
         json_data = _extract_json_from_response(result.output)
-        analysis = MatchAnalysis.model_validate(json_data)
+        with span("llm.validate", model="MatchAnalysis"):
+            analysis = MatchAnalysis.model_validate(json_data)
         
         logger.info(f"Analysis complete. Match score: {analysis.match_score}")
         return analysis
@@ -10,7 +10,8 @@ from pydantic_ai import Agent
 from typing import List
 from loguru import logger
 
-from app.agents.base import get_llm_model, AGENT_RETRIES
+from app.agents.base import get_llm_model, run_agent, AGENT_RETRIES
+from app.core.tracing import span
 from app.agents.skill_gap import MatchAnalysis
 from app.agents.job_analyzer import ParsedJobData
 from app.utils import extract_json_from_response
@@ -65,6 +66,7 @@ You MUST respond with ONLY valid JSON. Use this structure:
 
 strategy_agent = Agent(
     get_llm_model(),
+    name="strategy_planner",
     output_type=str,
     retries=AGENT_RETRIES,
     system_prompt=SYSTEM_PROMPT,
@@ -111,10 +113,11 @@ Provide the strategy as valid JSON.
 """
 
     try:
-        result = await strategy_agent.run(prompt)
+        result = await run_agent(strategy_agent, prompt)
         
         json_data = extract_json_from_response(result.output)
-        strategy = ImprovementStrategy.model_validate(json_data)
+        with span("llm.validate", model="ImprovementStrategy"):
+            strategy = ImprovementStrategy.model_validate(json_data)
         
         logger.info(f"Strategy generated with {len(strategy.skill_development_plan)} actions")
         return strategy
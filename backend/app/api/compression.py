@@ -0,0 +1,134 @@
+"""
+Response Compression
+
+gzip/brotli compression for response bodies above a size threshold. Brotli
+is used when the optional `brotli` package is installed and the client
+accepts it; otherwise gzip.
+
+A compressed body is a different representation from the identity one, so
+its strong ETag gets an encoding suffix ("<tag>-gzip"); conditional request
+handling strips the suffix before comparing (see app.api.conditional).
+"""
+
+from typing import Optional, Set
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+ENCODINGS = ("br", "gzip")
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings listed in an Accept-Encoding header, minus those with q=0."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+def _requested(scope: Scope, etag: str) -> bool:
+    """Whether the request's If-None-Match lists `etag` (weakly or strongly)."""
+    if_none_match = Headers(scope=scope).get("if-none-match", "")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class _TaggedResponder:
+    """
+    Mixin for responders: suffix the ETag of responses this responder compressed.
+
+    A 304 has no body to compress, so it gets the suffix when the client is
+    revalidating the compressed representation (its If-None-Match carries the
+    suffixed tag): the 304 must send the validator the 200 would have sent.
+    """
+
+    content_encoding: str
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and etag.endswith('"'):
+                    tagged = f'{etag[:-1]}-{self.content_encoding}"'
+                    if headers.get("content-encoding") == self.content_encoding or (
+                        message["status"] == 304 and _requested(scope, tagged)
+                    ):
+                        headers["ETag"] = tagged
+            await send(message)
+
+        await super().__call__(scope, receive, send_tagged)
+
+
+class _GZipResponder(_TaggedResponder, GZipResponder):
+    pass
+
+
+class _BrotliResponder(_TaggedResponder, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    """Compress responses of at least `minimum_size` bytes with brotli or gzip."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_compresslevel: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_compresslevel = gzip_compresslevel
+        self.brotli_quality = brotli_quality
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """The preferred supported coding the client accepts, or None."""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding == "br" and brotli is None:
+                continue
+            if encoding in accepted:
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = _BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = _GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
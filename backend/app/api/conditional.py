@@ -0,0 +1,59 @@
+"""
+Conditional Requests
+
+Strong ETags for detail endpoints, derived from a record's id and
+timestamps so they can be checked without loading the record itself.
+A matching If-None-Match is answered with 304 Not Modified.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import Header, Response, status
+
+from app.api.compression import ENCODINGS
+
+# Bump when detail response schemas change, so cached copies are refetched
+REPRESENTATION_VERSION = 1
+
+# Per-user data: browsers may cache it but must revalidate on every use
+CACHE_CONTROL = "private, no-cache"
+
+IfNoneMatchParam = Annotated[Optional[str], Header(alias="If-None-Match")]
+
+
+def entity_tag(id: UUID, created_at: datetime, updated_at: Optional[datetime]) -> str:
+    """Strong ETag for a record version; changes whenever updated_at does."""
+    raw = f"{REPRESENTATION_VERSION}:{id}:{created_at.isoformat()}:{updated_at.isoformat() if updated_at else ''}"
+    return f'"{hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    """Tag without weak prefix or compression suffix (If-None-Match uses weak comparison)."""
+    tag = tag.strip().removeprefix("W/")
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == etag for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> dict:
+    """Validator headers sent with a cacheable detail response."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """304 response for a matching conditional request."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
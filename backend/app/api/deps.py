@@ -1,6 +1,7 @@
-from typing import Annotated, Optional, Dict, Any
+from typing import Annotated, Dict, Any, Tuple
 from uuid import UUID
-import httpx
+import hashlib
+import time
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,58 +9,44 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import traceback
 import json
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.jwks import jwks_manager
 from app.db.base import get_db
 from app.db.models import User
 from app.db.repositories.base import BaseRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# JWKS Cache
-JWKS_CLIENT: Optional[Dict[str, Any]] = None
+# sha256(token) -> (user_id, email) of an already verified token, kept no
+# longer than the token's own expiry
+_verified_claims: TTLCache[Tuple[UUID, str]] = TTLCache(
+    maxsize=settings.auth_cache_max_entries,
+    ttl=settings.auth_cache_ttl_seconds,
+)
+
+# user_id -> User row (detached), so hot endpoints skip the users lookup
+_users: TTLCache[User] = TTLCache(
+    maxsize=settings.user_cache_max_entries,
+    ttl=settings.auth_cache_ttl_seconds,
+)
 
 async def get_supabase_jwks() -> Dict[str, Any]:
-    global JWKS_CLIENT
-    if JWKS_CLIENT:
-        return JWKS_CLIENT
-        
-    base_url = settings.supabase_url.rstrip('/')
-    candidates = [
-        "/auth/v1/.well-known/jwks.json", # Standard OIDC under /auth/v1
-        "/.well-known/jwks.json",         # Root OIDC
-        "/auth/v1/jwks"                   # LegacySupabase
-    ]
-
-    async with httpx.AsyncClient() as client:
-        for path in candidates:
-            jwks_url = f"{base_url}{path}"
-            # print(f"Probing JWKS: {jwks_url}")
-            try:
-                response = await client.get(
-                    jwks_url, 
-                    headers={"apikey": settings.supabase_key}
-                )
-                if response.status_code == 200:
-                    print(f"JWKS Found at: {jwks_url}")
-                    JWKS_CLIENT = response.json()
-                    return JWKS_CLIENT
-            except Exception as e:
-                print(f"Probe failed for {path}: {e}")
-                continue
-                
-        print("!!! JWKS FAILURE: All candidates failed.")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-            detail="Could not fetch auth keys from any known endpoint"
-        )
+    """Supabase JWKS (cached and refreshed by jwks_manager)."""
+    return await jwks_manager.get_jwks()
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+async def verify_token(token: str) -> Tuple[UUID, str]:
     """
-    Verify Supabase JWT (ES256/RS256 via JWKS or HS256 via Secret) and get/create local user.
+    Verify Supabase JWT (ES256/RS256 via JWKS or HS256 via Secret).
+
+    Returns (user_id, email) from the claims. Verified tokens are cached by
+    hash, so repeat requests with the same token skip signature checks.
     """
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    cached = _verified_claims.get(token_hash)
+    if cached:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -87,33 +74,18 @@ async def get_current_user(
             )
         else:
             # For ES256 / RS256, use JWKS
-            jwks = await get_supabase_jwks()
-            
-            if not jwks:
-                 # Debugging mode: If JWKS failed, print issuer from token
-                 claims = jwt.get_unverified_claims(token)
-                 print(f"Token Issuer Claim: {claims.get('iss')}")
-                 raise credentials_exception
-
-            # Verify signature using the key from JWKS
-            
             kid = header.get('kid')
             if not kid:
                 print("Missing 'kid' in header")
                 raise credentials_exception
-                
-            key = next((k for k in jwks['keys'] if k['kid'] == kid), None)
+
+            # Verify signature using the key from JWKS. An unknown kid triggers
+            # one rate-limited, coalesced refetch (key rotation).
+            key = await jwks_manager.get_key(kid)
             if not key:
                 print(f"Key {kid} not found in JWKS")
-                # Force refresh JWKS once
-                global JWKS_CLIENT
-                JWKS_CLIENT = None
-                jwks = await get_supabase_jwks()
-                if not jwks: raise credentials_exception
-                key = next((k for k in jwks['keys'] if k['kid'] == kid), None)
-                if not key:
-                    raise credentials_exception
-            
+                raise credentials_exception
+
             payload = jwt.decode(
                 token,
                 key, # Pass the JWK dict directly, python-jose supports it
@@ -131,6 +103,12 @@ async def get_current_user(
             raise credentials_exception
             
         user_id = UUID(user_id_str)
+
+        # Remember the verified claims until the token expires
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            _verified_claims.set(token_hash, (user_id, email), ttl=min(expires_in, settings.auth_cache_ttl_seconds))
+        return user_id, email
         
     except (JWTError, ValueError) as e:
         print(f"!!! AUTH ERROR (JWT): {e}")
@@ -140,28 +118,42 @@ async def get_current_user(
         print(f"!!! AUTH ERROR (Unexpected): {e}")
         print(traceback.format_exc())
         raise credentials_exception
-        
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> User:
+    """
+    Verify the JWT and get/create the local user.
+
+    On hot paths this is two dictionary lookups: verified claims and the user
+    row are both cached in-process.
+    """
+    user_id, email = await verify_token(token)
+
+    user = _users.get(user_id)
+    if user:
+        return user
+
     # Check if user exists in local DB
     repo = BaseRepository(User, db)
     user = await repo.get(user_id)
-    
-    
+
     if not user:
-        try:
-            # Just-in-Time Sync
-            user = User(
-                id=user_id,
-                email=email,
-                hashed_password="MANAGED_BY_SUPABASE_AUTH"
-            )
-            user = await repo.create(user)
-        except Exception:
-            # Handle race condition: User might have been created by a parallel request
-            # logging.warning(f"User creation race condition for {user_id}")
-            user = await repo.get(user_id)
-            if not user:
-                 raise HTTPException(status_code=500, detail="Failed to sync user")
-    
+        # Just-in-Time Sync: a parallel request may create the same user, so
+        # insert without failing on conflict and read it back if we lost
+        user = await repo.create_if_absent(
+            id=user_id,
+            email=email,
+            hashed_password="MANAGED_BY_SUPABASE_AUTH"
+        ) or await repo.get(user_id)
+        if not user:
+            raise HTTPException(status_code=500, detail="Failed to sync user")
+
+    # Detach the row so the cached object isn't tied to this request's session
+    db.expunge(user)
+    _users.set(user_id, user)
     return user
     
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
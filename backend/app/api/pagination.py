@@ -0,0 +1,55 @@
+"""
+Cursor Pagination
+
+Opaque keyset cursors for per-user list endpoints. A cursor encodes the
+(created_at, id) of the last item on a page; the cursor for the next page is
+returned in the X-Next-Cursor response header so list responses stay plain arrays.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Annotated, Any, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 100
+
+LimitParam = Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size")]
+CursorParam = Annotated[Optional[str], Query(description="Cursor from the X-Next-Cursor header")]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode a keyset position as an opaque URL-safe string."""
+    raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """Set the X-Next-Cursor header when the page is full (more items may follow)."""
+    if items and len(items) >= limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
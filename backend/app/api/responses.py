@@ -0,0 +1,44 @@
+"""
+Fast JSON Responses
+
+Serialization helpers for large read payloads. Responses are validated and
+encoded entirely inside pydantic-core: a cached TypeAdapter reads the ORM
+object's attributes and dumps JSON bytes in one pass. Routes that need the
+encoded body itself (e.g. to cache it) use these instead of response_model.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded by pydantic-core; pre-encoded bytes pass through."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for `tp`, built once (building one compiles a core schema)."""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, value: Any) -> bytes:
+    """
+    Serialize ORM objects/rows (or model instances) as `tp` to JSON bytes.
+
+    Model instances are passed through without revalidation; ORM attributes
+    are read by pydantic-core, which is faster than building the models in
+    Python and skips the intermediate dict entirely.
+    """
+    adapter = type_adapter(tp)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
@@ -4,13 +4,25 @@ Analysis Routes
 Endpoints for job analysis and content generation.
 """
 
-from fastapi import APIRouter, Response, status
-from typing import List
+from fastapi import APIRouter, Header, Query, Response, status
+from typing import List, Optional
 from uuid import UUID
 
 from app.api.deps import SessionDep, CurrentUser
+from app.api.conditional import IfNoneMatchParam, cache_headers, entity_tag, etag_matches, not_modified
+from app.api.pagination import LimitParam, CursorParam, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
+from app.api.responses import FastJSONResponse, dump_json
+from app.core.response_cache import CachedResponse, detail_cache
 from app.services.analysis import AnalysisService
-from app.schemas.analysis import AnalysisRequest, AnalysisResponse, AnalysisListResponse
+from app.schemas.analysis import (
+    AnalysisRequest,
+    AnalysisUpdateRequest,
+    AnalysisResponse,
+    AnalysisStagesResponse,
+    AnalysisListResponse,
+    AnalysisStage,
+    SkillCount,
+)
 
 router = APIRouter()
 
@@ -19,35 +31,139 @@ router = APIRouter()
 async def create_analysis(
     request: AnalysisRequest,
     db: SessionDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Trigger a new analysis pipeline.
     This runs the Job Analyzer, Skill Gap Agent, Strategy Planner, and Content Generator.
+    With mode=quick only the match score and gaps are computed; see /complete.
+    Retries sent with the same Idempotency-Key return the original analysis.
     """
     analysis_service = AnalysisService(db)
-    return await analysis_service.create_analysis(request, current_user)
+    return await analysis_service.create_analysis(request, current_user, idempotency_key)
 
 
-@router.get("/", response_model=List[AnalysisListResponse])
+@router.get("/", response_model=List[AnalysisListResponse], response_class=FastJSONResponse)
 async def list_analyses(
+    response: Response,
     db: SessionDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    limit: LimitParam = MAX_PAGE_SIZE,
+    cursor: CursorParam = None,
+    missing_skill: Optional[str] = Query(None, description="Only analyses where this skill is a gap")
 ):
-    """List all analyses for current user."""
+    """
+    List analyses for current user, newest first.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    """
     analysis_service = AnalysisService(db)
-    return await analysis_service.list_analyses(current_user)
+    analyses = await analysis_service.list_analyses(
+        current_user, limit, decode_cursor(cursor), missing_skill=missing_skill
+    )
+    set_next_cursor(response, analyses, limit)
+    return FastJSONResponse(dump_json(List[AnalysisListResponse], analyses), headers=response.headers)
 
 
-@router.get("/{analysis_id}", response_model=AnalysisResponse)
+@router.get("/skills/missing", response_model=List[SkillCount])
+async def top_missing_skills(
+    db: SessionDep,
+    current_user: CurrentUser,
+    limit: int = Query(10, ge=1, le=50)
+):
+    """The skills most often identified as gaps across the user's analyses."""
+    analysis_service = AnalysisService(db)
+    skills = await analysis_service.top_missing_skills(current_user, limit)
+    return [SkillCount(skill=skill, count=count) for skill, count in skills]
+
+
+@router.get("/{analysis_id}", response_model=AnalysisResponse, response_class=FastJSONResponse)
 async def get_analysis(
     analysis_id: UUID,
     db: SessionDep,
+    current_user: CurrentUser,
+    if_none_match: IfNoneMatchParam = None,
+    stage_outputs: bool = Query(False, description="Include the raw output of every pipeline stage")
+):
+    """
+    Get full details of a specific analysis.
+    Raw stage outputs are only returned with stage_outputs=true (not cached).
+    """
+    read = detail_cache.start_read()
+    cached = None if stage_outputs else await detail_cache.get("analysis", current_user.id, analysis_id)
+    if cached:
+        if etag_matches(if_none_match, cached.etag):
+            return not_modified(cached.etag)
+        return FastJSONResponse(cached.body, headers=cache_headers(cached.etag))
+
+    analysis_service = AnalysisService(db)
+    if if_none_match:
+        # Revalidation only reads the record's timestamps, not its content
+        version = await analysis_service.get_analysis_version(analysis_id, current_user)
+        etag = entity_tag(analysis_id, version.created_at, version.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    if stage_outputs:
+        analysis = await analysis_service.get_analysis_with_stage_outputs(analysis_id, current_user)
+    else:
+        analysis = await analysis_service.get_analysis(analysis_id, current_user)
+    response = CachedResponse(
+        etag=entity_tag(analysis.id, analysis.created_at, analysis.updated_at),
+        body=dump_json(AnalysisStagesResponse if stage_outputs else AnalysisResponse, analysis),
+    )
+    if not stage_outputs:
+        await detail_cache.set("analysis", current_user.id, analysis_id, response, read)
+    return FastJSONResponse(response.body, headers=cache_headers(response.etag))
+
+
+@router.post("/{analysis_id}/complete", response_model=AnalysisResponse)
+async def complete_analysis(
+    analysis_id: UUID,
+    db: SessionDep,
+    current_user: CurrentUser
+):
+    """Generate strategy and outreach content for a quick analysis (no-op if present)."""
+    analysis_service = AnalysisService(db)
+    return await analysis_service.complete_analysis(analysis_id, current_user)
+
+
+@router.post("/{analysis_id}/retry", response_model=AnalysisResponse)
+async def retry_failed_stages(
+    analysis_id: UUID,
+    db: SessionDep,
+    current_user: CurrentUser
+):
+    """Retry only the failed pipeline stages of an analysis from its checkpoint."""
+    analysis_service = AnalysisService(db)
+    return await analysis_service.retry_failed_stages(analysis_id, current_user)
+
+
+@router.patch("/{analysis_id}", response_model=AnalysisResponse)
+async def update_analysis(
+    analysis_id: UUID,
+    request: AnalysisUpdateRequest,
+    db: SessionDep,
+    current_user: CurrentUser
+):
+    """
+    Edit the job description of an analysis and re-run it incrementally.
+    Only stages whose inputs changed are recomputed.
+    """
+    analysis_service = AnalysisService(db)
+    return await analysis_service.update_analysis(analysis_id, request, current_user)
+
+
+@router.post("/{analysis_id}/stages/{stage}/regenerate", response_model=AnalysisResponse)
+async def regenerate_stage(
+    analysis_id: UUID,
+    stage: AnalysisStage,
+    db: SessionDep,
     current_user: CurrentUser
 ):
-    """Get full details of a specific analysis."""
+    """Regenerate a single pipeline stage (e.g. only the outreach content)."""
     analysis_service = AnalysisService(db)
-    return await analysis_service.get_analysis(analysis_id, current_user)
+    return await analysis_service.regenerate_stage(analysis_id, stage.value, current_user)
 
 
 @router.delete("/{analysis_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -4,11 +4,15 @@ Resume Routes
 Endpoints for resume management.
 """
 
-from fastapi import APIRouter, UploadFile, File, Response, status
-from typing import List
+from fastapi import APIRouter, UploadFile, File, Header, Query, Response, status
+from typing import List, Optional
 from uuid import UUID
 
 from app.api.deps import SessionDep, CurrentUser
+from app.api.conditional import IfNoneMatchParam, cache_headers, entity_tag, etag_matches, not_modified
+from app.api.pagination import LimitParam, CursorParam, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
+from app.api.responses import FastJSONResponse, dump_json
+from app.core.response_cache import CachedResponse, detail_cache
 from app.services.resume import ResumeService
 from app.schemas.resume import ResumeResponse, ResumeListResponse
 
@@ -19,35 +23,67 @@ router = APIRouter()
 async def upload_resume(
     file: UploadFile = File(...),
     db: SessionDep = None,  # Dependency injection
-    current_user: CurrentUser = None
+    current_user: CurrentUser = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Upload a resume (PDF/Word).
     Autocratically parses text and extracts skills using AI.
+    Retries sent with the same Idempotency-Key return the original resume.
     """
     resume_service = ResumeService(db)
-    return await resume_service.upload_resume(file, current_user)
+    return await resume_service.upload_resume(file, current_user, idempotency_key)
 
 
-@router.get("/", response_model=List[ResumeListResponse])
+@router.get("/", response_model=List[ResumeListResponse], response_class=FastJSONResponse)
 async def list_resumes(
+    response: Response,
     db: SessionDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    limit: LimitParam = MAX_PAGE_SIZE,
+    cursor: CursorParam = None,
+    skill: Optional[str] = Query(None, description="Only resumes listing this skill")
 ):
-    """List all resumes for the current user."""
+    """
+    List resumes for the current user, newest first.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    """
     resume_service = ResumeService(db)
-    return await resume_service.list_resumes(current_user)
+    resumes = await resume_service.list_resumes(current_user, limit, decode_cursor(cursor), skill=skill)
+    set_next_cursor(response, resumes, limit)
+    return FastJSONResponse(dump_json(List[ResumeListResponse], resumes), headers=response.headers)
 
 
-@router.get("/{resume_id}", response_model=ResumeResponse)
+@router.get("/{resume_id}", response_model=ResumeResponse, response_class=FastJSONResponse)
 async def get_resume(
     resume_id: UUID,
     db: SessionDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    if_none_match: IfNoneMatchParam = None
 ):
     """Get a specific resume with full parsed details."""
+    read = detail_cache.start_read()
+    cached = await detail_cache.get("resume", current_user.id, resume_id)
+    if cached:
+        if etag_matches(if_none_match, cached.etag):
+            return not_modified(cached.etag)
+        return FastJSONResponse(cached.body, headers=cache_headers(cached.etag))
+
     resume_service = ResumeService(db)
-    return await resume_service.get_resume(resume_id, current_user)
+    if if_none_match:
+        # Revalidation only reads the record's timestamps, not its content
+        version = await resume_service.get_resume_version(resume_id, current_user)
+        etag = entity_tag(resume_id, version.created_at, version.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    resume = await resume_service.get_resume(resume_id, current_user)
+    response = CachedResponse(
+        etag=entity_tag(resume.id, resume.created_at, resume.updated_at),
+        body=dump_json(ResumeResponse, resume),
+    )
+    await detail_cache.set("resume", current_user.id, resume_id, response, read)
+    return FastJSONResponse(response.body, headers=cache_headers(response.etag))
 
 
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,67 @@
+"""
+Server-Timing
+
+Middleware that collects the spans finished while handling a request and
+summarizes them in a Server-Timing response header, e.g.
+
+    Server-Timing: stage.match;dur=812.4, agent.run;desc="3x";dur=2011.0, total;dur=2050.3
+
+Durations of spans with the same name are summed (concurrent spans can add
+up to more than the total). The request itself is recorded as an
+"http.request" root span, so exported traces group under it.
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import Span, request_spans, span
+
+
+def server_timing(spans: List[Span], total_ms: float) -> str:
+    """Server-Timing header value: one metric per span name, plus the total."""
+    totals: Dict[str, Tuple[int, float]] = {}
+    for finished in spans:
+        count, duration = totals.get(finished.name, (0, 0.0))
+        totals[finished.name] = (count + 1, duration + finished.duration_ms)
+
+    metrics = [
+        f'{name};desc="{count}x";dur={duration:.1f}' if count > 1 else f"{name};dur={duration:.1f}"
+        for name, (count, duration) in totals.items()
+    ]
+    metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """Trace each request; with `header` set, send the Server-Timing summary."""
+
+    def __init__(self, app: ASGIApp, header: bool = True):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Span] = []
+        token = request_spans.set(spans)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if self.header and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(spans, (time.perf_counter() - start) * 1000))
+            await send(message)
+
+        try:
+            with span("http.request", method=scope["method"], path=scope["path"]) as root:
+                await self.app(scope, receive, send_with_timing)
+                route = scope.get("route")
+                if route is not None:
+                    root.set(route=getattr(route, "path", ""))
+        finally:
+            request_spans.reset(token)
@@ -0,0 +1,66 @@
+"""
+In-Process Caching Utilities
+
+Bounded LRU cache with per-entry time-to-live, used for short-lived
+process-local state (idempotency results, auth lookups, read caches).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Least-recently-used cache whose entries expire after a TTL.
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store a value; `ttl` overrides the default time-to-live for this entry."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove and return a value (None if missing)."""
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the current keys (may include expired entries)."""
+        return list(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
@@ -17,12 +17,43 @@ class Settings(BaseSettings):
     supabase_key: str = ""
     database_url: str
 
+    # Database connection pool (server databases; ignored for SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = True  # Ping on every checkout
+    db_ping_idle_seconds: float = 0  # If > 0, ping only connections idle this long (replaces pre-ping)
+    db_pgbouncer_mode: bool = False  # Transaction pooler safe: no prepared statement caching
+    db_null_pool: bool = False  # Open a connection per checkout (let the external pooler pool)
+
+    # SQLite profile (single-node / local deployments using sqlite+aiosqlite)
+    sqlite_wal: bool = True  # WAL journal: readers don't block on the writer
+    sqlite_synchronous: str = "NORMAL"  # Durable with WAL, without an fsync per commit
+    sqlite_busy_timeout_ms: int = 5000  # Wait for locks instead of failing with "database is locked"
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # Bytes of the file read via memory mapping
+    sqlite_cache_size_kib: int = 64 * 1024  # Page cache per connection
+    sqlite_single_writer: bool = True  # Route all writes through one dedicated connection
+
     # Supabase Auth
     supabase_jwt_secret: str = ""  # Required for JWT validation
+    auth_cache_ttl_seconds: int = 300  # Max time verified token claims / user rows are reused
+    auth_cache_max_entries: int = 10_000  # Verified tokens kept in memory
+    user_cache_max_entries: int = 1024  # User rows kept in memory
+    jwks_ttl_seconds: int = 3600  # Used when the JWKS response has no Cache-Control max-age
+    jwks_min_refresh_seconds: int = 30  # Minimum gap between refetches (e.g. on unknown kid)
 
     # LLM Provider Configuration
     openrouter_api_key: str
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    llm_cassette_mode: str = ""  # "record" or "replay" agent runs (see app.agents.cassette); empty = off
+    llm_cassette_path: str = "llm_cassette.jsonl.gz"
+    llm_cassette_latency_scale: float = 0.0  # Replay: sleep this fraction of each recorded latency
+    llm_retry_max_retries: int = 3  # Retries of a failed model call (429, 5xx, timeouts; see app.agents.retry)
+    llm_retry_base_delay: float = 0.5  # First backoff in seconds, doubled per retry (with full jitter)
+    llm_retry_max_delay: float = 20.0  # Longest wait before a retry; a longer Retry-After fails fast
+    llm_retry_budget_ratio: float = 0.1  # Retries allowed per model call, process-wide
+    llm_retry_budget_burst: float = 10.0  # Retries available before the ratio applies
 
     # Security
     secret_key: str
@@ -34,6 +65,30 @@ class Settings(BaseSettings):
 
     # Logging
     log_level: str = "INFO"
+    log_format: str = "text"  # "text" or "json" (one JSON object per line)
+    log_queue_size: int = 10_000  # Records waiting for the writer thread; more are dropped
+    log_sample_rates: str = ""  # Keep a fraction of DEBUG/INFO records per logger, e.g. "app.utils=0.1"
+
+    # Response compression (gzip; brotli when the optional `brotli` package is installed)
+    compression_minimum_size: int = 1024  # Smaller bodies are sent uncompressed
+    gzip_compresslevel: int = 6  # Level 9 costs far more CPU for a few percent smaller bodies
+    brotli_quality: int = 5
+
+    # Cache of serialized analysis/resume detail responses
+    response_cache_max_entries: int = 1024  # Per process; 0 disables
+    response_cache_ttl_seconds: int = 300
+    response_cache_path: str = ""  # SQLite file shared by workers (empty = in-process only)
+    response_cache_local_ttl_seconds: int = 5  # In-process lifetime when the shared tier is on
+
+    # Tracing
+    server_timing: bool = True  # Summarize span durations in a Server-Timing response header
+    trace_export_path: str = ""  # Append finished spans to this JSONL file
+    trace_otlp_endpoint: str = ""  # OTLP/HTTP collector base URL (spans POSTed to /v1/traces)
+    trace_flush_interval_seconds: float = 5.0
+
+    # Idempotency-Key support for POST endpoints (in-process)
+    idempotency_ttl_seconds: int = 60 * 60 * 24  # 24 hours
+    idempotency_max_entries: int = 10_000
 
     @field_validator("allowed_origins", mode="before")
     @classmethod
@@ -0,0 +1,190 @@
+"""
+Supabase JWKS Manager
+
+Fetches and caches the JSON Web Key Set used to verify ES256/RS256 tokens.
+Keys are refreshed in the background before they expire, refetches are
+coalesced, and unknown key IDs trigger at most one refetch per interval.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import HTTPException, status
+from loguru import logger
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.core.tracing import traced
+
+# Discovery paths, tried in order until one answers
+JWKS_PATHS = [
+    "/auth/v1/.well-known/jwks.json",  # Standard OIDC under /auth/v1
+    "/.well-known/jwks.json",          # Root OIDC
+    "/auth/v1/jwks",                   # Legacy Supabase
+]
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def cache_ttl(cache_control: Optional[str], default: float) -> float:
+    """TTL from a Cache-Control header: max-age if present (no-store/no-cache -> 0)."""
+    if not cache_control:
+        return default
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    return float(match.group(1)) if match else default
+
+
+class JWKSManager:
+    """
+    Cached JWKS with TTL, background refresh and single-flight fetching.
+
+    The discovery path that worked is remembered and tried first on every
+    refresh. If a refresh fails while keys are cached, the stale keys keep
+    being served and the background refresh is retried with exponential
+    backoff (from min_refresh_interval up to the TTL).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        ttl: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 5.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._path: Optional[str] = None  # Discovery path that last succeeded
+        self._last_fetch = float("-inf")
+        self._flight: SingleFlight[Dict[str, Any]] = SingleFlight("jwks")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self.fetches = 0
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        """Return the key set, fetching it if missing or expired."""
+        if self._jwks is None or time.monotonic() >= self._expires_at:
+            return await self.refresh()
+        return self._jwks
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the JWK with key ID `kid`, or None if it doesn't exist.
+
+        An unknown kid (e.g. after key rotation) triggers a refetch, but at
+        most once per min_refresh_interval so forged kids can't cause a
+        thundering herd against the auth server.
+        """
+        key = self._find(await self.get_jwks(), kid)
+        if key is None and time.monotonic() - self._last_fetch >= self.min_refresh_interval:
+            logger.info(f"JWKS key {kid} not found; refreshing key set")
+            key = self._find(await self.refresh(), kid)
+        return key
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Fetch the key set now; concurrent callers share one fetch."""
+        return await self._flight.do("jwks", self._fetch)
+
+    async def start(self) -> None:
+        """Warm the cache and start the background refresh task."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"JWKS warm-up failed ({e}); keys will be fetched on first use")
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refresh and close the HTTP client."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _refresh_loop(self) -> None:
+        failures = 0
+        while True:
+            # Refresh shortly before expiry so requests never wait on a fetch
+            remaining = self._expires_at - time.monotonic()
+            backoff = min(self.min_refresh_interval * 2 ** min(failures, 16), max(self.ttl, self.min_refresh_interval))
+            await asyncio.sleep(max(remaining * 0.9, backoff))
+            try:
+                await self.refresh()
+                failures = 0
+            except Exception as e:
+                # Any error (transport, malformed JSON, ...) must not end the loop
+                failures += 1
+                logger.opt(exception=e).error(
+                    "JWKS background refresh failed ({} in a row); stale keys are still served", failures
+                )
+
+    @traced("jwks.fetch")
+    async def _fetch(self) -> Dict[str, Any]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+
+        self._last_fetch = time.monotonic()
+        self.fetches += 1
+
+        for path in self._candidate_paths():
+            jwks_url = f"{self.base_url}{path}"
+            try:
+                response = await self._client.get(jwks_url, headers={"apikey": self.api_key})
+            except httpx.HTTPError as e:
+                logger.warning(f"JWKS probe failed for {path}: {e}")
+                continue
+
+            if response.status_code != 200:
+                continue
+
+            if path != self._path:
+                logger.info(f"JWKS found at: {jwks_url}")
+            self._path = path
+            self._jwks = response.json()
+            ttl = cache_ttl(response.headers.get("cache-control"), self.ttl)
+            self._expires_at = time.monotonic() + max(ttl, self.min_refresh_interval)
+            return self._jwks
+
+        if self._jwks is not None:
+            logger.error("JWKS refresh failed; serving cached keys")
+            self._expires_at = time.monotonic() + self.min_refresh_interval
+            return self._jwks
+
+        logger.error("JWKS failure: all candidates failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not fetch auth keys from any known endpoint"
+        )
+
+    def _candidate_paths(self) -> List[str]:
+        if self._path is None:
+            return JWKS_PATHS
+        return [self._path] + [path for path in JWKS_PATHS if path != self._path]
+
+    @staticmethod
+    def _find(jwks: Dict[str, Any], kid: str) -> Optional[Dict[str, Any]]:
+        return next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+
+
+jwks_manager = JWKSManager(
+    base_url=settings.supabase_url,
+    api_key=settings.supabase_key,
+    ttl=settings.jwks_ttl_seconds,
+    min_refresh_interval=settings.jwks_min_refresh_seconds,
+)
@@ -0,0 +1,215 @@
+"""
+Logging Configuration
+
+Loguru setup that keeps logging off the request path:
+- Records are appended to a bounded in-memory queue that a background
+  thread drains in batches; the thread formats them (text or JSON lines)
+  and writes them, so a slow or blocked stderr never stalls the event loop.
+  When the queue is full, records are dropped and counted instead.
+- The request id is attached by a patcher, which only runs for records
+  that pass the level check.
+- Optional per-logger sampling of DEBUG/INFO records (warnings and errors
+  are always kept), e.g. LOG_SAMPLE_RATES="app.utils.file_extraction=0.1".
+
+Debug messages should pass their values as arguments rather than f-strings,
+so nothing is formatted when the level is off; values that are expensive to
+compute can be deferred too:
+    logger.debug("Extracted {} chars from page {}", len(text), number)
+    logger.opt(lazy=True).debug("Sections: {}", lambda: json.dumps(sections))
+"""
+
+import atexit
+import json
+import random
+import sys
+import threading
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TextIO
+
+from asgi_correlation_id.context import correlation_id
+from loguru import logger
+
+from app.core.config import settings
+
+# Records at or above this level are never sampled out
+SAMPLING_MAX_LEVEL = 30  # WARNING
+
+
+def add_request_id(record: Dict[str, Any]) -> None:
+    record["extra"].setdefault("request_id", correlation_id.get() or "N/A")
+
+
+def _exception_text(record: Dict[str, Any]) -> Optional[str]:
+    if record["exception"] is None:
+        return None
+    exc_type, exc_value, tb = record["exception"]
+    return "".join(traceback.format_exception(exc_type, exc_value, tb))
+
+
+def text_line(record: Dict[str, Any]) -> str:
+    """Human-readable line (plus traceback, if any)."""
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S} | {record['level'].name: <8} | "
+        f"[req:{record['extra'].get('request_id', 'N/A')}] | "
+        f"{record['name']}:{record['function']}:{record['line']} - {record['message']}\n"
+    )
+    exception = _exception_text(record)
+    return line + exception if exception else line
+
+
+def json_line(record: Dict[str, Any]) -> str:
+    """One JSON object per record."""
+    extra = dict(record["extra"])
+    entry: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "request_id": extra.pop("request_id", None),
+    }
+    if extra:
+        entry["extra"] = extra
+    exception = _exception_text(record)
+    if exception:
+        entry["exception"] = exception
+    return json.dumps(entry, default=str) + "\n"
+
+
+class Sampler:
+    """
+    Loguru filter keeping a fraction of DEBUG/INFO records per logger.
+
+    Rates are matched by the longest logger-name prefix, so
+    {"app.agents": 0.5, "app.agents.pipeline": 0.1} samples the pipeline
+    at 10% and other agents at 50%.
+    """
+
+    def __init__(self, rates: Dict[str, float], seed: Optional[int] = None):
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._random = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Sampler":
+        """Parse "logger=rate,logger=rate"."""
+        rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, rate = item.partition("=")
+            rates[name.strip()] = float(rate)
+        return cls(rates)
+
+    def rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if record["level"].no >= SAMPLING_MAX_LEVEL:
+            return True
+        rate = self.rate(record["name"] or "")
+        return rate >= 1.0 or self._random.random() < rate
+
+
+class BackgroundSink:
+    """
+    Loguru sink that formats and writes records in batches from a daemon thread.
+
+    The caller only appends the record to a deque (no lock, no thread
+    wake-up); every `interval` seconds the thread drains it, formats the
+    records with `formatter` (e.g. text_line or json_line) and writes them
+    with one call. Add it with format="{message}" so loguru does no
+    formatting of its own.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        formatter: Callable[[Dict[str, Any]], str] = text_line,
+        maxsize: int = 10_000,
+        interval: float = 0.05,
+    ):
+        self.stream = stream
+        self.formatter = formatter
+        self.maxsize = maxsize
+        self.interval = interval
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._records: Deque[Dict[str, Any]] = deque()
+        self._write_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def __call__(self, message: Any) -> None:
+        if len(self._records) >= self.maxsize:
+            self.dropped += 1
+            return
+        self._records.append(message.record)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        with self._write_lock:
+            chunks = []
+            if self.dropped > self._reported_dropped:
+                chunks.append(f"[logging] {self.dropped - self._reported_dropped} records dropped (queue full)\n")
+                self._reported_dropped = self.dropped
+            # Errors are reported (not raised) so they never kill the writer thread
+            while self._records:
+                record = self._records.popleft()
+                try:
+                    chunks.append(self.formatter(record))
+                except Exception:
+                    self._report_error(record)
+            if chunks:
+                try:
+                    self.stream.write("".join(chunks))
+                    self.stream.flush()
+                except Exception:
+                    self._report_error(None, lost=len(chunks))
+
+    @staticmethod
+    def _report_error(record: Optional[Dict[str, Any]], lost: int = 0) -> None:
+        """Print the current exception to stderr, as loguru does for a handler with catch=True."""
+        try:
+            sys.stderr.write("--- Logging error in background sink ---\n")
+            if record is not None:
+                sys.stderr.write(f"Record was: {record!r}\n")
+            else:
+                sys.stderr.write(f"{lost} formatted lines could not be written\n")
+            traceback.print_exc(file=sys.stderr)
+            sys.stderr.write("--- End of logging error ---\n")
+            sys.stderr.flush()
+        except Exception:
+            pass  # stderr itself is broken: nothing left to report to
+
+    def stop(self) -> None:
+        """Stop the thread and write what is left (at exit)."""
+        self._stopping.set()
+        self._thread.join(self.interval * 4)
+        self.flush()
+
+
+def configure_logging() -> BackgroundSink:
+    """Replace loguru's default handler with the background sink."""
+    logger.remove()
+    logger.configure(patcher=add_request_id)
+    sink = BackgroundSink(
+        sys.stderr,
+        formatter=json_line if settings.log_format == "json" else text_line,
+        maxsize=settings.log_queue_size,
+    )
+    logger.add(
+        sink,
+        level=settings.log_level,
+        format="{message}",
+        filter=Sampler.parse(settings.log_sample_rates) if settings.log_sample_rates else None,
+    )
+    return sink
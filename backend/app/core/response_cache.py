@@ -0,0 +1,315 @@
+"""
+Detail Response Cache
+
+Read-through cache of serialized detail responses (analyses, resumes), keyed
+by (kind, user id, record id). Entries hold the encoded JSON body and its
+ETag, so a hit is answered without touching the database.
+
+Tiers:
+- An in-process LRU/TTL cache (always on).
+- An optional shared SQLite file for multi-worker deployments. Workers
+  promote shared hits into their local tier; when the shared tier is
+  enabled, local entries live only `local_ttl` seconds, which bounds how
+  long a worker can serve an entry another worker invalidated. Invalidations
+  leave a timestamped tombstone in the shared file, and a response whose
+  database read started before a tombstone for its key is not stored, so a
+  worker's slow read can't publish data another worker just replaced.
+
+Services invalidate entries whenever they change or delete a record.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+
+
+class ReadToken(NamedTuple):
+    """Taken before loading a response from the database (see ResponseCache.start_read)."""
+    generation: int  # This process's invalidation counter
+    started_at: float  # Wall-clock time, compared with shared-tier tombstones
+
+
+class CacheStats:
+    """Hit/miss counters for one cache tier."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SQLiteResponseStore:
+    """
+    Shared cache tier in a SQLite file, usable by several worker processes.
+
+    Calls run in worker threads (asyncio.to_thread), each thread with its
+    own connection: under write contention SQLite may wait up to the busy
+    timeout for a lock, which must not stall the event loop. Errors are
+    logged and treated as misses; the cache is never a source of truth.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            kind TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            etag TEXT NOT NULL,
+            body BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (kind, user_id, id)
+        );
+        CREATE TABLE IF NOT EXISTS invalidations (
+            kind TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            id TEXT NOT NULL,  -- ALL_IDS for a user-wide invalidation
+            invalidated_at REAL NOT NULL,
+            PRIMARY KEY (kind, user_id, id)
+        );
+    """
+    ALL_IDS = "*"
+
+    def __init__(self, path: str, ttl: float, purge_every: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connect().executescript(self._SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can close it from another thread
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")  # Losing a cache write is harmless
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def get(self, kind: str, user_id: UUID, id: UUID) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._get, kind, user_id, id)
+
+    async def set(
+        self,
+        kind: str,
+        user_id: UUID,
+        id: UUID,
+        response: CachedResponse,
+        read_started_at: Optional[float] = None,
+    ) -> None:
+        """
+        Store a response, unless its key was invalidated at or after
+        `read_started_at` (when the response's database read began).
+        """
+        await asyncio.to_thread(self._set, kind, user_id, id, response, read_started_at)
+
+    async def delete(self, kind: str, user_id: UUID, id: Optional[UUID] = None) -> None:
+        """
+        Delete one entry, or all of a user's entries of `kind` if `id` is None,
+        and record the invalidation for set() to check.
+        """
+        await asyncio.to_thread(self._delete, kind, user_id, id)
+
+    def _get(self, kind: str, user_id: UUID, id: UUID) -> Optional[CachedResponse]:
+        try:
+            row = self._connect().execute(
+                "SELECT etag, body FROM responses WHERE kind = ? AND user_id = ? AND id = ? AND expires_at > ?",
+                (kind, str(user_id), str(id), time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared response cache read failed: {e}")
+            return None
+        return CachedResponse(row[0], bytes(row[1])) if row else None
+
+    def _set(
+        self,
+        kind: str,
+        user_id: UUID,
+        id: UUID,
+        response: CachedResponse,
+        read_started_at: Optional[float],
+    ) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            # One statement, so no invalidation can land between the check and the write
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                SELECT ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM invalidations
+                    WHERE kind = ? AND user_id = ? AND id IN (?, ?) AND invalidated_at >= ?
+                )
+                """,
+                (
+                    kind, str(user_id), str(id), response.etag, response.body, now + self.ttl,
+                    kind, str(user_id), str(id), self.ALL_IDS, now if read_started_at is None else read_started_at,
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                # Tombstones only need to outlive reads in flight
+                conn.execute("DELETE FROM invalidations WHERE invalidated_at <= ?", (now - self.ttl,))
+        except sqlite3.Error as e:
+            logger.warning(f"Shared response cache write failed: {e}")
+
+    def _delete(self, kind: str, user_id: UUID, id: Optional[UUID]) -> None:
+        query = "DELETE FROM responses WHERE kind = ? AND user_id = ?"
+        params = [kind, str(user_id)]
+        if id is not None:
+            query += " AND id = ?"
+            params.append(str(id))
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO invalidations VALUES (?, ?, ?, ?)",
+                    (kind, str(user_id), self.ALL_IDS if id is None else str(id), time.time()),
+                )
+                conn.execute(query, params)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # A failed invalidation could leave stale entries behind
+            logger.error(f"Shared response cache invalidation failed: {e}")
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+class ResponseCache:
+    """
+    Two-tier read-through cache of serialized detail responses.
+
+    Usage in a route:
+        read = cache.start_read()
+        cached = await cache.get("analysis", user.id, id)
+        if cached is None:
+            ...load and serialize...
+            await cache.set("analysis", user.id, id, CachedResponse(etag, body), read)
+
+    Passing the token taken before the database load makes set() skip the
+    store if an invalidation happened in between (in this process, or in
+    any worker for the shared tier), so a slow read can't cache data that a
+    concurrent write already replaced.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        shared: Optional[SQLiteResponseStore] = None,
+        local_ttl: Optional[float] = None,
+    ):
+        self.shared = shared
+        self.local = TTLCache[CachedResponse](
+            maxsize=maxsize,
+            ttl=ttl if shared is None or local_ttl is None else min(ttl, local_ttl),
+        )
+        self.generation = 0  # Incremented on every invalidation
+        self.local_stats = CacheStats()
+        self.shared_stats = CacheStats()
+
+    def start_read(self) -> ReadToken:
+        return ReadToken(self.generation, time.time())
+
+    async def get(self, kind: str, user_id: UUID, id: UUID) -> Optional[CachedResponse]:
+        key: Hashable = (kind, user_id, id)
+        response = self.local.get(key)
+        if response is not None:
+            self.local_stats.hits += 1
+            return response
+        self.local_stats.misses += 1
+
+        if self.shared is None:
+            return None
+        response = await self.shared.get(kind, user_id, id)
+        if response is None:
+            self.shared_stats.misses += 1
+            return None
+        self.shared_stats.hits += 1
+        self.local.set(key, response)
+        return response
+
+    async def set(
+        self,
+        kind: str,
+        user_id: UUID,
+        id: UUID,
+        response: CachedResponse,
+        read: Optional[ReadToken] = None,
+    ) -> None:
+        if read is not None and read.generation != self.generation:
+            return  # Invalidated while the response was being built
+        self.local.set((kind, user_id, id), response)
+        if self.shared is not None:
+            await self.shared.set(kind, user_id, id, response, read.started_at if read else None)
+
+    async def invalidate(self, kind: str, user_id: UUID, id: UUID) -> None:
+        """Drop the cached response for one record."""
+        self.generation += 1
+        self.local.pop((kind, user_id, id))
+        if self.shared is not None:
+            await self.shared.delete(kind, user_id, id)
+
+    async def invalidate_user(self, kind: str, user_id: UUID) -> None:
+        """Drop all of a user's cached responses of `kind` (e.g. after a cascading delete)."""
+        self.generation += 1
+        for key in self.local.keys():
+            if key[:2] == (kind, user_id):
+                self.local.pop(key)
+        if self.shared is not None:
+            await self.shared.delete(kind, user_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit rates per tier."""
+        stats: Dict[str, Any] = {"entries": len(self.local), "local": self.local_stats.as_dict()}
+        if self.shared is not None:
+            stats["shared"] = self.shared_stats.as_dict()
+        return stats
+
+
+detail_cache = ResponseCache(
+    maxsize=settings.response_cache_max_entries,
+    ttl=settings.response_cache_ttl_seconds,
+    shared=SQLiteResponseStore(settings.response_cache_path, settings.response_cache_ttl_seconds)
+    if settings.response_cache_path else None,
+    local_ttl=settings.response_cache_local_ttl_seconds,
+)
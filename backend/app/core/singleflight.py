@@ -0,0 +1,48 @@
+"""
+Single-Flight Request Coalescing
+
+Ensures that concurrent calls for the same key share one in-flight
+execution instead of each starting their own (expensive) work.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls by key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task. The key is released as soon as the
+    work finishes, so later calls start fresh work.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self.coalesced = 0  # Number of calls served by another caller's work
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` for `key`, or join the execution already in flight.
+
+        Exceptions from the work are raised to every waiting caller.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, k=key: self._inflight.pop(k, None))
+        else:
+            self.coalesced += 1
+            logger.info(f"Coalesced duplicate in-flight {self.name} request")
+
+        # Shield so one caller disconnecting doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
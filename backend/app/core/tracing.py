@@ -0,0 +1,295 @@
+"""
+Lightweight Tracing
+
+Timed spans for the parts of a request where time goes: pipeline stages,
+agent runs, JSON parsing, file extraction, DB queries and JWKS fetches.
+
+Spans carry the request's correlation id (asgi_correlation_id) as their
+trace id and nest via a context variable, so spans started in gathered
+tasks are parented correctly. Finished spans are:
+- collected per request, for the Server-Timing header (app.api.server_timing);
+- buffered and exported in the background to a JSONL file and/or an
+  OTLP/HTTP (JSON) collector, if configured.
+
+Usage:
+    async with span("stage.match"):
+        ...
+    with span("file.extract", filename=name):
+        ...
+
+    @traced("llm.extract_json")
+    def extract(...): ...
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Protocol, TypeVar
+
+import httpx
+from asgi_correlation_id.context import correlation_id
+from loguru import logger
+
+from app.core.config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """A finished (or running) timed operation."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float  # Unix epoch seconds
+    duration_ms: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# Innermost running span (parent of new spans)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Finished spans of the current request (set by the Server-Timing middleware)
+request_spans: ContextVar[Optional[List[Span]]] = ContextVar("request_spans", default=None)
+
+
+class SpanExporter(Protocol):
+    async def export(self, spans: List[Span]) -> None: ...
+
+
+class JSONLSpanExporter:
+    """Append spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(finished.to_dict(), default=str) + "\n" for finished in spans)
+        await asyncio.to_thread(self._write, lines)
+
+    def _write(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_trace_id(trace_id: str) -> str:
+    """OTLP trace ids are 16 bytes of hex; correlation ids are uuid4 hex already."""
+    if len(trace_id) == 32 and all(c in "0123456789abcdef" for c in trace_id):
+        return trace_id
+    return hashlib.md5(trace_id.encode("utf-8")).hexdigest()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPSpanExporter:
+    """POST spans to an OTLP/HTTP collector using the JSON encoding (/v1/traces)."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "applywise-api",
+        timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "app.core.tracing"},
+                "spans": [
+                    {
+                        "traceId": _otlp_trace_id(finished.trace_id),
+                        "spanId": finished.span_id,
+                        **({"parentSpanId": finished.parent_id} if finished.parent_id else {}),
+                        "name": finished.name,
+                        "kind": 1,  # SPAN_KIND_INTERNAL
+                        "startTimeUnixNano": str(int(finished.start_time * 1e9)),
+                        "endTimeUnixNano": str(int((finished.start_time + finished.duration_ms / 1000) * 1e9)),
+                        "attributes": [
+                            {"key": key, "value": _otlp_value(value)}
+                            for key, value in {"request_id": finished.trace_id, **finished.attributes}.items()
+                        ],
+                        "status": {"code": 2, "message": finished.error} if finished.error else {"code": 1},
+                    }
+                    for finished in spans
+                ],
+            }],
+        }]}
+
+    async def export(self, spans: List[Span]) -> None:
+        response = await self._client.post(self.url, json=self.payload(spans))
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class Tracer:
+    """
+    Creates spans and exports finished ones in batches from a background task.
+
+    Spans are always timed and collected for Server-Timing; they are only
+    buffered for export when an exporter is configured. The buffer is
+    bounded, so a slow or unreachable collector drops spans instead of
+    growing memory.
+    """
+
+    def __init__(
+        self,
+        exporters: Optional[List[SpanExporter]] = None,
+        flush_interval: float = 5.0,
+        max_buffer: int = 10_000,
+    ):
+        self.exporters: List[SpanExporter] = exporters or []
+        self.flush_interval = flush_interval
+        self._buffer: Deque[Span] = deque(maxlen=max_buffer)
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else (correlation_id.get() or os.urandom(16).hex()),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=attributes,
+        )
+
+    def finish(self, span: Span) -> None:
+        collected = request_spans.get()
+        if collected is not None:
+            collected.append(span)
+        if self.exporters:
+            self._buffer.append(span)
+
+    async def flush(self) -> None:
+        """Export all buffered spans."""
+        if not self._buffer:
+            return
+        spans = list(self._buffer)
+        self._buffer.clear()
+        for exporter in self.exporters:
+            try:
+                await exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Span export via {type(exporter).__name__} failed: {e}")
+
+    async def start(self) -> None:
+        if self.exporters and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        for exporter in self.exporters:
+            if isinstance(exporter, OTLPSpanExporter):
+                await exporter.aclose()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+class span:
+    """Context manager (sync or async) that times a block as a span."""
+
+    __slots__ = ("name", "attributes", "span", "_start", "_token")
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = tracer.start_span(self.name, self.attributes)
+        self._token = _current_span.set(self.span)
+        self._start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.span.duration_ms = (time.perf_counter() - self._start) * 1000
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        tracer.finish(self.span)
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run each call of a sync or async function in a span."""
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def _configured_exporters() -> List[SpanExporter]:
+    exporters: List[SpanExporter] = []
+    if settings.trace_export_path:
+        exporters.append(JSONLSpanExporter(settings.trace_export_path))
+    if settings.trace_otlp_endpoint:
+        exporters.append(OTLPSpanExporter(settings.trace_otlp_endpoint))
+    return exporters
+
+
+tracer = Tracer(_configured_exporters(), flush_interval=settings.trace_flush_interval_seconds)
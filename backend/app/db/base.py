@@ -1,35 +1,301 @@
 """
 Database Base Configuration
 
-Async SQLAlchemy engine and session configuration for Supabase PostgreSQL.
+Async SQLAlchemy engine and session configuration for Supabase PostgreSQL,
+with a tuned profile for single-node SQLite deployments.
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
+from app.core.tracing import tracer
+
+
+class PoolMetrics:
+    """Counters for connection checkout waits on an engine pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+
+pool_metrics = PoolMetrics()
+write_pool_metrics = PoolMetrics()  # SQLite single-writer engine
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+
+    # A class attribute rather than an argument, so pools the engine
+    # recreates (e.g. on dispose) keep reporting to the same counters
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedWritePool(InstrumentedQueuePool):
+    metrics = write_pool_metrics
+
+
+def _engine_options() -> Dict[str, Any]:
+    """Build create_async_engine() options from settings."""
+    url = make_url(settings.database_url)
+    options: Dict[str, Any] = {
+        "echo": settings.log_level == "DEBUG",  # SQL logging in debug mode
+    }
+
+    # SQLite keeps SQLAlchemy's default pool sizing (see the SQLite profile
+    # below), instrumented for on-disk files; the options that follow are for
+    # server databases only.
+    if url.get_backend_name() == "sqlite":
+        if is_sqlite_file(url):
+            options["poolclass"] = InstrumentedQueuePool
+        return options
+
+    if settings.db_null_pool:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            # Verify connections before use. With db_ping_idle_seconds set, only
+            # connections idle for longer than that are pinged (see below).
+            pool_pre_ping=settings.db_pool_pre_ping and not settings.db_ping_idle_seconds,
+        )
+
+    if settings.db_pgbouncer_mode and url.get_driver_name() == "asyncpg":
+        # Transaction poolers (Supabase pooler / PgBouncer) hand each transaction
+        # to a different server connection, so prepared statements must not be
+        # cached or reused by name.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return options
+
+
+def is_sqlite_file(url: URL) -> bool:
+    """Whether the URL is an on-disk SQLite database (not :memory:)."""
+    return (
+        url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def sqlite_pragmas() -> List[str]:
+    """PRAGMAs applied to every SQLite connection, from settings."""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        "PRAGMA foreign_keys = ON",  # Needed for ON DELETE CASCADE
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}",  # Negative = KiB
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+    ]
+    if settings.sqlite_wal:
+        # Persistent per database file: readers keep reading while one writer writes
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+
+def apply_sqlite_pragmas(async_engine: AsyncEngine, pragmas: List[str]) -> None:
+    """Run `pragmas` on each new connection of a SQLite engine."""
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def trace_queries(async_engine: AsyncEngine) -> None:
+    """Record a "db.query" span for every statement executed on the engine."""
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+        context._query_span = tracer.start_span("db.query", {"statement": statement.split(None, 1)[0].upper()})
+        context._query_start = time.perf_counter()
+
+    def _finish(context, error: Optional[BaseException] = None):
+        query_span = getattr(context, "_query_span", None)
+        if query_span is None:
+            return
+        query_span.duration_ms = (time.perf_counter() - context._query_start) * 1000
+        if error is not None:
+            query_span.error = f"{type(error).__name__}: {error}"
+        context._query_span = None
+        tracer.finish(query_span)
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _finish_query_span(conn, cursor, statement, parameters, context, executemany):
+        _finish(context)
+
+    @event.listens_for(async_engine.sync_engine, "handle_error")
+    def _fail_query_span(exception_context):
+        if exception_context.execution_context is not None:
+            _finish(exception_context.execution_context, exception_context.original_exception)
+
+
+def create_sqlite_write_engine(url: str) -> AsyncEngine:
+    """
+    Engine with exactly one connection, used for all writes.
+
+    SQLite allows a single writer at a time; queueing writers on this
+    connection in-process avoids SQLITE_BUSY retries and lock stalls.
+    """
+    options = {**_engine_options(), "poolclass": InstrumentedWritePool}
+    return create_async_engine(
+        url,
+        **options,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.db_pool_timeout,
+    )
+
+
+class RoutingSession(Session):
+    """
+    Session that sends flushes and INSERT/UPDATE/DELETE to a writer engine.
+
+    Reads use the regular (reader) engine. A read does not see rows the same
+    session flushed but hasn't committed yet, so commit writes before reading
+    them back (the repositories commit after every write).
+    """
+
+    def __init__(self, *args, writer: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.writer is not None and (self._flushing or isinstance(clause, UpdateBase)):
+            return self.writer
+        return super().get_bind(mapper, clause=clause, **kw)
+
 
 # Create async engine for Supabase PostgreSQL
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.log_level == "DEBUG",  # SQL logging in debug mode
-    pool_pre_ping=True,  # Verify connections before use
-)
+engine = create_async_engine(settings.database_url, **_engine_options())
+
+trace_queries(engine)
+
+# Dedicated single-writer engine (on-disk SQLite only)
+write_engine: Optional[AsyncEngine] = None
+
+if make_url(settings.database_url).get_backend_name() == "sqlite":
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+    if settings.sqlite_single_writer and is_sqlite_file(make_url(settings.database_url)):
+        write_engine = create_sqlite_write_engine(settings.database_url)
+        apply_sqlite_pragmas(write_engine, sqlite_pragmas())
+        trace_queries(write_engine)
+
+
+if settings.db_ping_idle_seconds and not settings.db_null_pool:
+    # Replacement for per-checkout pre-ping: only ping connections that have
+    # sat idle in the pool long enough to have been dropped server-side.
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_ping_idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError() from e
+
+
+def _pool_stats(async_engine: AsyncEngine, counters: PoolMetrics) -> Dict[str, Any]:
+    pool = async_engine.sync_engine.pool
+    metrics: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),  # Connections open beyond pool_size
+        )
+
+    metrics.update(
+        checkouts=counters.checkouts,
+        checkout_timeouts=counters.timeouts,
+        avg_wait_ms=round(1000 * counters.total_wait / counters.checkouts, 3)
+        if counters.checkouts else 0.0,
+        max_wait_ms=round(1000 * counters.max_wait, 3),
+    )
+    return metrics
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Current pool occupancy and checkout wait statistics of the engine, and
+    of the SQLite single-writer engine under "writer" when there is one.
+    """
+    metrics = _pool_stats(engine, pool_metrics)
+    if write_engine is not None:
+        metrics["writer"] = _pool_stats(write_engine, write_pool_metrics)
+    return metrics
+
 
 # Async session factory
 AsyncSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    writer=write_engine.sync_engine if write_engine else None,
 )
 
 # Declarative base for models
 Base = declarative_base()
 
 
+async def release_connection(session: AsyncSession) -> None:
+    """
+    End the session's transaction and return its connection to the pool.
+
+    The session stays usable: the next query starts a fresh short transaction
+    on a newly checked-out connection. Call this before long non-DB work (LLM
+    calls) so a request never holds a pooled connection or an open
+    transaction while it waits. Loaded objects stay usable but detached.
+    """
+    await session.close()
+
+
 async def get_db():
     """
     Dependency that provides a database session.
-    
+
     Usage in FastAPI:
         @router.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
@@ -1,18 +1,47 @@
 """
 SQLAlchemy Database Models
 
-Defines the core entities: User, Resume, and Analysis.
+Defines the core entities: User, Resume, JobDescription, and Analysis.
 """
 
-from sqlalchemy import Column, String, Text, Float, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Float, DateTime, ForeignKey, JSON, Index, select
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 import uuid
 
 from app.db.base import Base
 
 
+# JSONB on PostgreSQL (indexable with GIN); JSON (queried via JSON1) elsewhere
+IndexedJSON = JSON().with_variant(JSONB(), "postgresql")
+
+
+class precise_now(FunctionElement):
+    """
+    Current timestamp with sub-second precision on every dialect.
+
+    Used for updated_at, which versions records for ETags: SQLite's
+    CURRENT_TIMESTAMP only has whole seconds, so two updates within a second
+    would otherwise be indistinguishable.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(precise_now)
+def _precise_now(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(precise_now, "sqlite")
+def _precise_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
 class User(Base):
     """User account for authentication and ownership."""
     
@@ -22,7 +51,7 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=precise_now())
 
     # Relationships
     resumes = relationship("Resume", back_populates="user", cascade="all, delete-orphan")
@@ -41,9 +70,21 @@ class Resume(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
     content_text = Column(Text)  # Raw extracted text from PDF
-    parsed_data = Column(JSON)   # Structured data from AI parsing
+    parsed_data = Column(IndexedJSON)  # Structured data from AI parsing
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=precise_now())
+
+    __table_args__ = (
+        # Keyset pagination of a user's resumes, newest first
+        Index("ix_resumes_user_id_created_at_id", user_id, created_at.desc(), id),
+        # Containment queries into parsed data (e.g. resumes with a skill)
+        Index(
+            "ix_resumes_parsed_data",
+            parsed_data,
+            postgresql_using="gin",
+            postgresql_ops={"parsed_data": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
     user = relationship("User", back_populates="resumes")
@@ -53,6 +94,20 @@ class Resume(Base):
         return f"<Resume(id={self.id}, filename={self.filename})>"
 
 
+class JobDescription(Base):
+    """A job posting, stored once per distinct (whitespace-normalized) text."""
+
+    __tablename__ = "job_descriptions"
+
+    id = Column(String(64), primary_key=True)  # sha256 of the normalized text
+    text = Column(Text, nullable=False)
+    parsed_data = Column(IndexedJSON)  # Cached ParsedJobData, shared by all analyses of this posting
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<JobDescription(id={self.id[:12]})>"
+
+
 class Analysis(Base):
     """Job analysis result with match score and generated content."""
     
@@ -62,23 +117,44 @@ class Analysis(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    # Job information
-    job_description = Column(Text, nullable=False)
+    # Job information (the text is deduplicated in job_descriptions)
+    job_description_id = Column(String(64), ForeignKey("job_descriptions.id"), nullable=False, index=True)
+    job_description = column_property(
+        select(JobDescription.text)
+        .where(JobDescription.id == job_description_id)
+        .correlate_except(JobDescription)
+        .scalar_subquery()
+    )
     job_url = Column(String(2048))
     
     # Analysis results
     match_score = Column(Float)  # 0-100 percentage
-    skill_gaps = Column(JSON)    # List of missing/weak skills
+    skill_gaps = Column(IndexedJSON)  # List of missing/weak skills
     suggestions = Column(JSON)   # Resume improvement suggestions
     
     # Generated content
     cold_email = Column(Text)
     linkedin_dm = Column(Text)
     interview_questions = Column(JSON)  # List of likely interview questions
+
+    # Full per-stage pipeline outputs with input fingerprints (for incremental re-runs)
+    stage_results = Column(JSON)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=precise_now())
+
+    __table_args__ = (
+        # Keyset pagination of a user's analyses, newest first
+        Index("ix_analyses_user_id_created_at_id", user_id, created_at.desc(), id),
+        # Containment queries into skill gaps (e.g. analyses missing a skill)
+        Index(
+            "ix_analyses_skill_gaps",
+            skill_gaps,
+            postgresql_using="gin",
+            postgresql_ops={"skill_gaps": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
     user = relationship("User", back_populates="analyses")
@@ -1,4 +1,6 @@
 # Repositories Module
 from app.db.repositories.base import BaseRepository
+from app.db.repositories.skills import AnalysisRepository, ResumeRepository
+from app.db.repositories.job_descriptions import JobDescriptionRepository
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "AnalysisRepository", "ResumeRepository", "JobDescriptionRepository"]
@@ -5,9 +5,12 @@ Generic repository pattern for database operations.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
-from typing import TypeVar, Generic, Type, Optional, List, Any
+from sqlalchemy import select, update, delete, or_, and_
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, defer
+from typing import TypeVar, Generic, Type, Optional, List, Any, Iterable, Sequence, Tuple, Union
+from datetime import datetime
 from uuid import UUID
 
 T = TypeVar("T")
@@ -20,12 +23,46 @@ class BaseRepository(Generic[T]):
         self.model = model
         self.db = db
 
-    async def get(self, id: UUID) -> Optional[T]:
-        """Get a single record by ID."""
+    @property
+    def dialect(self) -> str:
+        """Name of the database dialect the session is bound to (postgresql, sqlite)."""
+        return self.db.get_bind().dialect.name
+
+    def _columns(self, names: Sequence[str]) -> list:
+        """Resolve column names that exist on the model (others are ignored)."""
+        return [getattr(self.model, name) for name in names if hasattr(self.model, name)]
+
+    def _scoped(self, statement, id: UUID, user_id: Optional[UUID]):
+        """Restrict a statement to one record, and to its owner if `user_id` is given."""
+        statement = statement.where(self.model.id == id)
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        return statement
+
+    async def get(self, id: UUID, exclude: Sequence[str] = (), user_id: Optional[UUID] = None) -> Optional[T]:
+        """
+        Get a single record by ID (owned by `user_id`, if given).
+
+        Columns in `exclude` are deferred (not loaded). Accessing them on the
+        returned object raises instead of silently issuing a lazy load.
+        """
+        query = self._scoped(select(self.model), id, user_id)
+        if exclude:
+            query = query.options(*(defer(column, raiseload=True) for column in self._columns(exclude)))
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_version(self, id: UUID, user_id: Optional[UUID] = None) -> Optional[Row]:
+        """
+        Get the (created_at, updated_at) of a record (owned by `user_id`, if given).
+
+        Only the two timestamps are selected, so a record's version can be
+        checked (e.g. for an ETag) without loading its content.
+        """
         result = await self.db.execute(
-            select(self.model).where(self.model.id == id)
+            self._scoped(select(self.model.created_at, self.model.updated_at), id, user_id)
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
 
     async def get_by_field(self, field: str, value: Any) -> Optional[T]:
         """Get a single record by a specific field."""
@@ -57,45 +94,143 @@ class BaseRepository(Generic[T]):
         self,
         user_id: UUID,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[T]:
-        """Get all records for a specific user."""
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        filters: Sequence[Any] = ()
+    ) -> Union[List[T], List[Row]]:
+        """
+        Get all records for a specific user, newest first.
+
+        If `columns` is given, only those columns are selected and lightweight
+        rows (with attribute access) are returned instead of ORM objects, so
+        large text/JSON columns are never fetched for list views.
+
+        `after` is a keyset cursor: the (created_at, id) of the last record of
+        the previous page. Ordering matches the (user_id, created_at DESC, id)
+        index, so fetching any page costs the same regardless of depth.
+
+        `filters` are extra WHERE clauses (e.g. from a subclass's query helpers).
+        """
+        query = select(*self._columns(columns)) if columns else select(self.model)
+        query = query.where(self.model.user_id == user_id, *filters)
+
+        if after:
+            created_at, last_id = after
+            query = query.where(or_(
+                self.model.created_at < created_at,
+                and_(self.model.created_at == created_at, self.model.id > last_id),
+            ))
+
         result = await self.db.execute(
-            select(self.model)
-            .where(self.model.user_id == user_id)
-            .order_by(self.model.created_at.desc())
+            query
+            .order_by(self.model.created_at.desc(), self.model.id.asc())
             .offset(skip)
             .limit(limit)
         )
-        return list(result.scalars().all())
+        return list(result.all()) if columns else list(result.scalars().all())
 
     async def create(self, obj: T) -> T:
-        """Create a new record."""
+        """
+        Create a new record.
+
+        Server-generated columns (created_at) come back via INSERT ... RETURNING
+        in the same statement, so no refresh SELECT is needed.
+        """
         self.db.add(obj)
         await self.db.commit()
-        await self.db.refresh(obj)
         return obj
 
-    async def update(self, id: UUID, **kwargs) -> Optional[T]:
-        """Update a record by ID."""
-        await self.db.execute(
-            update(self.model)
-            .where(self.model.id == id)
-            .values(**kwargs)
+    async def create_if_absent(self, **values) -> Optional[T]:
+        """
+        Insert a record unless it conflicts with an existing one.
+
+        On PostgreSQL and SQLite a single INSERT ... ON CONFLICT DO NOTHING
+        RETURNING statement, so concurrent callers never fail on a unique
+        violation; other databases insert in a savepoint and treat an
+        IntegrityError as the conflict. Returns the new record, or None if a
+        conflicting record already existed (callers re-select it).
+        """
+        if self.dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif self.dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return await self._create_or_none(self.model(**values))
+
+        result = await self.db.execute(
+            insert(self.model).values(**values).on_conflict_do_nothing().returning(self.model)
         )
+        obj = result.scalar_one_or_none()
         await self.db.commit()
-        return await self.get(id)
+        return obj
 
-    async def delete(self, id: UUID) -> bool:
-        """Delete a record by ID."""
-        obj = await self.get(id)
-        if obj:
-            await self.db.delete(obj)
+    async def _create_or_none(self, obj: T) -> Optional[T]:
+        """Insert `obj` in a savepoint; None if it violates a constraint."""
+        try:
+            async with self.db.begin_nested():
+                self.db.add(obj)
+        except IntegrityError:
             await self.db.commit()
-            return True
-        return False
+            return None
+        await self.db.commit()
+        return obj
+
+    async def create_many(self, objs: Sequence[T]) -> List[T]:
+        """Create several records, batched into multi-row INSERT ... RETURNING statements."""
+        self.db.add_all(objs)
+        await self.db.commit()
+        return list(objs)
+
+    async def update(self, id: UUID, user_id: Optional[UUID] = None, **kwargs) -> Optional[T]:
+        """
+        Update a record by ID (owned by `user_id`, if given).
+
+        Uses UPDATE ... RETURNING, so the updated record comes back in the same
+        round trip. Returns None if no matching record exists.
+        """
+        result = await self.db.execute(
+            self._scoped(update(self.model), id, user_id)
+            .values(**kwargs)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        obj = result.scalar_one_or_none()
+        await self.db.commit()
+        return obj
+
+    async def delete(self, id: UUID, user_id: Optional[UUID] = None) -> bool:
+        """
+        Delete a record by ID (owned by `user_id`, if given) in a single statement.
+
+        Dependent rows are removed by the foreign keys' ON DELETE CASCADE.
+        Returns False if no matching record exists.
+        """
+        result = await self.db.execute(
+            self._scoped(delete(self.model), id, user_id).returning(self.model.id)
+        )
+        deleted = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        return deleted
+
+    async def delete_many(self, ids: Iterable[UUID], user_id: Optional[UUID] = None) -> List[UUID]:
+        """Delete several records (owned by `user_id`, if given); returns the IDs actually deleted."""
+        ids = list(ids)
+        if not ids:
+            return []
+
+        statement = delete(self.model).where(self.model.id.in_(ids))
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+
+        result = await self.db.execute(statement.returning(self.model.id))
+        deleted = list(result.scalars().all())
+        await self.db.commit()
+        return deleted
 
     async def exists(self, id: UUID) -> bool:
         """Check if a record exists."""
-        result = await self.get(id)
-        return result is not None
+        result = await self.db.execute(
+            select(self.model.id).where(self.model.id == id)
+        )
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,39 @@
+"""
+Job Description Repository
+
+Job postings are stored once per distinct text, keyed by a content hash,
+and shared by every analysis of that posting.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
+
+from app.db.models import JobDescription
+from app.db.repositories.base import BaseRepository
+
+
+def normalize_job_description(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a posting match."""
+    return " ".join(text.split())
+
+
+def job_description_hash(text: str) -> str:
+    """Content hash of the normalized text (the job_descriptions primary key)."""
+    return hashlib.sha256(normalize_job_description(text).encode("utf-8")).hexdigest()
+
+
+class JobDescriptionRepository(BaseRepository[JobDescription]):
+    """Repository for deduplicated job descriptions."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(JobDescription, db)
+
+    async def get_or_create(self, text: str) -> JobDescription:
+        """
+        Return the stored job description for `text`, inserting it if new.
+
+        The first submitted copy of a posting is the one kept; later copies
+        differing only in whitespace reuse it.
+        """
+        id = job_description_hash(text)
+        return await self.create_if_absent(id=id, text=text) or await self.get(id)
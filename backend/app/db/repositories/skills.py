@@ -0,0 +1,135 @@
+"""
+Skill Repositories
+
+Queries into the skills stored in resume parsed data and analysis skill gaps.
+On PostgreSQL these are JSONB containment queries served by GIN indexes; on
+SQLite they fall back to JSON1 expressions.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, exists, literal_column, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.elements import ColumnElement
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.db.models import Analysis, Resume
+from app.db.repositories.base import BaseRepository
+
+# skill_gaps holds both missing and weak skills; missing ones have no current level
+MISSING_LEVEL = "none"
+
+# Other ways the model writes a missing skill's current level
+_MISSING_ALIASES = frozenset({"", "n/a", "na", "null", "missing", "-"})
+
+
+def normalize_skill_gap(gap: Dict[str, Any], missing: bool = False) -> Dict[str, Any]:
+    """
+    A skill gap as stored: current_level lower-cased, and exactly MISSING_LEVEL
+    for missing skills (listed as missing, or at a level such as "None" or
+    "N/A"), so the missing-skill queries can match it.
+    """
+    level = str(gap.get("current_level") or "").strip().lower()
+    if missing or level in _MISSING_ALIASES:
+        level = MISSING_LEVEL
+    return {**gap, "current_level": level}
+
+
+class AnalysisRepository(BaseRepository[Analysis]):
+    """Analysis repository with skill gap queries."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Analysis, db)
+
+    async def update(self, id: UUID, user_id: Optional[UUID] = None, **kwargs) -> Optional[Analysis]:
+        """
+        Update an analysis in one UPDATE ... RETURNING statement.
+
+        The job description text (a subquery into job_descriptions) is
+        returned alongside the row, since RETURNING an entity only covers
+        its table's own columns.
+        """
+        result = await self.db.execute(
+            self._scoped(update(Analysis), id, user_id)
+            .values(**kwargs)
+            .returning(Analysis, Analysis.job_description)
+            .execution_options(populate_existing=True)
+        )
+        row = result.one_or_none()
+        await self.db.commit()
+        if row is None:
+            return None
+
+        analysis, job_description = row
+        set_committed_value(analysis, "job_description", job_description)
+        return analysis
+
+    def missing_skill_filter(self, skill: str) -> ColumnElement[bool]:
+        """WHERE clause: the analysis lists `skill` as missing (not merely weak)."""
+        if self.dialect == "postgresql":
+            # skill_gaps @> '[{"skill": ..., "current_level": "none"}]' (GIN jsonb_path_ops index)
+            return type_coerce(Analysis.skill_gaps, JSONB).contains(
+                [{"skill": skill, "current_level": MISSING_LEVEL}]
+            )
+
+        gap = func.json_each(Analysis.skill_gaps).table_valued("value").alias("gap")
+        return exists(
+            select(1).select_from(gap).where(
+                func.json_extract(gap.c.value, "$.skill") == skill,
+                func.json_extract(gap.c.value, "$.current_level") == MISSING_LEVEL,
+            )
+        )
+
+    async def get_missing_skill(self, user_id: UUID, skill: str, limit: int = 100) -> List[Analysis]:
+        """A user's analyses in which `skill` is missing, newest first."""
+        return await self.get_by_user(user_id, limit=limit, filters=[self.missing_skill_filter(skill)])
+
+    async def top_missing_skills(self, user_id: UUID, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        The skills most often missing across a user's analyses, as (skill, count).
+        Weak skills (present at a low level) are not counted.
+
+        Aggregated in the database by unnesting skill_gaps; rows are never
+        loaded into Python.
+        """
+        if self.dialect == "postgresql":
+            gap = func.jsonb_array_elements(Analysis.skill_gaps).table_valued("value").alias("gap")
+            skill = gap.c.value.op("->>")(literal_column("'skill'"))
+            level = gap.c.value.op("->>")(literal_column("'current_level'"))
+        else:
+            gap = func.json_each(Analysis.skill_gaps).table_valued("value").alias("gap")
+            skill = func.json_extract(gap.c.value, "$.skill")
+            level = func.json_extract(gap.c.value, "$.current_level")
+
+        count = func.count()
+        result = await self.db.execute(
+            select(skill.label("skill"), count.label("count"))
+            .select_from(Analysis)
+            .join(gap, literal_column("true"))
+            .where(Analysis.user_id == user_id, skill.is_not(None), level == MISSING_LEVEL)
+            .group_by(skill)
+            .order_by(count.desc(), skill)
+            .limit(limit)
+        )
+        return [(row.skill, row.count) for row in result]
+
+
+class ResumeRepository(BaseRepository[Resume]):
+    """Resume repository with parsed skill queries."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Resume, db)
+
+    def skill_filter(self, skill: str) -> ColumnElement[bool]:
+        """WHERE clause: the resume's parsed skills include `skill`."""
+        if self.dialect == "postgresql":
+            # parsed_data @> '{"skills": [...]}' (GIN jsonb_path_ops index)
+            return type_coerce(Resume.parsed_data, JSONB).contains({"skills": [skill]})
+
+        item = func.json_each(Resume.parsed_data, "$.skills").table_valued("value").alias("item")
+        return exists(select(1).select_from(item).where(item.c.value == skill))
+
+    async def get_with_skill(self, user_id: UUID, skill: str, limit: int = 100) -> List[Resume]:
+        """A user's resumes listing `skill`, newest first."""
+        return await self.get_by_user(user_id, limit=limit, filters=[self.skill_filter(skill)])
@@ -4,24 +4,41 @@ ApplyWise API - FastAPI Application Entry Point
 Main application configuration with CORS, exception handlers, and router setup.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
-import sys
 
 from app.core.config import settings
+from app.core.logs import configure_logging
+
+# Configure loguru: background writer, request id on every record. This runs
+# before the imports below, since importing app.api (routes -> services ->
+# agents) builds every agent and logs while doing so.
+log_sink = configure_logging()
+
+from app.agents.retry import retry_policy
+from app.api.compression import CompressionMiddleware
+from app.api.server_timing import ServerTimingMiddleware
+from app.core.jwks import jwks_manager
+from app.core.response_cache import detail_cache
+from app.core.tracing import tracer
+from app.db.base import get_pool_metrics
 
 from asgi_correlation_id import CorrelationIdMiddleware
-from asgi_correlation_id.context import correlation_id
-
-# Configure loguru with Correlation ID
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>[req:{extra[request_id]}]</magenta> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level=settings.log_level,
-    filter=lambda record: record["extra"].update(request_id=correlation_id.get() or "N/A"),
-)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up caches on startup so the first requests don't pay for them."""
+    await tracer.start()
+    if settings.supabase_url:
+        await jwks_manager.start()
+    yield
+    await jwks_manager.stop()
+    await tracer.stop()  # Flushes buffered spans
+    log_sink.flush()  # Writes queued log records
+
 
 app = FastAPI(
     title="ApplyWise API",
@@ -30,6 +47,18 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
+)
+
+# Request tracing spans and the Server-Timing header
+app.add_middleware(ServerTimingMiddleware, header=settings.server_timing)
+
+# Response Compression (gzip, or brotli when installed)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_compresslevel=settings.gzip_compresslevel,
+    brotli_quality=settings.brotli_quality,
 )
 
 # CORS Middleware (Must be last to handle OPTIONS correctly before correlation middleware?)
@@ -40,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Request Tracing Middleware
@@ -52,6 +82,24 @@ async def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
 
+@app.get("/health/db", tags=["Health"])
+async def db_pool_health():
+    """Database connection pool occupancy and checkout wait metrics."""
+    return get_pool_metrics()
+
+
+@app.get("/health/cache", tags=["Health"])
+async def response_cache_health():
+    """Detail response cache size and hit rates."""
+    return detail_cache.stats()
+
+
+@app.get("/health/llm", tags=["Health"])
+async def llm_retry_health():
+    """Model call failures and retries per failure class, and the retry budget."""
+    return retry_policy.stats()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
@@ -4,10 +4,11 @@ Pydantic Schemas for Analysis
 Request/Response models for job analysis and generated content.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices, computed_field, field_validator, model_validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, List
+from enum import Enum
+from typing import Optional, List, Dict, Any
 
 
 class SkillGap(BaseModel):
@@ -25,11 +26,53 @@ class ImprovementAction(BaseModel):
     estimated_time: str
 
 
+class AnalysisStage(str, Enum):
+    """Pipeline stages that can be regenerated individually."""
+    resume = "resume"
+    job = "job"
+    match = "match"
+    strategy = "strategy"
+    content = "content"
+
+
+class AnalysisMode(str, Enum):
+    """How much of the pipeline to run when creating an analysis."""
+    full = "full"
+    quick = "quick"  # Match score and gaps only; strategy/content generated on demand
+
+
+class StageStatus(BaseModel):
+    """Status of a single pipeline stage."""
+    fingerprint: Optional[str] = Field(None, description="Hash of the stage inputs")
+    status: Optional[str] = Field(None, description="completed, failed, or pending")
+    error: Optional[str] = Field(None, description="Failure reason if the stage failed")
+
+    @model_validator(mode="before")
+    @classmethod
+    def default_status(cls, v):
+        """Records stored before stage statuses are completed if they have output."""
+        if isinstance(v, dict) and v.get("status") is None:
+            return {**v, "status": "completed" if v.get("output") is not None else "pending"}
+        return v
+
+
+class StageResult(StageStatus):
+    """Stored output of a single pipeline stage."""
+    output: Optional[Dict[str, Any]] = None
+
+
 class AnalysisRequest(BaseModel):
     """Schema for creating a new analysis."""
     resume_id: UUID
     job_description: str = Field(..., min_length=50, description="Job description text (min 50 chars)")
     job_url: Optional[str] = None
+    mode: AnalysisMode = AnalysisMode.full
+
+
+class AnalysisUpdateRequest(BaseModel):
+    """Schema for editing an analysis; only stages affected by the change are re-run."""
+    job_description: str = Field(..., min_length=50, description="Job description text (min 50 chars)")
+    job_url: Optional[str] = None
 
 
 class AnalysisResponse(BaseModel):
@@ -48,14 +91,56 @@ class AnalysisResponse(BaseModel):
     cold_email: Optional[str] = None
     linkedin_dm: Optional[str] = None
     interview_questions: List[str] = Field(default_factory=list)
+
+    # Status of every pipeline stage (raw outputs: AnalysisStagesResponse)
+    stages: Dict[str, StageStatus] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("stage_results", "stages"),
+    )
     
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    @field_validator("stages", mode="before")
+    @classmethod
+    def default_stages(cls, v):
+        """Analyses created before stage persistence have no stage results."""
+        return v or {}
+
+    @computed_field
+    @property
+    def pending_stages(self) -> List[str]:
+        """Stages not run yet (e.g. strategy/content of a quick analysis)."""
+        return [
+            stage.value for stage in AnalysisStage
+            if self.stages
+            and (stage.value not in self.stages or self.stages[stage.value].status == "pending")
+        ]
+
+    @computed_field
+    @property
+    def failed_stages(self) -> List[str]:
+        """Stages whose last run failed; retry them via /retry."""
+        return [stage for stage, result in self.stages.items() if result.status == "failed"]
+
     class Config:
         from_attributes = True
 
 
+class AnalysisStagesResponse(AnalysisResponse):
+    """Analysis with the raw output stored for each pipeline stage (opt-in)."""
+    stages: Dict[str, StageResult] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("stage_results", "stages"),
+    )
+
+
+class SkillCount(BaseModel):
+    """How many of a user's analyses list a skill as a gap."""
+    skill: str
+    count: int
+
+
 class AnalysisListResponse(BaseModel):
     """Schema for analysis list item (lighter response)."""
     id: UUID
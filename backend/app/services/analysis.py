@@ -5,57 +5,205 @@ Business logic for running job analysis pipeline.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
 from uuid import UUID
-from typing import List
-import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NoReturn, Optional, Tuple
+import hashlib
+import json
 
-from app.db.repositories.base import BaseRepository
-from app.db.models import Analysis, Resume, User
+from loguru import logger
+
+from app.db.base import AsyncSessionLocal, release_connection
+from app.db.repositories import AnalysisRepository, ResumeRepository, JobDescriptionRepository
+from app.db.repositories.job_descriptions import normalize_job_description
+from app.db.repositories.skills import normalize_skill_gap
+from app.db.models import Analysis, JobDescription, Resume, User
 from app.api.deps import CurrentUser
-from app.schemas.analysis import AnalysisRequest
-from app.agents import run_analysis_pipeline, PipelineResult
+from app.schemas.analysis import AnalysisRequest, AnalysisUpdateRequest, AnalysisMode, AnalysisListResponse
+from app.agents import run_analysis_pipeline, PipelineResult, StageRecords, stage_fingerprint
+from app.agents.pipeline import STATUS_FAILED
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import detail_cache
+from app.core.singleflight import SingleFlight
+
+
+# Concurrent identical create requests (double-clicks, retries, multiple tabs)
+# share one pipeline run instead of each starting their own.
+_create_flight: SingleFlight[Analysis] = SingleFlight("analysis")
+
+# (user_id, Idempotency-Key) -> (request fingerprint, analysis id) of the completed request
+_idempotency_results: TTLCache[Tuple[str, UUID]] = TTLCache(
+    maxsize=settings.idempotency_max_entries,
+    ttl=settings.idempotency_ttl_seconds,
+)
+
+
+# Analysis columns filled from each optional stage's output
+STAGE_COLUMNS = {
+    "strategy": ("suggestions",),
+    "content": ("cold_email", "linkedin_dm", "interview_questions"),
+}
+
+
+def _fingerprint(*parts: Any) -> str:
+    """Hash of a request's fields, stored with its Idempotency-Key."""
+    return hashlib.sha256(json.dumps([str(part) for part in parts]).encode("utf-8")).hexdigest()
 
 
 class AnalysisService:
     def __init__(self, db: AsyncSession):
-        self.repo = BaseRepository(Analysis, db)
-        self.resume_repo = BaseRepository(Resume, db)
+        self.db = db
+        self.repo = AnalysisRepository(db)
+        self.resume_repo = ResumeRepository(db)
+        self.job_repo = JobDescriptionRepository(db)
+
+    async def list_analyses(
+        self,
+        user: User,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        missing_skill: Optional[str] = None
+    ) -> List[Row]:
+        """
+        List all analyses for a user (only the columns the list view needs).
+        With `missing_skill`, only analyses that list it as a skill gap.
+        """
+        return await self.repo.get_by_user(
+            user.id,
+            limit=limit,
+            columns=list(AnalysisListResponse.model_fields),
+            after=after,
+            filters=[self.repo.missing_skill_filter(missing_skill)] if missing_skill else (),
+        )
 
-    async def list_analyses(self, user: User) -> List[Analysis]:
-        """List all analyses for a user."""
-        return await self.repo.get_by_user(user.id)
+    async def top_missing_skills(self, user: User, limit: int = 10) -> List[Tuple[str, int]]:
+        """The skills most often missing across a user's analyses."""
+        return await self.repo.top_missing_skills(user.id, limit)
 
     async def get_analysis(self, analysis_id: UUID, user: User) -> Analysis:
-        """Get a specific analysis."""
-        analysis = await self.repo.get(analysis_id)
-        if not analysis or analysis.user_id != user.id:
+        """Get a specific analysis owned by user."""
+        analysis = await self.repo.get(analysis_id, user_id=user.id)
+        if not analysis:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Analysis not found"
             )
         return analysis
 
+    async def get_analysis_with_stage_outputs(self, analysis_id: UUID, user: User) -> Analysis:
+        """
+        Get an analysis with the raw output of every pipeline stage.
+        The resume and job stages are stored without their output, which is
+        filled in from the parses stored on the resume and job description.
+        """
+        analysis = await self.get_analysis(analysis_id, user)
+        resume = await self.resume_repo.get(analysis.resume_id)
+        job = await self.job_repo.get(analysis.job_description_id)
+
+        stages = dict(analysis.stage_results or {})
+        for stage, seed in self._seed_stages(resume, job).items():
+            record = stages.get(stage)
+            if record and record.get("output") is None and record.get("fingerprint") == seed["fingerprint"]:
+                stages[stage] = {**record, "output": seed["output"]}
+        # Only for the response: not a change to write back
+        set_committed_value(analysis, "stage_results", stages)
+        return analysis
+
+    async def get_analysis_version(self, analysis_id: UUID, user: User) -> Row:
+        """Get the (created_at, updated_at) of an analysis owned by user, without its content."""
+        version = await self.repo.get_version(analysis_id, user_id=user.id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis not found"
+            )
+        return version
+
     async def delete_analysis(self, analysis_id: UUID, user: User) -> bool:
-        """Delete an analysis."""
-        analysis = await self.repo.get(analysis_id)
-        if not analysis or analysis.user_id != user.id:
+        """Delete an analysis owned by user (a single DELETE statement)."""
+        if not await self.repo.delete(analysis_id, user_id=user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Analysis not found"
             )
-        return await self.repo.delete(analysis_id)
+        await detail_cache.invalidate("analysis", user.id, analysis_id)
+        return True
+
+    async def create_analysis(
+        self,
+        request: AnalysisRequest,
+        user: User,
+        idempotency_key: Optional[str] = None
+    ) -> Analysis:
+        """
+        Create an analysis, coalescing identical in-flight requests.
 
-    async def create_analysis(self, request: AnalysisRequest, user: User) -> Analysis:
+        Requests with the same (user, resume, normalized job description, mode,
+        job URL) that arrive while one is running await its result. A retried request
+        with a previously seen Idempotency-Key returns the stored analysis; a
+        key reused for a different request is rejected with 422.
+        """
+        flight_key = (
+            user.id,
+            request.resume_id,
+            normalize_job_description(request.job_description),
+            request.mode,
+            request.job_url,
+        )
+        fingerprint = _fingerprint(*flight_key[1:])
+
+        if idempotency_key:
+            stored = _idempotency_results.get((user.id, idempotency_key))
+            if stored:
+                stored_fingerprint, analysis_id = stored
+                if stored_fingerprint != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                        detail="Idempotency-Key was already used for a different request"
+                    )
+                return await self.get_analysis(analysis_id, user)
+
+        # The auth lookup left a transaction open on this session; don't hold
+        # it while waiting on another request's in-flight pipeline.
+        await release_connection(self.db)
+
+        analysis = await _create_flight.do(flight_key, lambda: self._create_analysis_in_own_session(request, user))
+
+        if idempotency_key:
+            _idempotency_results.set((user.id, idempotency_key), (fingerprint, analysis.id))
+        return analysis
+
+    async def _create_analysis_in_own_session(self, request: AnalysisRequest, user: User) -> Analysis:
+        """
+        Run _create_analysis on a session of its own.
+
+        The work is shared with coalesced callers and outlives the request
+        that started it, so it must not use that request's session, which is
+        closed when the request ends (or its client disconnects).
+        """
+        async with AsyncSessionLocal(bind=self.db.bind) as db:
+            return await AnalysisService(db)._create_analysis(request, user)
+
+    async def _create_analysis(self, request: AnalysisRequest, user: User) -> Analysis:
         """
         Run full analysis pipeline:
-        1. Fetch resume text
+        1. Fetch resume text and the (deduplicated) job description
         2. Run AI pipeline (Job Analyzer -> Skill Gap -> Strategy -> Content)
         3. Save results
+
+        In quick mode the pipeline stops after the skill gap analysis;
+        strategy and content are generated later by complete_analysis().
+
+        No database connection is held while the LLM stages run: the read and
+        each checkpoint write are short transactions released right away.
         """
         # 1. Fetch Resume
-        resume = await self.resume_repo.get(request.resume_id)
-        if not resume or resume.user_id != user.id:
+        resume = await self.resume_repo.get(request.resume_id, user_id=user.id)
+        if not resume:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Resume not found"
@@ -66,50 +214,268 @@ class AnalysisService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Resume has no text content to analyze"
             )
+
+        job = await self.job_repo.get_or_create(request.job_description)
+        await release_connection(self.db)
             
         try:
             # 2. Run Pipeline
             # run_analysis_pipeline takes (resume_text, job_desc)
-            # It runs all agents in parallel/sequence
-            result: PipelineResult = await run_analysis_pipeline(
+            # It runs all agents in parallel/sequence. The resume was already
+            # parsed on upload, and a previously analyzed posting has its parse
+            # cached, so those stages are seeded from the stored data.
+            # 3. The Analysis record is created at the first checkpoint (after
+            # the skill gap analysis) and updated as each later stage finishes.
+            analysis: Optional[Analysis] = None
+
+            async def checkpoint(partial: PipelineResult) -> None:
+                nonlocal analysis
+                if analysis is None:
+                    await self._cache_parsed_data(resume, job, partial)
+                    analysis = await self.repo.create(Analysis(
+                        user_id=user.id,
+                        resume_id=resume.id,
+                        job_description_id=job.id,
+                        job_description=job.text,
+                        job_url=request.job_url,
+                        **self._result_fields(partial, resume, job)
+                    ))
+                else:
+                    analysis = await self.repo.update(analysis.id, **self._result_fields(partial, resume, job))
+                    await detail_cache.invalidate("analysis", user.id, analysis.id)
+                await release_connection(self.db)
+
+            await run_analysis_pipeline(
                 resume_text=resume.content_text,
-                job_description=request.job_description
+                job_description=job.text,
+                previous=self._seed_stages(resume, job),
+                quick=request.mode == AnalysisMode.quick,
+                checkpoint=checkpoint,
             )
             
-            # Map Agent Results to DB Model
-            
-            # Combine missing and weak skills for "skill_gaps"
-            # We convert Pydantic models to dicts for JSON storage
-            skill_gaps = [
-                gap.model_dump() 
-                for gap in (result.match_analysis.missing_skills + result.match_analysis.weak_skills)
-            ]
-            
-            # 3. Create Analysis Record
-            analysis = Analysis(
-                user_id=user.id,
-                resume_id=resume.id,
-                job_description=request.job_description,
-                job_url=request.job_url,
-                
-                match_score=result.match_analysis.match_score,
-                skill_gaps=skill_gaps,
-                suggestions=result.strategy.resume_improvements if result.strategy else [],
-                
-                cold_email=result.content.cold_email if result.content else None,
-                linkedin_dm=result.content.linkedin_dm if result.content else None,
-                interview_questions=result.content.interview_questions if result.content else []
-            )
-            
-            return await self.repo.create(analysis)
+            return analysis
             
         except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            print(f"CRITICAL PIPELINE ERROR:\n{error_trace}", file=sys.stderr)  # Force print to stderr
-            
-            # Log the full error here in a real app
+            self._raise_pipeline_error(e)
+
+    async def update_analysis(
+        self,
+        analysis_id: UUID,
+        request: AnalysisUpdateRequest,
+        user: User
+    ) -> Analysis:
+        """
+        Re-run an analysis against an edited job description.
+        Stages whose inputs are unchanged (e.g. resume parsing) are reused.
+        """
+        analysis = await self.get_analysis(analysis_id, user)
+        return await self._rerun(
+            analysis,
+            job_description=request.job_description,
+            job_url=request.job_url,
+        )
+
+    async def regenerate_stage(self, analysis_id: UUID, stage: str, user: User) -> Analysis:
+        """
+        Regenerate a single pipeline stage of an existing analysis.
+        Downstream stages are only re-run if the regenerated output changes their inputs.
+        """
+        analysis = await self.get_analysis(analysis_id, user)
+        return await self._rerun(analysis, force=[stage])
+
+    async def complete_analysis(self, analysis_id: UUID, user: User) -> Analysis:
+        """
+        Generate the strategy and content of a quick analysis on first request.
+        Analyses that already have them are returned without any LLM calls.
+        """
+        analysis = await self.get_analysis(analysis_id, user)
+        if not self._is_quick(analysis):
+            return analysis
+        return await self._rerun(analysis, quick=False)
+
+    async def retry_failed_stages(self, analysis_id: UUID, user: User) -> Analysis:
+        """
+        Retry only the failed stages of an analysis from its checkpoint.
+        Completed stages are reused, so recovering from a transient provider
+        error costs one LLM call per failed stage.
+        """
+        analysis = await self.get_analysis(analysis_id, user)
+        stages = analysis.stage_results or {}
+        if not any((record or {}).get("status") == STATUS_FAILED for record in stages.values()):
+            return analysis
+        return await self._rerun(analysis, quick=False)
+
+    @staticmethod
+    def _is_quick(analysis: Analysis) -> bool:
+        """Whether strategy/content were deliberately deferred (quick mode)."""
+        stages = analysis.stage_results or {}
+        strategy = stages.get("strategy") or {}
+        return (
+            bool(stages)
+            and strategy.get("output") is None
+            and strategy.get("status") != STATUS_FAILED
+        )
+
+    async def _rerun(
+        self,
+        analysis: Analysis,
+        job_description: Optional[str] = None,
+        job_url: Optional[str] = None,
+        force: Iterable[str] = (),
+        quick: Optional[bool] = None,
+    ) -> Analysis:
+        """
+        Re-run the pipeline for an analysis, reusing its stored stage results.
+        Quick analyses stay quick unless strategy/content are explicitly requested.
+        """
+        if quick is None:
+            quick = self._is_quick(analysis) and not {"strategy", "content"} & set(force)
+
+        resume = await self.resume_repo.get(analysis.resume_id)
+        if not resume or not resume.content_text:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Analysis pipeline failed: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Resume has no text content to analyze"
+            )
+
+        if job_description:
+            job = await self.job_repo.get_or_create(job_description)
+        else:
+            job = await self.job_repo.get(analysis.job_description_id)
+
+        stored = analysis.stage_results or {}
+        previous = self._previous_stages(self._seed_stages(resume, job), stored)
+        await release_connection(self.db)
+
+        updated = analysis
+
+        async def checkpoint(partial: PipelineResult) -> None:
+            nonlocal updated
+            await self._cache_parsed_data(resume, job, partial)
+            fields = self._keep_previous_outputs(self._result_fields(partial, resume, job), stored)
+            fields["job_description_id"] = job.id
+            if job_url is not None:
+                fields["job_url"] = job_url
+            updated = await self.repo.update(analysis.id, **fields)
+            await detail_cache.invalidate("analysis", analysis.user_id, analysis.id)
+            await release_connection(self.db)
+
+        try:
+            await run_analysis_pipeline(
+                resume_text=resume.content_text,
+                job_description=job.text,
+                previous=previous,
+                force=force,
+                quick=quick,
+                checkpoint=checkpoint,
             )
+        except Exception as e:
+            self._raise_pipeline_error(e)
+
+        return updated
+
+    @staticmethod
+    def _seed_stages(resume: Resume, job: JobDescription) -> StageRecords:
+        """Use the stored resume parse and cached job parse as stage results."""
+        stages: StageRecords = {}
+        if resume.parsed_data:
+            stages["resume"] = {
+                "fingerprint": stage_fingerprint("resume", resume.content_text),
+                "output": resume.parsed_data,
+            }
+        if job.parsed_data:
+            stages["job"] = {
+                "fingerprint": stage_fingerprint("job", job.text),
+                "output": job.parsed_data,
+            }
+        return stages
+
+    @staticmethod
+    def _previous_stages(seeded: StageRecords, stored: StageRecords) -> StageRecords:
+        """
+        Stored stage records, with the resume and job stages taken from their
+        seeds unless the analysis holds its own output for the same input
+        (e.g. a regenerated parse).
+        """
+        previous = dict(stored)
+        for stage, seed in seeded.items():
+            record = stored.get(stage) or {}
+            if record.get("output") is None or record.get("fingerprint") != seed["fingerprint"]:
+                previous[stage] = seed
+        return previous
+
+    @staticmethod
+    def _keep_previous_outputs(fields: Dict[str, Any], stored: StageRecords) -> Dict[str, Any]:
+        """
+        Keep the stored strategy/content of a rerun (stage record and columns)
+        until the stage produces a replacement, so a rerun that fails or is
+        interrupted never loses them. A failed replacement is still reported.
+        """
+        records = fields["stage_results"]
+        for stage, columns in STAGE_COLUMNS.items():
+            record, old = records[stage], stored.get(stage) or {}
+            if record["output"] is not None or old.get("output") is None:
+                continue
+            if record["status"] == STATUS_FAILED:
+                records[stage] = {**old, "status": STATUS_FAILED, "error": record["error"]}
+            else:
+                records[stage] = old
+            for column in columns:
+                del fields[column]
+        return fields
+
+    async def _cache_parsed_data(self, resume: Resume, job: JobDescription, result: PipelineResult) -> None:
+        """Store the resume and job parses on their records the first time they're computed."""
+        if resume.parsed_data is None and result.resume_data is not None:
+            resume.parsed_data = result.resume_data.model_dump(mode="json")
+            await self.resume_repo.update(resume.id, parsed_data=resume.parsed_data)
+            await detail_cache.invalidate("resume", resume.user_id, resume.id)
+        if job.parsed_data is None and result.job_data is not None:
+            job.parsed_data = result.job_data.model_dump(mode="json")
+            await self.job_repo.update(job.id, parsed_data=job.parsed_data)
+
+    @staticmethod
+    def _stage_records(result: PipelineResult, resume: Resume, job: JobDescription) -> StageRecords:
+        """
+        Stage records to store on the analysis. The resume and job parses are
+        already stored on the Resume and JobDescription, so their records keep
+        only the fingerprint and status unless the output differs from it.
+        """
+        records = result.to_stage_records()
+        for stage, parsed_data in (("resume", resume.parsed_data), ("job", job.parsed_data)):
+            record = records[stage]
+            if record["output"] is not None and record["output"] == parsed_data:
+                record["output"] = None
+        return records
+
+    @classmethod
+    def _result_fields(cls, result: PipelineResult, resume: Resume, job: JobDescription) -> Dict[str, Any]:
+        """Map agent results to Analysis columns (strategy/content may be absent)."""
+        # Combine missing and weak skills for "skill_gaps"
+        # We convert Pydantic models to dicts for JSON storage
+        # with a canonical current_level, which the missing-skill queries match on
+        skill_gaps = [
+            normalize_skill_gap(gap.model_dump(), missing=True) for gap in result.match_analysis.missing_skills
+        ] + [
+            normalize_skill_gap(gap.model_dump()) for gap in result.match_analysis.weak_skills
+        ]
+
+        return dict(
+            match_score=result.match_analysis.match_score,
+            skill_gaps=skill_gaps,
+            suggestions=result.strategy.resume_improvements if result.strategy else [],
+
+            cold_email=result.content.cold_email if result.content else None,
+            linkedin_dm=result.content.linkedin_dm if result.content else None,
+            interview_questions=result.content.interview_questions if result.content else [],
+
+            stage_results=cls._stage_records(result, resume, job),
+        )
+
+    @staticmethod
+    def _raise_pipeline_error(e: Exception) -> NoReturn:
+        logger.opt(exception=e).error("Analysis pipeline failed: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Analysis pipeline failed: {str(e)}"
+        )
@@ -5,53 +5,109 @@ Handles resume file processing, AI parsing, and storage.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
 from fastapi import UploadFile, HTTPException, status
 from uuid import UUID
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
+import hashlib
 
-from app.db.repositories.base import BaseRepository
+from app.db.base import AsyncSessionLocal, release_connection
+from app.db.repositories import ResumeRepository
 from app.db.models import Resume, User
+from app.schemas.resume import ResumeListResponse
 from app.api.deps import CurrentUser
 from app.agents import parse_resume_file  # Import our agent function
 from app.utils.file_extraction import extract_text_from_file
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import detail_cache
+from app.core.singleflight import SingleFlight
+
+
+# Concurrent uploads of the same file by the same user share one parse
+_upload_flight: SingleFlight[Resume] = SingleFlight("resume upload")
+
+# (user_id, Idempotency-Key) -> (upload fingerprint, resume id) of the completed upload
+_idempotency_results: TTLCache[Tuple[str, UUID]] = TTLCache(
+    maxsize=settings.idempotency_max_entries,
+    ttl=settings.idempotency_ttl_seconds,
+)
 
 
 class ResumeService:
     def __init__(self, db: AsyncSession):
-        self.repo = BaseRepository(Resume, db)
+        self.db = db
+        self.repo = ResumeRepository(db)
 
-    async def list_resumes(self, user: User) -> List[Resume]:
-        """List all resumes for a user."""
-        return await self.repo.get_by_user(user.id)
+    async def list_resumes(
+        self,
+        user: User,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        skill: Optional[str] = None
+    ) -> List[Row]:
+        """
+        List all resumes for a user (only the columns the list view needs).
+        With `skill`, only resumes whose parsed skills include it.
+        """
+        return await self.repo.get_by_user(
+            user.id,
+            limit=limit,
+            columns=list(ResumeListResponse.model_fields),
+            after=after,
+            filters=[self.repo.skill_filter(skill)] if skill else (),
+        )
 
     async def get_resume(self, resume_id: UUID, user: User) -> Resume:
-        """Get a specific resume owned by user."""
-        resume = await self.repo.get(resume_id)
-        if not resume or resume.user_id != user.id:
+        """Get a specific resume owned by user (raw extracted text is not loaded)."""
+        resume = await self.repo.get(resume_id, exclude=("content_text",), user_id=user.id)
+        if not resume:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Resume not found"
             )
         return resume
 
+    async def get_resume_version(self, resume_id: UUID, user: User) -> Row:
+        """Get the (created_at, updated_at) of a resume owned by user, without its content."""
+        version = await self.repo.get_version(resume_id, user_id=user.id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found"
+            )
+        return version
+
     async def delete_resume(self, resume_id: UUID, user: User) -> bool:
-        """Delete a resume owned by user."""
-        # Verification handled by get_resume logic usually, but here checking generic exists
-        resume = await self.repo.get(resume_id)
-        if not resume or resume.user_id != user.id:
+        """Delete a resume owned by user (a single DELETE statement; its analyses cascade)."""
+        if not await self.repo.delete(resume_id, user_id=user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Resume not found"
             )
-        return await self.repo.delete(resume_id)
+        await detail_cache.invalidate("resume", user.id, resume_id)
+        # The resume's analyses were deleted with it (ON DELETE CASCADE)
+        await detail_cache.invalidate_user("analysis", user.id)
+        return True
 
-    async def upload_resume(self, file: UploadFile, user: User) -> Resume:
+    async def upload_resume(
+        self,
+        file: UploadFile,
+        user: User,
+        idempotency_key: Optional[str] = None
+    ) -> Resume:
         """
         Process an uploaded resume file:
         1. Read file content
         2. Extract text (for storage)
         3. Parse with AI Agent
         4. Save to Database
+
+        Concurrent uploads of identical content by the same user share one
+        parse; a retried upload with a known Idempotency-Key returns the
+        stored resume, and a key reused for a different file is rejected
+        with 422.
         """
         if not file.filename.endswith(('.pdf', '.docx', '.doc')):
             raise HTTPException(
@@ -60,7 +116,45 @@ class ResumeService:
             )
 
         content = await file.read()
-        
+        content_hash = hashlib.sha256(content).hexdigest()
+        fingerprint = f"{content_hash}:{file.filename}"
+
+        if idempotency_key:
+            stored = _idempotency_results.get((user.id, idempotency_key))
+            if stored:
+                stored_fingerprint, resume_id = stored
+                if stored_fingerprint != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                        detail="Idempotency-Key was already used for a different upload"
+                    )
+                return await self.get_resume(resume_id, user)
+
+        # Text extraction and AI parsing below take seconds; don't hold the
+        # connection (and open transaction) left by the auth lookup meanwhile.
+        await release_connection(self.db)
+
+        resume = await _upload_flight.do(
+            (user.id, content_hash),
+            lambda: self._process_upload_in_own_session(content, file.filename, user),
+        )
+
+        if idempotency_key:
+            _idempotency_results.set((user.id, idempotency_key), (fingerprint, resume.id))
+        return resume
+
+    async def _process_upload_in_own_session(self, content: bytes, filename: str, user: User) -> Resume:
+        """
+        Run _process_upload on a session of its own.
+
+        The work is shared with coalesced uploads and outlives the request
+        that started it, so it must not use that request's session.
+        """
+        async with AsyncSessionLocal(bind=self.db.bind) as db:
+            return await ResumeService(db)._process_upload(content, filename, user)
+
+    async def _process_upload(self, content: bytes, filename: str, user: User) -> Resume:
+        """Extract, parse and store an uploaded resume."""
         try:
             # 1. Extract raw text first (so we can save it even if AI fails, potentially?)
             # Actually our agent wrapper returns parsed data. But we might want raw text too.
@@ -69,7 +163,7 @@ class ResumeService:
             # then pass text to parse_resume (agent).
             # But parse_resume_file is convenient. Let's use file extraction util here to save the raw text step.
             
-            raw_text = extract_text_from_file(content, file.filename)
+            raw_text = extract_text_from_file(content, filename)
             
             # 2. Parse with AI
             # We can re-use raw_text if we call parse_resume(text) instead of parse_resume_file(bytes)
@@ -79,7 +173,7 @@ class ResumeService:
             # 3. Create Resume Record
             resume = Resume(
                 user_id=user.id,
-                filename=file.filename,
+                filename=filename,
                 content_text=raw_text,
                 parsed_data=parsed_data.model_dump(mode='json')
             )
@@ -23,3 +23,8 @@ __all__ = [
 from app.utils.json_parsing import extract_json_from_response
 
 __all__.append("extract_json_from_response")
+
+# Resume Section Segmentation
+from app.utils.resume_sections import segment_resume, detect_section_header, HEADER_SECTION
+
+__all__.extend(["segment_resume", "detect_section_header", "HEADER_SECTION"])
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Union
 from loguru import logger
 
+from app.core.tracing import traced
+
 # PDF extraction
 import fitz  # PyMuPDF
 
@@ -51,7 +53,7 @@ def extract_text_from_pdf(file_content: bytes) -> str:
             page_text = page.get_text("text")
             if page_text.strip():
                 text_parts.append(page_text)
-            logger.debug(f"Extracted {len(page_text)} chars from PDF page {page_num + 1}")
+            logger.debug("Extracted {} chars from PDF page {}", len(page_text), page_num + 1)
         
         num_pages = len(doc)
         doc.close()
@@ -107,6 +109,7 @@ def extract_text_from_docx(file_content: bytes) -> str:
         raise FileExtractionError(f"Word document extraction failed: {e}") from e
 
 
+@traced("file.extract")
 def extract_text_from_file(
     file_content: bytes, 
     filename: str
@@ -9,6 +9,9 @@ import re
 from loguru import logger
 from typing import Dict, Any
 
+from app.core.tracing import traced
+
+@traced("llm.extract_json")
 def extract_json_from_response(response: str) -> Dict[str, Any]:
     """
     Extract JSON from LLM response, handling markdown code blocks.
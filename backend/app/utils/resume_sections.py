@@ -0,0 +1,111 @@
+"""
+Resume Section Segmentation
+
+Rule-based splitting of extracted resume text into its common sections
+(Experience, Education, Projects, Skills, ...) by detecting header lines.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# Name of the pseudo-section holding everything before the first header
+# (usually the candidate's name and contact details).
+HEADER_SECTION = "header"
+
+# Canonical section name -> header phrases that introduce it
+SECTION_HEADERS: Dict[str, Tuple[str, ...]] = {
+    "summary": (
+        "summary", "professional summary", "profile", "professional profile",
+        "objective", "career objective", "about me", "about",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills and tools",
+        "core competencies", "competencies", "technologies", "tech stack",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "internships",
+        "internship experience", "relevant experience",
+    ),
+    "education": (
+        "education", "academic background", "academics", "education and training",
+        "academic qualifications", "qualifications",
+    ),
+    "projects": (
+        "projects", "personal projects", "academic projects", "key projects",
+        "selected projects", "side projects", "portfolio",
+    ),
+    "extra_curricular": (
+        "extracurricular", "extracurricular activities", "extra curricular activities",
+        "activities", "leadership", "leadership and activities", "achievements",
+        "awards", "honors and awards", "volunteering", "volunteer experience",
+    ),
+    "certifications": (
+        "certifications", "certificates", "licenses and certifications",
+        "courses and certifications",
+    ),
+    "languages": ("languages", "spoken languages"),
+}
+
+# Header lines are short; longer lines are treated as body text
+MAX_HEADER_LENGTH = 40
+
+_HEADER_LOOKUP: Dict[str, str] = {
+    phrase: section
+    for section, phrases in SECTION_HEADERS.items()
+    for phrase in phrases
+}
+
+
+def _normalize_header(line: str) -> str:
+    """Lowercase a candidate header line and strip decoration and punctuation."""
+    text = line.strip().lower().replace("&", " and ")
+    text = re.sub(r"[^a-z ]+", " ", text)
+    return " ".join(text.split())
+
+
+def detect_section_header(line: str) -> Optional[str]:
+    """
+    Return the canonical section name if the line is a section header.
+
+    Args:
+        line: A single line of resume text
+
+    Returns:
+        Canonical section name, or None if the line is not a header
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADER_LENGTH:
+        return None
+    return _HEADER_LOOKUP.get(_normalize_header(stripped))
+
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """
+    Split resume text into sections keyed by canonical section name.
+
+    Text before the first recognized header is stored under HEADER_SECTION.
+    Repeated sections (e.g. "Experience" and "Internships") are concatenated.
+
+    Args:
+        text: Raw text extracted from a resume
+
+    Returns:
+        Mapping of section name to section body text (empty sections omitted)
+    """
+    sections: Dict[str, List[str]] = {}
+    current = HEADER_SECTION
+
+    for line in text.splitlines():
+        section = detect_section_header(line)
+        if section:
+            current = section
+            continue
+        sections.setdefault(current, []).append(line)
+
+    return {
+        name: body
+        for name, body in ((name, "\n".join(lines).strip()) for name, lines in sections.items())
+        if body
+    }
@@ -0,0 +1,166 @@
+"""
+Benchmark Data
+
+Production-shaped inputs for the benchmarks: a sample resume and job
+posting, canned agent outputs, a corpus of messy LLM replies for the JSON
+extractors, and in-memory PDF/DOCX builders.
+"""
+
+import io
+import json
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from app.agents import (
+    ParsedResumeData, ParsedJobData, RequiredSkill, MatchAnalysis, SkillGap,
+    ImprovementStrategy, ImprovementAction, GeneratedContent,
+)
+from app.agents.resume_parser import Experience, Education, Project
+
+_BULLET = "Led the migration of a monolith to event-driven services, cutting p99 latency by 40%."
+
+SAMPLE_RESUME_TEXT = "\n".join([
+    "Jane Doe",
+    "jane.doe@example.com | +1 555 0100 | linkedin.com/in/janedoe | github.com/janedoe",
+    "",
+    "Summary",
+    "Backend engineer with eight years of experience building Python services at scale.",
+    "",
+    "Skills",
+    "Python, FastAPI, Django, PostgreSQL, Redis, Kafka, Docker, Kubernetes, AWS, Terraform",
+    "",
+    "Experience",
+    *[
+        line
+        for i in range(6)
+        for line in (
+            f"Senior Software Engineer, Company {i} (2018 - 2024)",
+            *(f"- {_BULLET}" for _ in range(5)),
+        )
+    ],
+    "",
+    "Education",
+    "BSc Computer Science, State University, 2016",
+    "",
+    "Projects",
+    *(f"Project {i}: an open-source task queue with {i + 2}k GitHub stars. {_BULLET}" for i in range(4)),
+])
+
+SAMPLE_JOB_DESCRIPTION = (
+    "Staff Backend Engineer at Acme (Remote). We are looking for an engineer to own our "
+    "Python platform. Requirements: 7+ years of Python, FastAPI or Django, PostgreSQL "
+    "performance tuning, Kafka, Kubernetes, and experience mentoring engineers. "
+    "Nice to have: Rust, Terraform, ML infrastructure. " * 3
+)
+
+RESUME = ParsedResumeData(
+    name="Jane Doe",
+    email="jane.doe@example.com",
+    summary="Backend engineer with eight years of experience building Python services at scale.",
+    skills=["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS"],
+    experience=[
+        Experience(company=f"Company {i}", title="Senior Software Engineer", duration="2018 - 2024",
+                   description=_BULLET * 3, technologies=["Python", "PostgreSQL", "Kafka"])
+        for i in range(6)
+    ],
+    education=[Education(institution="State University", degree="BSc", field="Computer Science", year="2016")],
+    projects=[Project(name=f"Project {i}", description=_BULLET) for i in range(4)],
+)
+
+JOB = ParsedJobData(
+    title="Staff Backend Engineer",
+    company="Acme",
+    required_skills=[
+        RequiredSkill(skill=name, importance="required")
+        for name in ("Python", "FastAPI", "PostgreSQL", "Kafka", "Kubernetes")
+    ],
+    responsibilities=["Own the Python platform", "Mentor engineers"],
+)
+
+MATCH = MatchAnalysis(
+    match_score=78,
+    matching_skills=["Python", "FastAPI", "PostgreSQL", "Kafka", "Kubernetes"],
+    missing_skills=[
+        SkillGap(skill="Rust", importance="low", current_level="none", recommendation="Build a small CLI in Rust."),
+        SkillGap(skill="Terraform", importance="medium", current_level="none", recommendation="Codify a side project's infra."),
+    ],
+    overall_assessment="Strong backend fit; limited evidence of mentoring at staff level.",
+)
+
+STRATEGY = ImprovementStrategy(
+    resume_improvements=["Quantify platform impact", "Highlight mentoring"],
+    skill_development_plan=[
+        ImprovementAction(action="Ship a Terraform module", priority="immediate", estimated_time="2 weeks", resource_type="project")
+    ],
+    interview_focus_areas=["System design", "Postgres tuning", "Leadership"],
+    project_ideas=["Kafka-backed job scheduler"],
+)
+
+CONTENT = GeneratedContent(
+    cold_email="Hi Acme team, " + _BULLET * 4,
+    linkedin_dm="Hi! I'd love to chat about the Staff Backend role. " + _BULLET,
+    interview_questions=[f"Question {i}: how would you scale the platform?" for i in range(8)],
+    elevator_pitch="Backend engineer who makes Python platforms fast. " + _BULLET,
+)
+
+# Agent name -> canned output (matches the names the agents are created with)
+CANNED_OUTPUTS: Dict[str, BaseModel] = {
+    "resume_parser": RESUME,
+    "job_analyzer": JOB,
+    "skill_gap": MATCH,
+    "strategy_planner": STRATEGY,
+    "content_generator": CONTENT,
+}
+
+
+def canned_reply(agent_name: str) -> str:
+    """The canned output for an agent, phrased like a typical free-tier model reply."""
+    payload = CANNED_OUTPUTS[agent_name].model_dump_json(indent=2)
+    return f"Here is the requested JSON:\n\n```json\n{payload}\n```\n"
+
+
+def messy_replies() -> List[str]:
+    """LLM replies in the shapes the JSON extractors have to cope with."""
+    payloads = [output.model_dump(mode="json") for output in CANNED_OUTPUTS.values()]
+    corpus = []
+    for payload in payloads:
+        compact = json.dumps(payload)
+        pretty = json.dumps(payload, indent=2)
+        corpus.extend([
+            compact,                                                   # Bare JSON
+            f"```json\n{pretty}\n```",                                 # Fenced
+            f"```\n{pretty}\n```",                                     # Fenced, no language
+            f"Sure! Here is the analysis:\n{pretty}\nLet me know if you need more.",  # Prose around
+            f"```json\n{{\"broken\": \n```\n\nCorrected:\n```json\n{compact}\n```",   # Invalid block first
+            f"Note: {{not json}} follows.\n{pretty}",                  # Stray braces before
+        ])
+    return corpus
+
+
+def make_pdf(text: str = SAMPLE_RESUME_TEXT, pages: int = 2) -> bytes:
+    """A PDF with `text` on each of `pages` pages."""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=7)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(text: str = SAMPLE_RESUME_TEXT) -> bytes:
+    """A Word document with one paragraph per line of `text`, plus a skills table."""
+    from docx import Document
+
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=3, cols=2)
+    for row, (area, tools) in zip(table.rows, [("Languages", "Python, SQL"), ("Data", "PostgreSQL, Kafka"), ("Cloud", "AWS, Kubernetes")]):
+        row.cells[0].text, row.cells[1].text = area, tools
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,80 @@
+"""
+Fake LLM
+
+Swaps the OpenRouter model of every agent for a pydantic-ai FunctionModel
+that waits a configurable latency and replies with a canned output, so the
+pipeline and API can be benchmarked (and tested) without network calls.
+
+Usage:
+    fake = FakeLLM(latency=0.05, jitter=0.01)
+    with fake.install():
+        await run_analysis_pipeline(resume_text, job_description)
+    fake.calls  # Counter of model calls per agent
+"""
+
+import asyncio
+import random
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from app.agents.content_generator import content_agent
+from app.agents.job_analyzer import job_analyzer_agent
+from app.agents.resume_parser import resume_parser_agent
+from app.agents.skill_gap import skill_gap_agent
+from app.agents.strategy_planner import strategy_agent
+from benchmarks.data import canned_reply
+
+AGENTS: List[Agent] = [resume_parser_agent, job_analyzer_agent, skill_gap_agent, strategy_agent, content_agent]
+
+
+class FakeLLM:
+    """
+    Canned-reply model for every agent.
+
+    Args:
+        latency: Mean seconds each model call takes
+        jitter: Uniform +/- jitter around the mean, in seconds
+        replies: Agent name -> reply text factory; defaults to benchmarks.data.canned_reply
+        seed: Seed for the latency jitter, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        replies: Optional[Dict[str, Callable[[], str]]] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.replies = replies or {}
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+
+    def reply(self, agent_name: str) -> str:
+        factory = self.replies.get(agent_name)
+        return factory() if factory else canned_reply(agent_name)
+
+    def model(self, agent_name: str) -> FunctionModel:
+        """A model that answers every request as `agent_name` would."""
+        async def respond(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+            self.calls[agent_name] += 1
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            # Always yield to the event loop, like a real network call
+            await asyncio.sleep(max(delay, 0.0))
+            return ModelResponse(parts=[TextPart(self.reply(agent_name))])
+
+        return FunctionModel(respond, model_name=f"fake-{agent_name}")
+
+    @contextmanager
+    def install(self) -> Iterator["FakeLLM"]:
+        """Override the model of every agent for the duration of the block."""
+        with ExitStack() as stack:
+            for agent in AGENTS:
+                stack.enter_context(agent.override(model=self.model(agent.name)))
+            yield self
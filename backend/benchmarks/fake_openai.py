@@ -0,0 +1,269 @@
+"""
+Fake OpenAI-Compatible Server
+
+A standalone server implementing the /chat/completions subset that
+pydantic-ai's OpenAIProvider uses (plain and streaming), for load tests and
+concurrency tuning without OpenRouter:
+- per-model latency drawn from a log-normal distribution (median, sigma);
+- injected 429 and 500 responses at configurable rates;
+- an optional requests-per-minute limit with OpenRouter-style
+  X-RateLimit-* headers and Retry-After on 429s;
+- canned replies chosen by matching the system prompt to each agent's.
+
+Point the API at it with OPENROUTER_BASE_URL=http://127.0.0.1:8099/v1.
+
+Usage:
+    python -m benchmarks.fake_openai [--port 8099] [--latency 0.8:0.5]
+        [--model-latency MODEL=MEDIAN[:SIGMA] ...] [--rate-429 0.02]
+        [--rate-500 0.01] [--rpm 600] [--seed 1]
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from loguru import logger
+
+logger.disable("app")  # The agents are imported only for their system prompts
+
+import app.main  # noqa: F401  (resolves import order for the app modules)
+from app.agents import content_generator, job_analyzer, resume_parser, skill_gap, strategy_planner
+from benchmarks.data import canned_reply
+
+# Agent name -> system prompt, for matching requests to canned replies
+SYSTEM_PROMPTS: Dict[str, str] = {
+    "resume_parser": resume_parser.SYSTEM_PROMPT,
+    "job_analyzer": job_analyzer.SYSTEM_PROMPT,
+    "skill_gap": skill_gap.SYSTEM_PROMPT,
+    "strategy_planner": strategy_planner.SYSTEM_PROMPT,
+    "content_generator": content_generator.SYSTEM_PROMPT,
+}
+
+# Fraction of a streamed reply's latency spent before the first chunk
+TIME_TO_FIRST_CHUNK = 0.3
+
+
+@dataclass
+class LatencyProfile:
+    """Log-normal latency: `median` seconds, spread `sigma` (0 = constant)."""
+    median: float = 0.8
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0))
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """Parse "MEDIAN" or "MEDIAN:SIGMA"."""
+        median, _, sigma = spec.partition(":")
+        return cls(float(median), float(sigma) if sigma else cls.sigma)
+
+
+@dataclass
+class ServerConfig:
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    model_latency: Dict[str, LatencyProfile] = field(default_factory=dict)
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    requests_per_minute: int = 0  # 0 = unlimited
+    retry_after: float = 1.0  # Seconds advertised on injected 429s
+    stream_chunks: int = 20
+    seed: Optional[int] = None
+
+
+class RateLimiter:
+    """Fixed one-minute window, reported the way OpenRouter does (reset in epoch ms)."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.window_start = time.time()
+        self.used = 0
+
+    def acquire(self) -> bool:
+        now = time.time()
+        if now - self.window_start >= 60:
+            self.window_start, self.used = now, 0
+        if self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+    def headers(self) -> Dict[str, str]:
+        reset = self.window_start + 60
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.limit - self.used, 0)),
+            "X-RateLimit-Reset": str(int(reset * 1000)),
+        }
+
+    def retry_after(self) -> float:
+        return max(self.window_start + 60 - time.time(), 0.0)
+
+
+def match_agent(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """Name of the agent whose system prompt the request carries, if any."""
+    for message in messages:
+        if message.get("role") not in ("system", "developer"):
+            continue
+        content = message.get("content")
+        if isinstance(content, list):  # Content parts
+            content = "".join(part.get("text", "") for part in content)
+        for name, prompt in SYSTEM_PROMPTS.items():
+            if content and content.strip().startswith(prompt.strip().splitlines()[0]):
+                return name
+    return None
+
+
+def _tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def _error(status: int, message: str, headers: Dict[str, str]) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": "fake_error", "code": status}},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def create_app(config: ServerConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI-compatible LLM")
+    rng = random.Random(config.seed)
+    limiter = RateLimiter(config.requests_per_minute) if config.requests_per_minute else None
+    stats: Counter = Counter()
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "unknown")
+        if limiter and not limiter.acquire():
+            stats[f"{model}:429"] += 1
+            return _error(429, "Rate limit exceeded", {
+                **limiter.headers(), "Retry-After": f"{math.ceil(limiter.retry_after())}",
+            })
+        headers = limiter.headers() if limiter else {}
+
+        roll = rng.random()
+        if roll < config.rate_429:
+            stats[f"{model}:429"] += 1
+            return _error(429, "Injected rate limit", {**headers, "Retry-After": f"{config.retry_after:g}"})
+        if roll < config.rate_429 + config.rate_500:
+            stats[f"{model}:500"] += 1
+            return _error(500, "Injected server error", headers)
+
+        agent = match_agent(body.get("messages", []))
+        reply = canned_reply(agent) if agent else "OK"
+        latency = config.model_latency.get(model, config.latency).sample(rng)
+        prompt_tokens = _tokens(json.dumps(body.get("messages", [])))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": _tokens(reply),
+            "total_tokens": prompt_tokens + _tokens(reply),
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        stats[f"{model}:200"] += 1
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }, headers=headers)
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream() -> AsyncIterator[str]:
+            await asyncio.sleep(latency * TIME_TO_FIRST_CHUNK)
+            yield chunk({"role": "assistant", "content": ""})
+            size = math.ceil(len(reply) / config.stream_chunks)
+            pieces = [reply[i:i + size] for i in range(0, len(reply), size)]
+            for piece in pieces:
+                await asyncio.sleep(latency * (1 - TIME_TO_FIRST_CHUNK) / len(pieces))
+                yield chunk({"content": piece})
+            yield chunk({}, "stop", **({"usage": usage} if include_usage else {}))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+    # OpenAI clients append /chat/completions to the base URL, with or without /v1
+    app.add_api_route("/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        """Responses sent, as "<model>:<status>" -> count."""
+        return dict(stats)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", default="0.8:0.5", help="Default latency, MEDIAN[:SIGMA] seconds")
+    parser.add_argument("--model-latency", action="append", default=[], metavar="MODEL=MEDIAN[:SIGMA]")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After on injected 429s (seconds)")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute limit (0 = none)")
+    parser.add_argument("--stream-chunks", type=int, default=20)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    model_latency = {}
+    for spec in args.model_latency:
+        model, _, profile = spec.partition("=")
+        model_latency[model] = LatencyProfile.parse(profile)
+
+    config = ServerConfig(
+        latency=LatencyProfile.parse(args.latency),
+        model_latency=model_latency,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        requests_per_minute=args.rpm,
+        retry_after=args.retry_after,
+        stream_chunks=args.stream_chunks,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
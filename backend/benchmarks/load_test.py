@@ -0,0 +1,397 @@
+"""
+API Load Test
+
+Drives a weighted mix of resume upload, analysis creation, list and detail
+requests against the API and reports throughput, latency percentiles and
+error rates per operation, event-loop lag and DB pool saturation (sampled
+from /health/db; on SQLite, the single-writer pool is reported separately).
+
+By default the app runs in-process on a temporary SQLite file, with every
+agent answered by benchmarks.fake_llm after a simulated latency. With --url
+it targets a running instance instead (e.g. one whose OPENROUTER_BASE_URL
+points at benchmarks.fake_openai), authenticating with --token.
+
+Modes:
+- closed: --concurrency workers each send the next request as soon as the
+  previous one completes (throughput is an output);
+- open: requests arrive at a fixed --rate (Poisson arrivals), whether or not
+  earlier ones have completed. Latency is measured from the scheduled
+  arrival, so queueing delay is not hidden (no coordinated omission).
+
+Usage:
+    python -m benchmarks.load_test [--mode closed|open] [--concurrency 16]
+        [--rate 50] [--duration 30] [--warmup 5]
+        [--mix upload=1,create=1,list=4,detail=8] [--llm-latency 0.5]
+        [--url http://127.0.0.1:8000 --token JWT] [--output load.json]
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("PYDANTIC_AI_NO_BANNER", "1")
+# The in-process app writes rows: never point it at the configured database
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='applywise-load-'), 'load.db')}"
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+from loguru import logger
+
+logger.disable("app")  # Per-request logging would dominate the measurements
+
+import app.main  # noqa: F401  (resolves import order for the app modules)
+from app.api.deps import get_current_user
+from app.db.base import AsyncSessionLocal, Base, engine
+from app.db.models import User
+from app.main import app as api
+from benchmarks.data import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME_TEXT, make_pdf
+from benchmarks.fake_llm import FakeLLM
+
+OPERATIONS = ("upload", "create", "list", "detail")
+DEFAULT_MIX = "upload=1,create=1,list=4,detail=8"
+UPLOAD_POOL = 64  # Distinct resume files cycled through by uploads
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "throughput_per_s": round(count / elapsed, 2),
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": dict(self.statuses),
+            **{
+                f"{name}_ms": round(1000 * percentile(self.latencies, q), 2)
+                for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+            },
+        }
+
+
+class LoadTest:
+    """Workload state: the client, the ids requests can target, and collected samples."""
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], seed: int):
+        self.client = client
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.random = random.Random(seed)
+        self.resume_ids: List[str] = []
+        self.analysis_ids: List[str] = []
+        self.stats: Dict[str, OperationStats] = defaultdict(OperationStats)
+        # Requests starting in [window_start, until) are recorded; the window
+        # ends when the last of them completes
+        self.window_start: Optional[float] = None
+        self.until = float("inf")
+        self.last_completed: Optional[float] = None
+        self._uploads = 0
+        # Distinct files, so concurrent uploads aren't coalesced into one parse;
+        # built up front so PDF generation isn't timed as request latency
+        self._documents = [make_pdf(f"{SAMPLE_RESUME_TEXT}\nRef {i}", pages=1) for i in range(UPLOAD_POOL)]
+
+    def pick(self) -> str:
+        return self.random.choices(self.operations, self.weights)[0]
+
+    async def send(self, operation: str) -> httpx.Response:
+        client = self.client
+        if operation == "upload":
+            self._uploads += 1
+            document = self._documents[self._uploads % UPLOAD_POOL]
+            response = await client.post(
+                "/api/v1/resumes/upload",
+                files={"file": (f"resume-{self._uploads}.pdf", document, "application/pdf")},
+            )
+            if response.status_code == 201:
+                self.resume_ids.append(response.json()["id"])
+            return response
+        if operation == "create":
+            response = await client.post("/api/v1/analyses/", json={
+                "resume_id": self.random.choice(self.resume_ids),
+                "job_description": f"{SAMPLE_JOB_DESCRIPTION} Ref {uuid4()}",
+                "mode": "full",
+            })
+            if response.status_code == 201:
+                self.analysis_ids.append(response.json()["id"])
+            return response
+        if operation == "list":
+            kind = self.random.choice(("resumes", "analyses"))
+            return await client.get(f"/api/v1/{kind}/", params={"limit": 20})
+        if operation == "detail":
+            if self.random.random() < 0.5:
+                return await client.get(f"/api/v1/analyses/{self.random.choice(self.analysis_ids)}")
+            return await client.get(f"/api/v1/resumes/{self.random.choice(self.resume_ids)}")
+        raise ValueError(f"Unknown operation: {operation}")
+
+    async def request(self, operation: str, scheduled: Optional[float] = None) -> None:
+        """Send one request; latency counts from `scheduled` (open loop) or from now."""
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await self.send(operation)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0  # Transport error
+        if self.window_start is None or not self.window_start <= start < self.until:
+            return
+        now = time.perf_counter()
+        self.last_completed = max(self.last_completed or now, now)
+        stats = self.stats[operation]
+        stats.latencies.append(now - start)
+        stats.statuses[status] += 1
+        if not 200 <= status < 400:
+            stats.errors += 1
+
+    async def seed(self) -> None:
+        """One resume and one analysis, so list and detail requests have targets."""
+        for operation in ("upload", "create"):
+            response = await self.send(operation)
+            response.raise_for_status()
+
+
+async def closed_loop(test: LoadTest, concurrency: int, until: float, think_time: float) -> None:
+    async def worker():
+        while time.perf_counter() < until:
+            await test.request(test.pick())
+            if think_time:
+                await asyncio.sleep(test.random.expovariate(1 / think_time))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(test: LoadTest, rate: float, until: float, max_in_flight: int) -> int:
+    """Poisson arrivals at `rate`/s; returns the number of arrivals dropped at the in-flight cap."""
+    in_flight: set = set()
+    dropped = 0
+    next_arrival = time.perf_counter()
+    while next_arrival < until:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+        else:
+            task = asyncio.create_task(test.request(test.pick(), scheduled=next_arrival))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_arrival += test.random.expovariate(rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return dropped
+
+
+async def sample_loop_lag(samples: List[float], interval: float = 0.01) -> None:
+    """Record how late the event loop wakes up from a short sleep."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(time.perf_counter() - start - interval, 0.0))
+
+
+async def sample_pool(client: httpx.AsyncClient, samples: List[Dict[str, Any]], interval: float) -> None:
+    while True:
+        try:
+            response = await client.get("/health/db")
+            if response.status_code == 200:
+                samples.append(response.json())
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+def pool_report(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Peak pool occupancy and checkout waits/timeouts during the measured
+    window, with the SQLite single-writer pool under "writer".
+    """
+    if not samples:
+        return {}
+    report = _pool_section(samples)
+    if "writer" in samples[-1]:
+        report["writer"] = _pool_section([sample["writer"] for sample in samples])
+    return report
+
+
+def _pool_section(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    first, last = samples[0], samples[-1]
+    report: Dict[str, Any] = {"pool_class": last.get("pool_class")}
+    if "size" in last:
+        peak = max(sample["checked_out"] for sample in samples)
+        report.update(
+            size=last["size"],
+            peak_checked_out=peak,
+            peak_overflow=max(sample["overflow"] for sample in samples),
+            peak_utilization=round(peak / last["size"], 2) if last["size"] else None,
+        )
+    report.update(
+        checkouts=last["checkouts"] - first["checkouts"],
+        checkout_timeouts=last["checkout_timeouts"] - first["checkout_timeouts"],
+        max_wait_ms=last["max_wait_ms"],
+    )
+    return report
+
+
+async def _in_process_client(stack: AsyncExitStack, llm_latency: float) -> httpx.AsyncClient:
+    """Client for the app in this process, on a fresh SQLite file with a fake LLM."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user = User(id=uuid4(), email="load@example.com", hashed_password="benchmark")
+    async with AsyncSessionLocal() as db:
+        db.add(user)
+        await db.commit()
+
+    async def current_user():
+        return user
+
+    api.dependency_overrides[get_current_user] = current_user
+    stack.callback(api.dependency_overrides.clear)
+    stack.push_async_callback(engine.dispose)
+    stack.enter_context(FakeLLM(latency=llm_latency, jitter=llm_latency / 2).install())
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://load", timeout=None)
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    async with AsyncExitStack() as stack:
+        if args.url:
+            client = await stack.enter_async_context(httpx.AsyncClient(
+                base_url=args.url,
+                headers={"Authorization": f"Bearer {args.token}"} if args.token else {},
+                timeout=args.timeout,
+                limits=httpx.Limits(max_connections=None),
+            ))
+        else:
+            client = await _in_process_client(stack, args.llm_latency)
+
+        test = LoadTest(client, args.mix, args.seed)
+        await test.seed()
+
+        lag: List[float] = []
+        pool: List[Dict[str, Any]] = []
+        samplers = [
+            asyncio.create_task(sample_loop_lag(lag)),
+            asyncio.create_task(sample_pool(client, pool, args.sample_interval)),
+        ]
+
+        start = time.perf_counter()
+        until = start + args.warmup + args.duration
+        test.until = until
+
+        async def start_recording():
+            await asyncio.sleep(args.warmup)
+            test.window_start = time.perf_counter()
+            lag.clear()
+            pool.clear()
+
+        recorder = asyncio.create_task(start_recording())
+        dropped = 0
+        if args.mode == "closed":
+            await closed_loop(test, args.concurrency, until, args.think_time)
+        else:
+            dropped = await open_loop(test, args.rate, until, args.max_in_flight)
+        # In-flight requests are awaited past `until`; their time counts too
+        elapsed = (test.last_completed or time.perf_counter()) - (test.window_start or start)
+
+        for task in (*samplers, recorder):
+            task.cancel()
+        await asyncio.gather(*samplers, recorder, return_exceptions=True)
+
+    total = OperationStats()
+    for stats in test.stats.values():
+        total.latencies.extend(stats.latencies)
+        total.errors += stats.errors
+        for status, count in stats.statuses.items():
+            total.statuses[status] += count
+
+    return {
+        "config": {
+            "mode": args.mode,
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency if args.mode == "closed" else None,
+            "rate": args.rate if args.mode == "open" else None,
+            "duration_s": args.duration,
+            "mix": args.mix,
+            "llm_latency_s": None if args.url else args.llm_latency,
+        },
+        "total": {**total.report(elapsed), "dropped_arrivals": dropped},
+        "operations": {operation: stats.report(elapsed) for operation, stats in sorted(test.stats.items())},
+        "event_loop_lag_ms": {
+            name: round(1000 * percentile(lag, q), 2)
+            for name, q in (("p50", 0.50), ("p99", 0.99), ("max", 1.0))
+        },
+        "db_pool": pool_report(pool),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'operation':<10} {'req':>7} {'req/s':>8} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in [*report["operations"].items(), ("total", report["total"])]:
+        print(
+            f"{name:<10} {stats['requests']:>7} {stats['throughput_per_s']:>8.1f} "
+            f"{100 * stats['error_rate']:>6.2f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    if report["total"]["dropped_arrivals"]:
+        print(f"dropped arrivals (in-flight cap): {report['total']['dropped_arrivals']}")
+    print(f"event loop lag: {report['event_loop_lag_ms']}")
+    print(f"db pool: {report['db_pool']}")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for item in spec.split(","):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation '{operation}' (choose from {', '.join(OPERATIONS)})")
+        mix[operation] = float(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Workers (closed loop)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a worker's requests (s)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Arrivals per second (open loop)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open-loop cap; arrivals beyond it are dropped")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before the measurement")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake model latency per call (in-process)")
+    parser.add_argument("--url", help="Target a running instance instead of the in-process app")
+    parser.add_argument("--token", help="Bearer token for --url")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout for --url (s)")
+    parser.add_argument("--sample-interval", type=float, default=0.25, help="DB pool sampling interval (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
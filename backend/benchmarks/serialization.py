@@ -0,0 +1,184 @@
+"""
+Response Serialization Benchmark
+
+Requests/second for the analysis and resume detail and list endpoints,
+comparing the previous path (ORM objects returned through response_model)
+with the explicit pydantic-core path in app.api.responses.
+Services are stubbed, so only routing and serialization are measured.
+
+Usage:
+    python -m benchmarks.serialization [--requests 1000] [--rounds 5]
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.api.deps import get_current_user, get_db, SessionDep, CurrentUser
+from app.api.pagination import LimitParam, CursorParam, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
+from app.agents import (
+    ParsedResumeData, ParsedJobData, MatchAnalysis, ImprovementStrategy, GeneratedContent
+)
+from app.agents.resume_parser import Experience, Education, Project
+from app.db.models import Analysis, Resume, User
+from app.schemas.analysis import AnalysisResponse, AnalysisListResponse
+from app.schemas.resume import ResumeResponse, ResumeListResponse
+
+NOW = datetime.now(timezone.utc)
+LONG_TEXT = "Led the migration of a monolith to event-driven services, cutting p99 latency by 40%. " * 8
+
+
+def make_resume() -> Resume:
+    parsed = ParsedResumeData(
+        name="Jane Doe",
+        email="jane@example.com",
+        summary=LONG_TEXT,
+        skills=[f"Skill {i}" for i in range(40)],
+        experience=[
+            Experience(company=f"Company {i}", title="Engineer", duration="2020 - 2024",
+                       description=LONG_TEXT, technologies=["Python", "Postgres", "Kafka"])
+            for i in range(8)
+        ],
+        education=[Education(institution="University", degree="BSc", field="CS", year="2019")],
+        projects=[Project(name=f"Project {i}", description=LONG_TEXT) for i in range(5)],
+    )
+    return Resume(id=uuid4(), filename="cv.pdf", parsed_data=parsed.model_dump(mode="json"), created_at=NOW)
+
+
+def make_analysis() -> Analysis:
+    gaps = [
+        {"skill": f"Skill {i}", "importance": "high", "current_level": "basic", "recommendation": LONG_TEXT[:200]}
+        for i in range(15)
+    ]
+    outputs = {
+        "resume": make_resume().parsed_data,
+        "job": ParsedJobData(title="Staff Engineer", responsibilities=[LONG_TEXT[:200]] * 10).model_dump(mode="json"),
+        "match": MatchAnalysis(match_score=71, overall_assessment=LONG_TEXT).model_dump(mode="json"),
+        "strategy": ImprovementStrategy(
+            resume_improvements=[LONG_TEXT[:200]] * 8, skill_development_plan=[],
+            interview_focus_areas=["System design"] * 5, project_ideas=[LONG_TEXT[:200]] * 3,
+        ).model_dump(mode="json"),
+        "content": GeneratedContent(
+            cold_email=LONG_TEXT, linkedin_dm=LONG_TEXT[:300],
+            interview_questions=[LONG_TEXT[:150]] * 10, elevator_pitch=LONG_TEXT[:400],
+        ).model_dump(mode="json"),
+    }
+    return Analysis(
+        id=uuid4(), resume_id=uuid4(), job_description=LONG_TEXT * 3, match_score=71,
+        skill_gaps=gaps, suggestions=[LONG_TEXT[:200]] * 8, cold_email=LONG_TEXT,
+        linkedin_dm=LONG_TEXT[:300], interview_questions=[LONG_TEXT[:150]] * 10,
+        stage_results={
+            stage: {"fingerprint": "f" * 64, "output": output, "status": "completed", "error": None}
+            for stage, output in outputs.items()
+        },
+        created_at=NOW,
+    )
+
+
+def baseline_router(service) -> APIRouter:
+    """The endpoints as they were: return ORM objects and let response_model validate."""
+    router = APIRouter()
+
+    @router.get("/analyses/", response_model=List[AnalysisListResponse])
+    async def list_analyses(
+        response: Response, db: SessionDep, current_user: CurrentUser,
+        limit: LimitParam = MAX_PAGE_SIZE, cursor: CursorParam = None, missing_skill: Optional[str] = None,
+    ):
+        analyses = await service.list_analyses(current_user, limit, decode_cursor(cursor), missing_skill=missing_skill)
+        set_next_cursor(response, analyses, limit)
+        return analyses
+
+    @router.get("/analyses/{analysis_id}", response_model=AnalysisResponse)
+    async def get_analysis(analysis_id: UUID, db: SessionDep, current_user: CurrentUser):
+        return await service.get_analysis(analysis_id, current_user)
+
+    @router.get("/resumes/", response_model=List[ResumeListResponse])
+    async def list_resumes(
+        response: Response, db: SessionDep, current_user: CurrentUser,
+        limit: LimitParam = MAX_PAGE_SIZE, cursor: CursorParam = None, skill: Optional[str] = None,
+    ):
+        resumes = await service.list_resumes(current_user, limit, decode_cursor(cursor), skill=skill)
+        set_next_cursor(response, resumes, limit)
+        return resumes
+
+    @router.get("/resumes/{resume_id}", response_model=ResumeResponse)
+    async def get_resume(resume_id: UUID, db: SessionDep, current_user: CurrentUser):
+        return await service.get_resume(resume_id, current_user)
+
+    return router
+
+
+async def measure(client: AsyncClient, url: str, requests: int) -> float:
+    for _ in range(20):  # Warm up
+        (await client.get(url)).raise_for_status()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(url)
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, rounds: int) -> None:
+    analysis, resume = make_analysis(), make_resume()
+    rows = [make_analysis() for _ in range(100)]
+    for row in rows:
+        row.filename = "cv.pdf"  # Lets the same rows serve both list endpoints
+
+    user = User(id=uuid4(), email="bench@example.com", hashed_password="x")
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_db] = lambda: None
+
+    service = AsyncMock()
+    service.get_analysis.return_value = analysis
+    service.list_analyses.return_value = rows
+    service.get_resume.return_value = resume
+    service.list_resumes.return_value = rows
+
+    # Mounted on the same app so both paths share middleware and dependencies
+    app.include_router(baseline_router(service), prefix="/baseline/v1")
+
+    endpoints = [
+        ("analysis detail", f"/api/v1/analyses/{analysis.id}"),
+        ("analysis list (100)", "/api/v1/analyses/"),
+        ("resume detail", f"/api/v1/resumes/{resume.id}"),
+        ("resume list (100)", "/api/v1/resumes/"),
+    ]
+
+    print(f"{'endpoint':<22} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    with patch("app.api.routes.analyses.AnalysisService", return_value=service), \
+         patch("app.api.routes.resumes.ResumeService", return_value=service):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for name, url in endpoints:
+                # Interleaved rounds, best of each, to keep scheduler noise out
+                old = new = 0.0
+                for _ in range(rounds):
+                    old = max(old, await measure(client, url.replace("/api/v1", "/baseline/v1"), requests))
+                    new = max(new, await measure(client, url, requests))
+                print(f"{name:<22} {old:>13.0f} {new:>12.0f} {new / old:>7.2f}x")
+
+    app.dependency_overrides.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+SQLite Profile Benchmark
+
+Concurrent read/write throughput of an on-disk SQLite database with the
+default configuration versus the tuned profile from app.db.base (WAL,
+synchronous=NORMAL, busy timeout, mmap/cache sizing, single writer).
+
+Usage:
+    python -m benchmarks.sqlite_profile [--seconds 5] [--readers 16] [--writers 4]
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+import app.main  # noqa: F401  (resolves import order for the app modules)
+from app.db.base import (
+    Base,
+    RoutingSession,
+    apply_sqlite_pragmas,
+    create_sqlite_write_engine,
+    sqlite_pragmas,
+)
+from app.db.models import User, Resume
+from app.db.repositories import BaseRepository
+
+
+@dataclass
+class Stats:
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+    write_latencies: List[float] = field(default_factory=list)
+
+    def p99_write_ms(self) -> float:
+        if not self.write_latencies:
+            return 0.0
+        ordered = sorted(self.write_latencies)
+        return 1000 * ordered[int(0.99 * (len(ordered) - 1))]
+
+
+async def _run(factory, user_ids, seconds: float, readers: int, writers: int) -> Stats:
+    stats = Stats()
+    deadline = time.perf_counter() + seconds
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            try:
+                async with factory() as session:
+                    await BaseRepository(Resume, session).get_by_user(
+                        user_ids[stats.reads % len(user_ids)], limit=20, columns=["id", "filename", "created_at"]
+                    )
+                stats.reads += 1
+            except Exception:
+                stats.errors += 1
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                async with factory() as session:
+                    repo = BaseRepository(Resume, session)
+                    resume = await repo.create(Resume(
+                        user_id=user_ids[stats.writes % len(user_ids)],
+                        filename="cv.pdf",
+                        content_text="x" * 2000,
+                        parsed_data={"skills": ["Python"]},
+                    ))
+                    await repo.update(resume.id, filename="cv-v2.pdf")
+                stats.writes += 1
+                stats.write_latencies.append(time.perf_counter() - start)
+            except Exception:
+                stats.errors += 1
+
+    await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+    return stats
+
+
+async def benchmark(tuned: bool, seconds: float, readers: int, writers: int) -> Stats:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_async_engine(url)
+        write_engine = None
+        if tuned:
+            apply_sqlite_pragmas(engine, sqlite_pragmas())
+            write_engine = create_sqlite_write_engine(url)
+            apply_sqlite_pragmas(write_engine, sqlite_pragmas())
+
+        factory = sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            writer=write_engine.sync_engine if write_engine else None,
+        )
+
+        async with (write_engine or engine).begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        user_ids = [uuid.uuid4() for _ in range(10)]
+        async with factory() as session:
+            await BaseRepository(User, session).create_many(
+                [User(id=id, email=f"{id}@example.com", hashed_password="x") for id in user_ids]
+            )
+
+        stats = await _run(factory, user_ids, seconds, readers, writers)
+
+        async with factory() as session:
+            assert (await session.execute(select(User.id))).first() is not None
+
+        await engine.dispose()
+        if write_engine:
+            await write_engine.dispose()
+        return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'p99 write ms':>13} {'errors':>8}")
+    for name, tuned in (("default", False), ("tuned", True)):
+        stats = asyncio.run(benchmark(tuned, args.seconds, args.readers, args.writers))
+        print(
+            f"{name:<10} {stats.reads / args.seconds:>10.0f} {stats.writes / args.seconds:>10.0f} "
+            f"{stats.p99_write_ms():>13.1f} {stats.errors:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Benchmark Suite
+
+Measures the parts of the backend that don't depend on the LLM provider,
+with every agent's model replaced by benchmarks.fake_llm:
+- pipeline orchestration overhead, at zero and at a simulated model latency;
+- JSON extraction from a corpus of messy LLM replies;
+- PDF/DOCX text extraction throughput;
+- end-to-end API requests/second against an on-disk SQLite database.
+
+Results are written as JSON (one flat metric -> value map plus run metadata),
+and can be compared with a previous run to flag regressions between commits.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--compare previous.json]
+                               [--only pipeline,json,files,api] [--quick]
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("PYDANTIC_AI_NO_BANNER", "1")
+# The API benchmark writes rows: never point it at the configured database
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="applywise-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+
+logger.disable("app")  # Per-request logging would dominate the measurements
+
+import app.main  # noqa: F401  (resolves import order for the app modules)
+from app.agents import run_analysis_pipeline
+from app.agents.job_analyzer import _extract_json_from_response as job_extract_json
+from app.agents.resume_parser import _extract_json_from_response as resume_extract_json
+from app.agents.skill_gap import _extract_json_from_response as skill_gap_extract_json
+from app.api.deps import get_current_user
+from app.core.response_cache import detail_cache
+from app.db.base import AsyncSessionLocal, Base, engine
+from app.db.models import User
+from app.main import app as api
+from app.utils import extract_json_from_response
+from app.utils.file_extraction import extract_text_from_docx, extract_text_from_pdf
+from benchmarks.data import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME_TEXT, make_docx, make_pdf, messy_replies
+from benchmarks.fake_llm import FakeLLM
+
+SECTIONS = ("pipeline", "json", "files", "api")
+
+# Metric name -> value; names ending in these suffixes are "higher is better"
+Results = Dict[str, float]
+HIGHER_IS_BETTER = ("_per_s", "_rate")
+
+
+def _mean_ms(samples: List[float]) -> float:
+    return round(1000 * statistics.fmean(samples), 3)
+
+
+def _percentile_ms(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return round(1000 * ordered[int(q * (len(ordered) - 1))], 3)
+
+
+async def _timed(func: Callable[[], Awaitable[Any]], runs: int) -> List[float]:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def bench_pipeline(runs: int, latency: float) -> Results:
+    """
+    Pipeline wall time with instant and with slow fake models.
+
+    With a latency L per model call, the critical path is 4L (resume and job
+    parsing run concurrently, then match, strategy and content); the
+    orchestration overhead is whatever the pipeline adds on top.
+    """
+    results: Results = {}
+
+    def run():
+        return run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION)
+
+    fake = FakeLLM()
+    with fake.install():
+        await run()  # Warm up
+        fake.calls.clear()
+        durations = await _timed(run, runs)
+    results["pipeline.instant.mean_ms"] = _mean_ms(durations)
+    results["pipeline.instant.p95_ms"] = _percentile_ms(durations, 0.95)
+    results["pipeline.model_calls_per_run"] = sum(fake.calls.values()) / runs
+
+    with FakeLLM(latency=latency).install():
+        durations = await _timed(run, max(runs // 10, 3))
+    critical_path = 4 * latency
+    results["pipeline.latency.mean_ms"] = _mean_ms(durations)
+    results["pipeline.latency.overhead_ms"] = round(_mean_ms(durations) - 1000 * critical_path, 3)
+
+    # Every stage fingerprint matches: the cost of validating stored outputs
+    with FakeLLM().install():
+        previous = (await run()).to_stage_records()
+        durations = await _timed(
+            lambda: run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION, previous=previous),
+            runs,
+        )
+    results["pipeline.all_reused.mean_ms"] = _mean_ms(durations)
+    return results
+
+
+def bench_json(rounds: int) -> Results:
+    """Operations/second and success rate of each JSON extractor over the messy-reply corpus."""
+    corpus = messy_replies()
+    extractors = {
+        "utils": extract_json_from_response,
+        "resume_parser": resume_extract_json,
+        "job_analyzer": job_extract_json,
+        "skill_gap": skill_gap_extract_json,
+    }
+    results: Results = {}
+    for name, extract in extractors.items():
+        parsed = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for reply in corpus:
+                try:
+                    if isinstance(extract(reply), dict):
+                        parsed += 1
+                except ValueError:
+                    pass
+        elapsed = time.perf_counter() - start
+        results[f"json.{name}.ops_per_s"] = round(rounds * len(corpus) / elapsed, 1)
+        results[f"json.{name}.success_rate"] = round(parsed / (rounds * len(corpus)), 4)
+    return results
+
+
+def bench_files(runs: int) -> Results:
+    """Documents/second and MB/second for PDF and DOCX text extraction."""
+    results: Results = {}
+    for kind, document, extract in (
+        ("pdf", make_pdf(), extract_text_from_pdf),
+        ("docx", make_docx(), extract_text_from_docx),
+    ):
+        extract(document)  # Warm up
+        start = time.perf_counter()
+        for _ in range(runs):
+            extract(document)
+        elapsed = time.perf_counter() - start
+        results[f"files.{kind}.docs_per_s"] = round(runs / elapsed, 1)
+        results[f"files.{kind}.mb_per_s"] = round(runs * len(document) / elapsed / 1e6, 2)
+    return results
+
+
+async def _throughput(
+    requests: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[Any]],
+) -> Dict[str, float]:
+    """Run `requests` calls of send(i) from `concurrency` workers; req/s and latency percentiles."""
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "req_per_s": round(requests / elapsed, 1),
+        "p50_ms": _percentile_ms(latencies, 0.50),
+        "p99_ms": _percentile_ms(latencies, 0.99),
+    }
+
+
+async def _measure_endpoints(client: AsyncClient, requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    # Distinct files and job descriptions, so concurrent requests aren't coalesced
+    uploads = [make_pdf(f"{SAMPLE_RESUME_TEXT}\nRef {i}", pages=1) for i in range(requests)]
+    measured = {}
+
+    measured["upload"] = await _throughput(requests, concurrency, lambda i: client.post(
+        "/resumes/upload", files={"file": (f"resume-{i}.pdf", uploads[i], "application/pdf")},
+    ))
+    resume_id = (await client.get("/resumes/", params={"limit": 1})).json()[0]["id"]
+
+    measured["create_analysis"] = await _throughput(requests, concurrency, lambda i: client.post(
+        "/analyses/",
+        json={"resume_id": resume_id, "job_description": f"{SAMPLE_JOB_DESCRIPTION} Ref {i}", "mode": "full"},
+    ))
+    analysis_id = (await client.get("/analyses/", params={"limit": 1})).json()[0]["id"]
+
+    async def uncached_detail(i):
+        detail_cache.clear()
+        return await client.get(f"/analyses/{analysis_id}")
+
+    measured["analysis_detail_uncached"] = await _throughput(requests, concurrency, uncached_detail)
+    measured["analysis_detail_cached"] = await _throughput(
+        requests, concurrency, lambda i: client.get(f"/analyses/{analysis_id}"),
+    )
+    measured["analysis_list"] = await _throughput(
+        requests, concurrency, lambda i: client.get("/analyses/", params={"limit": 20}),
+    )
+    measured["resume_list"] = await _throughput(
+        requests, concurrency, lambda i: client.get("/resumes/", params={"limit": 20}),
+    )
+    return measured
+
+
+async def bench_api(requests: int, concurrency: int) -> Results:
+    """Requests/second through the full ASGI stack on SQLite, with instant fake models."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user = User(id=uuid4(), email="bench@example.com", hashed_password="benchmark")
+    async with AsyncSessionLocal() as db:
+        db.add(user)
+        await db.commit()
+
+    async def current_user():
+        return user
+
+    api.dependency_overrides[get_current_user] = current_user
+    try:
+        with FakeLLM().install():
+            async with AsyncClient(transport=ASGITransport(app=api), base_url="http://bench/api/v1") as client:
+                measured = await _measure_endpoints(client, requests, concurrency)
+    finally:
+        api.dependency_overrides.clear()
+        detail_cache.clear()
+        await engine.dispose()
+
+    return {
+        f"api.{endpoint}.{metric}": value
+        for endpoint, metrics in measured.items()
+        for metric, value in metrics.items()
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Results, previous: Results, threshold: float) -> List[str]:
+    """Metrics that got worse than `previous` by more than `threshold` (a fraction)."""
+    regressions = []
+    for name, value in results.items():
+        old = previous.get(name)
+        if not old or name.endswith("model_calls_per_run"):
+            continue
+        higher_is_better = name.endswith(HIGHER_IS_BETTER)
+        change = (value - old) / abs(old)
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(f"{name}: {old} -> {value} ({change:+.1%})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Results:
+    results: Results = {}
+    if "pipeline" in args.only:
+        results.update(await bench_pipeline(args.pipeline_runs, args.latency))
+    if "json" in args.only:
+        results.update(bench_json(args.json_rounds))
+    if "files" in args.only:
+        results.update(bench_files(args.file_runs))
+    if "api" in args.only:
+        results.update(await bench_api(args.requests, args.concurrency))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous results file; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regression threshold (fraction)")
+    parser.add_argument("--only", default=",".join(SECTIONS), help="Comma-separated sections to run")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations (smoke run)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated model latency (seconds)")
+    parser.add_argument("--pipeline-runs", type=int, default=200)
+    parser.add_argument("--json-rounds", type=int, default=200)
+    parser.add_argument("--file-runs", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per API endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    args.only = set(args.only.split(","))
+    unknown = args.only - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    if args.quick:
+        args.pipeline_runs, args.json_rounds, args.file_runs, args.requests = 20, 20, 10, 20
+
+    results = asyncio.run(run(args))
+
+    for name, value in results.items():
+        print(f"{name:<45} {value:>12}")
+
+    report = {
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+        regressions = compare(results, previous, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from app.main import app
 from app.api.deps import get_db, get_current_user
 from app.db.models import User
 from app.core.config import settings
+from app.core.response_cache import detail_cache
 
 
 
@@ -57,3 +58,4 @@ async def client(mock_user, mock_db_session) -> AsyncGenerator[AsyncClient, None
         yield c
     
     app.dependency_overrides.clear()
+    detail_cache.clear()
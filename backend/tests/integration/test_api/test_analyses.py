@@ -87,3 +87,202 @@ async def test_list_analyses(client: AsyncClient, mock_analysis_service):
     data = response.json()
     assert len(data) == 1
     assert data[0]["id"] == str(analysis_id)
+
+
+@pytest.mark.asyncio
+async def test_regenerate_stage(client: AsyncClient, mock_analysis_service):
+    analysis_id = uuid4()
+    mock_analysis_service.regenerate_stage.return_value = AnalysisResponse(
+        id=analysis_id,
+        resume_id=uuid4(),
+        job_description="Looking for a senior python developer with FastAPI experience.",
+        match_score=70.0,
+        cold_email="Regenerated email",
+        created_at=datetime.now(timezone.utc)
+    )
+
+    response = await client.post(f"/api/v1/analyses/{analysis_id}/stages/content/regenerate")
+
+    assert response.status_code == 200
+    assert response.json()["cold_email"] == "Regenerated email"
+    args = mock_analysis_service.regenerate_stage.call_args.args
+    assert args[0] == analysis_id
+    assert args[1] == "content"
+
+    response = await client.post(f"/api/v1/analyses/{analysis_id}/stages/unknown/regenerate")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_passes_idempotency_key(client: AsyncClient, mock_analysis_service):
+    mock_analysis_service.create_analysis.return_value = AnalysisResponse(
+        id=uuid4(),
+        resume_id=uuid4(),
+        job_description="Looking for a senior python developer with FastAPI experience.",
+        match_score=85.5,
+        created_at=datetime.now(timezone.utc)
+    )
+
+    payload = {
+        "resume_id": str(uuid4()),
+        "job_description": "Looking for a senior python developer with FastAPI experience."
+    }
+    response = await client.post("/api/v1/analyses/", json=payload, headers={"Idempotency-Key": "abc-123"})
+
+    assert response.status_code == 201
+    assert mock_analysis_service.create_analysis.call_args.args[2] == "abc-123"
+
+
+@pytest.mark.asyncio
+async def test_list_analyses_cursor_pagination(client: AsyncClient, mock_analysis_service):
+    created_at = datetime.now(timezone.utc)
+    last_id = uuid4()
+    mock_analysis_service.list_analyses.return_value = [
+        AnalysisListResponse(id=last_id, resume_id=uuid4(), match_score=70.0, created_at=created_at)
+    ]
+
+    response = await client.get("/api/v1/analyses/", params={"limit": 1})
+
+    assert response.status_code == 200
+    cursor = response.headers["X-Next-Cursor"]
+
+    await client.get("/api/v1/analyses/", params={"limit": 1, "cursor": cursor})
+    assert mock_analysis_service.list_analyses.call_args.args[2] == (created_at, last_id)
+
+    response = await client.get("/api/v1/analyses/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_top_missing_skills(client: AsyncClient, mock_analysis_service):
+    mock_analysis_service.top_missing_skills.return_value = [("Kubernetes", 3), ("Rust", 1)]
+
+    response = await client.get("/api/v1/analyses/skills/missing?limit=5")
+
+    assert response.status_code == 200
+    assert response.json() == [{"skill": "Kubernetes", "count": 3}, {"skill": "Rust", "count": 1}]
+    assert mock_analysis_service.top_missing_skills.call_args.args[1] == 5
+
+
+@pytest.mark.asyncio
+async def test_get_analysis_conditional_and_compressed(client: AsyncClient, mock_analysis_service, mock_user):
+    from types import SimpleNamespace
+    from app.db.models import Analysis
+
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    analysis = Analysis(
+        id=uuid4(),
+        resume_id=uuid4(),
+        job_description="Looking for a senior python developer with FastAPI experience.",
+        match_score=80.0,
+        skill_gaps=[],
+        suggestions=[],
+        cold_email="Dear hiring manager, " * 200,
+        interview_questions=[],
+        created_at=created_at,
+    )
+    mock_analysis_service.get_analysis.return_value = analysis
+    mock_analysis_service.get_analysis_version.return_value = SimpleNamespace(created_at=created_at, updated_at=None)
+    url = f"/api/v1/analyses/{analysis.id}"
+
+    response = await client.get(url, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    etag = response.headers["ETag"]
+    mock_analysis_service.get_analysis_version.assert_not_called()
+
+    # Revalidation only loads the version, never the analysis itself
+    mock_analysis_service.get_analysis.reset_mock()
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    mock_analysis_service.get_analysis.assert_not_called()
+
+    # Large bodies are compressed, and the compressed representation gets its own tag
+    response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["cold_email"] == analysis.cold_email
+    assert response.headers["ETag"] == etag[:-1] + '-gzip"'
+    assert int(response.headers["Content-Length"]) < len(analysis.cold_email) / 10
+
+    # Revalidating the compressed representation: the 304 carries its tag
+    gzip_etag = response.headers["ETag"]
+    response = await client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == gzip_etag
+
+    response = await client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+    # A newer version (written through the service, which invalidates the cache) no longer matches
+    from app.core.response_cache import detail_cache
+    await detail_cache.invalidate("analysis", mock_user.id, analysis.id)
+    mock_analysis_service.get_analysis_version.return_value = SimpleNamespace(
+        created_at=created_at, updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc)
+    )
+    response = await client.get(url, headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert mock_analysis_service.get_analysis.called
+
+
+@pytest.mark.asyncio
+async def test_get_analysis_served_from_cache(client: AsyncClient, mock_analysis_service):
+    from app.db.models import Analysis
+
+    analysis = Analysis(
+        id=uuid4(),
+        resume_id=uuid4(),
+        job_description="Looking for a senior python developer with FastAPI experience.",
+        match_score=80.0,
+        skill_gaps=[],
+        suggestions=[],
+        interview_questions=[],
+        created_at=datetime.now(timezone.utc),
+    )
+    mock_analysis_service.get_analysis.return_value = analysis
+    url = f"/api/v1/analyses/{analysis.id}"
+
+    first = await client.get(url)
+    second = await client.get(url)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert mock_analysis_service.get_analysis.await_count == 1
+
+    stats = (await client.get("/health/cache")).json()
+    assert stats["local"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_analysis_stage_outputs_are_opt_in(client: AsyncClient, mock_analysis_service):
+    from app.db.models import Analysis
+
+    analysis = Analysis(
+        id=uuid4(),
+        resume_id=uuid4(),
+        job_description="Looking for a senior python developer with FastAPI experience.",
+        match_score=80.0,
+        skill_gaps=[],
+        suggestions=[],
+        interview_questions=[],
+        stage_results={
+            "resume": {"fingerprint": "r", "output": None, "status": "completed", "error": None},
+            "match": {"fingerprint": "m", "output": {"match_score": 80.0}, "status": "completed", "error": None},
+            "strategy": {"fingerprint": None, "output": None, "status": "pending", "error": None},
+        },
+        created_at=datetime.now(timezone.utc),
+    )
+    mock_analysis_service.get_analysis.return_value = analysis
+    mock_analysis_service.get_analysis_with_stage_outputs.return_value = analysis
+    url = f"/api/v1/analyses/{analysis.id}"
+
+    body = (await client.get(url)).json()
+    assert not mock_analysis_service.get_analysis_with_stage_outputs.called
+    assert body["stages"]["match"] == {"fingerprint": "m", "status": "completed", "error": None}
+    assert body["pending_stages"] == ["job", "strategy", "content"]
+
+    body = (await client.get(url, params={"stage_outputs": "true"})).json()
+    assert body["stages"]["match"]["output"] == {"match_score": 80.0}
+    assert body["pending_stages"] == ["job", "strategy", "content"]
@@ -0,0 +1,74 @@
+import time
+import pytest
+from uuid import uuid4
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import event
+
+from app.api import deps
+from app.api.deps import get_current_user
+
+SECRET = "test-jwt-secret"
+
+
+def make_token(user_id, email="test@example.com", expires_in=3600):
+    return jwt.encode(
+        {"sub": str(user_id), "email": email, "aud": "authenticated", "exp": int(time.time()) + expires_in},
+        SECRET,
+        algorithm="HS256",
+    )
+
+
+@pytest.fixture(autouse=True)
+def auth_caches():
+    deps._verified_claims.clear()
+    deps._users.clear()
+    with patch.object(deps.settings, "supabase_jwt_secret", SECRET):
+        yield
+    deps._verified_claims.clear()
+    deps._users.clear()
+
+
+@pytest.mark.asyncio
+async def test_first_request_creates_user_then_serves_from_cache(engine, session):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper()))
+
+    user_id = uuid4()
+    token = make_token(user_id)
+
+    user = await get_current_user(token, session)
+    assert user.id == user_id
+    assert statements == ["SELECT", "INSERT"]
+
+    statements.clear()
+    with patch.object(deps.jwt, "decode", side_effect=AssertionError("token re-verified")):
+        again = await get_current_user(token, session)
+
+    assert again.id == user_id
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_existing_user_is_not_reinserted(session):
+    user_id = uuid4()
+    await get_current_user(make_token(user_id), session)
+    deps._users.clear()
+
+    # A new token for the same user finds the existing row
+    user = await get_current_user(make_token(user_id, expires_in=60), session)
+    assert user.id == user_id
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_rejected_and_not_cached(session):
+    token = jwt.encode({"sub": str(uuid4()), "email": "x@example.com", "aud": "authenticated"}, "wrong", algorithm="HS256")
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(token, session)
+
+    assert exc.value.status_code == 401
+    assert len(deps._verified_claims) == 0
@@ -15,3 +15,16 @@ async def test_root(client: AsyncClient):
     data = response.json()
     assert "name" in data
     assert "version" in data
+
+@pytest.mark.asyncio
+async def test_db_pool_health(client: AsyncClient):
+    response = await client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert "pool_class" in data
+    assert "max_wait_ms" in data
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient):
+    response = await client.get("/health")
+    assert response.headers["Server-Timing"].startswith("total;dur=")
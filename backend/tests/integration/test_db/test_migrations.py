@@ -0,0 +1,33 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+from alembic import command
+from alembic.config import Config
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+
+def _foreign_keys(path, table):
+    with sqlite3.connect(path) as conn:
+        return {
+            (row[3], row[2], row[6])  # (from column, referenced table, on delete)
+            for row in conn.execute(f"PRAGMA foreign_key_list({table})")
+        }
+
+
+def test_job_description_migration_keeps_cascading_foreign_keys(tmp_path):
+    path = tmp_path / "migrated.db"
+    # No config file: alembic.ini's logging setup would reconfigure the test run's loggers
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    cascades = {("user_id", "users", "CASCADE"), ("resume_id", "resumes", "CASCADE")}
+
+    with patch.object(settings, "database_url", f"sqlite+aiosqlite:///{path}"):
+        command.upgrade(config, "head")
+        assert _foreign_keys(path, "analyses") == cascades | {("job_description_id", "job_descriptions", "NO ACTION")}
+
+        command.downgrade(config, "-1")
+        assert _foreign_keys(path, "analyses") == cascades
@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import PropertyMock, patch
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.db.models import User, Resume
+from app.db.repositories.base import BaseRepository
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the database (excluding transaction control)."""
+    executed = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split()[0].upper())
+
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def users(session):
+    owner = User(id=uuid4(), email="owner@example.com", hashed_password="x")
+    other = User(id=uuid4(), email="other@example.com", hashed_password="x")
+    await BaseRepository(User, session).create_many([owner, other])
+    return owner, other
+
+
+@pytest.mark.asyncio
+async def test_create_is_one_insert(session, users, statements):
+    owner, _ = users
+    resume = await BaseRepository(Resume, session).create(
+        Resume(user_id=owner.id, filename="cv.pdf")
+    )
+
+    assert statements == ["INSERT"]
+    assert resume.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_owned_get_update_delete_are_single_statements(session, users, statements):
+    owner, other = users
+    repo = BaseRepository(Resume, session)
+    resume = await repo.create(Resume(user_id=owner.id, filename="cv.pdf"))
+    statements.clear()
+
+    assert await repo.get(resume.id, user_id=other.id) is None
+    assert await repo.update(resume.id, user_id=other.id, filename="x.pdf") is None
+    assert await repo.delete(resume.id, user_id=other.id) is False
+    assert statements == ["SELECT", "UPDATE", "DELETE"]
+
+    updated = await repo.update(resume.id, user_id=owner.id, filename="new.pdf")
+    assert updated.filename == "new.pdf"
+    assert await repo.delete(resume.id, user_id=owner.id) is True
+    assert await repo.get(resume.id) is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_and_delete(session, users, statements):
+    owner, other = users
+    repo = BaseRepository(Resume, session)
+    resumes = await repo.create_many(
+        [Resume(user_id=owner.id, filename=f"cv{i}.pdf") for i in range(3)]
+        + [Resume(user_id=other.id, filename="theirs.pdf")]
+    )
+    assert statements == ["INSERT"]
+    statements.clear()
+
+    deleted = await repo.delete_many([r.id for r in resumes], user_id=owner.id)
+
+    assert statements == ["DELETE"]
+    assert sorted(deleted) == sorted(r.id for r in resumes[:3])
+    assert await repo.get(resumes[3].id) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_version_reads_only_timestamps(session, users):
+    owner, other = users
+    repo = BaseRepository(Resume, session)
+    resume = await repo.create(Resume(user_id=owner.id, filename="cv.pdf", content_text="x" * 10_000))
+
+    version = await repo.get_version(resume.id, user_id=owner.id)
+    assert tuple(version) == (resume.created_at, None)
+    assert await repo.get_version(resume.id, user_id=other.id) is None
+
+    # Back-to-back updates still get distinct versions (sub-second updated_at)
+    first = (await repo.update(resume.id, filename="a.pdf")).updated_at
+    second = (await repo.update(resume.id, filename="b.pdf")).updated_at
+    assert first < second
+    assert (await repo.get_version(resume.id)).updated_at == second
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dialect", ["sqlite", "mysql"])  # mysql: the portable INSERT fallback
+async def test_create_if_absent_returns_none_on_conflict(session, users, dialect):
+    owner, _ = users
+    repo = BaseRepository(User, session)
+    new_id = uuid4()
+    session.expunge_all()  # As for a caller that looked the row up and missed
+
+    with patch.object(BaseRepository, "dialect", new_callable=PropertyMock, return_value=dialect):
+        assert await repo.create_if_absent(id=owner.id, email="owner@example.com", hashed_password="y") is None
+        created = await repo.create_if_absent(id=new_id, email="new@example.com", hashed_password="y")
+
+    assert created.id == new_id
+    assert (await repo.get(owner.id)).hashed_password == "x"
@@ -0,0 +1,95 @@
+import pytest
+from uuid import uuid4
+
+from app.db.models import User, Resume, JobDescription, Analysis
+from app.agents import MatchAnalysis, PipelineResult, ParsedResumeData, ParsedJobData
+from app.agents.skill_gap import SkillGap
+from app.db.repositories import AnalysisRepository, ResumeRepository
+from app.services.analysis import AnalysisService
+
+
+def gaps(*skills, level="none"):
+    return [
+        {"skill": skill, "importance": "high", "current_level": level, "recommendation": "Learn it"}
+        for skill in skills
+    ]
+
+
+@pytest.fixture
+async def data(session):
+    user = User(id=uuid4(), email="test@example.com", hashed_password="x")
+    other = User(id=uuid4(), email="other@example.com", hashed_password="x")
+    job = JobDescription(id="a" * 64, text="x")
+    session.add_all([user, other, job])
+    await session.flush()
+
+    resumes = [
+        Resume(user_id=user.id, filename="a.pdf", parsed_data={"skills": ["Python", "SQL"]}),
+        Resume(user_id=user.id, filename="b.pdf", parsed_data={"skills": ["Go"]}),
+    ]
+    session.add_all(resumes)
+    await session.flush()
+
+    analyses = [
+        Analysis(user_id=user.id, resume_id=resumes[0].id, job_description_id=job.id, skill_gaps=gaps("Kubernetes", "Rust")),
+        Analysis(user_id=user.id, resume_id=resumes[0].id, job_description_id=job.id, skill_gaps=gaps("Kubernetes")),
+        Analysis(user_id=user.id, resume_id=resumes[1].id, job_description_id=job.id, skill_gaps=[]),
+        # Weak, not missing: the candidate has Kubernetes at a basic level
+        Analysis(user_id=user.id, resume_id=resumes[1].id, job_description_id=job.id,
+                 skill_gaps=gaps("Kubernetes", "Rust", level="basic")),
+        Analysis(user_id=other.id, resume_id=resumes[1].id, job_description_id=job.id, skill_gaps=gaps("Kubernetes")),
+    ]
+    session.add_all(analyses)
+    await session.commit()
+    return user, resumes, analyses
+
+
+@pytest.mark.asyncio
+async def test_analyses_missing_skill(session, data):
+    user, _, analyses = data
+    found = await AnalysisRepository(session).get_missing_skill(user.id, "Kubernetes")
+    assert {a.id for a in found} == {analyses[0].id, analyses[1].id}
+
+    assert await AnalysisRepository(session).get_missing_skill(user.id, "Python") == []
+
+
+@pytest.mark.asyncio
+async def test_resumes_with_skill(session, data):
+    user, resumes, _ = data
+    found = await ResumeRepository(session).get_with_skill(user.id, "Python")
+    assert [r.id for r in found] == [resumes[0].id]
+
+
+@pytest.mark.asyncio
+async def test_top_missing_skills(session, data):
+    user, _, _ = data
+    assert await AnalysisRepository(session).top_missing_skills(user.id) == [("Kubernetes", 2), ("Rust", 1)]
+
+
+@pytest.mark.asyncio
+async def test_missing_skill_levels_are_normalized_on_write(session, data):
+    user, resumes, _ = data
+    gap = dict(importance="high", recommendation="Learn it")
+    match = MatchAnalysis(
+        match_score=50,
+        overall_assessment="Fair",
+        missing_skills=[SkillGap(skill="Rust", current_level="None", **gap)],
+        weak_skills=[
+            SkillGap(skill="Terraform", current_level="N/A", **gap),
+            SkillGap(skill="Kubernetes", current_level=" Basic", **gap),
+        ],
+    )
+    fields = AnalysisService._result_fields(
+        PipelineResult(
+            resume_data=ParsedResumeData(name="John Doe"), job_data=ParsedJobData(title="Engineer"), match_analysis=match,
+        ),
+        resumes[0], JobDescription(id="a" * 64, text="x"),
+    )
+    assert [g["current_level"] for g in fields["skill_gaps"]] == ["none", "none", "basic"]
+
+    analysis = Analysis(user_id=user.id, resume_id=resumes[0].id, job_description_id="a" * 64, **fields)
+    await AnalysisRepository(session).create(analysis)
+
+    repo = AnalysisRepository(session)
+    assert analysis.id in {a.id for a in await repo.get_missing_skill(user.id, "Terraform")}
+    assert await repo.top_missing_skills(user.id) == [("Kubernetes", 2), ("Rust", 2), ("Terraform", 1)]
@@ -0,0 +1,81 @@
+import pytest
+from uuid import uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import (
+    Base,
+    InstrumentedWritePool,
+    RoutingSession,
+    apply_sqlite_pragmas,
+    create_sqlite_write_engine,
+    sqlite_pragmas,
+    write_pool_metrics,
+)
+from app.db.models import User
+from app.db.repositories import BaseRepository
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    reader = create_async_engine(url)
+    writer = create_sqlite_write_engine(url)
+    for engine in (reader, writer):
+        apply_sqlite_pragmas(engine, sqlite_pragmas())
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield reader, writer
+    await reader.dispose()
+    await writer.dispose()
+
+
+def record_statements(engine):
+    executed = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: executed.append(statement.split()[0].upper()))
+    return executed
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied_on_connect(engines):
+    reader, _ = engines
+    async with reader.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+
+
+@pytest.mark.asyncio
+async def test_writes_go_through_single_writer(engines):
+    reader, writer = engines
+    factory = sessionmaker(
+        reader, class_=AsyncSession, expire_on_commit=False,
+        sync_session_class=RoutingSession, writer=writer.sync_engine,
+    )
+    reads, writes = record_statements(reader), record_statements(writer)
+
+    async with factory() as session:
+        repo = BaseRepository(User, session)
+        user = await repo.create(User(id=uuid4(), email="test@example.com", hashed_password="x"))
+        await repo.update(user.id, email="new@example.com")
+        assert (await repo.get(user.id)).email == "new@example.com"
+        assert await repo.delete(user.id)
+
+    assert writes == ["INSERT", "UPDATE", "DELETE"]
+    assert reads == ["SELECT"]
+    assert writer.pool.size() == 1
+
+
+@pytest.mark.asyncio
+async def test_write_pool_checkouts_are_measured(engines):
+    _, writer = engines
+    before = write_pool_metrics.checkouts
+
+    async with writer.begin() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert isinstance(writer.sync_engine.pool, InstrumentedWritePool)
+    assert write_pool_metrics.checkouts > before
@@ -0,0 +1,54 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from app.db.models import User, Resume
+from app.agents import ParsedResumeData, ParsedJobData, MatchAnalysis
+from app.agents.content_generator import GeneratedContent
+from app.agents.strategy_planner import ImprovementStrategy
+from app.schemas.analysis import AnalysisRequest, AnalysisResponse
+from app.services.analysis import AnalysisService
+
+JOB_TEXT = "Backend engineer with Python and FastAPI experience, remote friendly team."
+
+CONTENT = GeneratedContent(
+    cold_email="Hello", linkedin_dm="Hi", interview_questions=["Why us?"], elevator_pitch="Pitch",
+)
+
+
+@pytest.mark.asyncio
+async def test_failed_rerun_keeps_previous_content(session):
+    user = User(id=uuid4(), email="user@example.com", hashed_password="x")
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add_all([user, resume])
+    await session.commit()
+
+    service = AnalysisService(session)
+    strategy = ImprovementStrategy(
+        resume_improvements=["Quantify impact"], skill_development_plan=[],
+        interview_focus_areas=[], project_ideas=[],
+    )
+    with patch("app.agents.pipeline.parse_resume", new_callable=AsyncMock,
+               return_value=ParsedResumeData(name="John Doe")), \
+         patch("app.agents.pipeline.analyze_job_description", new_callable=AsyncMock,
+               return_value=ParsedJobData(title="Backend Engineer")), \
+         patch("app.agents.pipeline.analyze_skill_gap", new_callable=AsyncMock,
+               return_value=MatchAnalysis(match_score=70, overall_assessment="Good")), \
+         patch("app.agents.pipeline.plan_strategy", new_callable=AsyncMock, return_value=strategy), \
+         patch("app.agents.pipeline.generate_content", new_callable=AsyncMock, return_value=CONTENT) as content:
+        analysis = await service.create_analysis(AnalysisRequest(resume_id=resume.id, job_description=JOB_TEXT), user)
+
+        content.side_effect = TimeoutError("provider timed out")
+        rerun = await service.regenerate_stage(analysis.id, "content", user)
+
+    assert content.call_count == 2
+    assert (rerun.cold_email, rerun.linkedin_dm, rerun.interview_questions) == ("Hello", "Hi", ["Why us?"])
+    assert rerun.suggestions == ["Quantify impact"]
+    record = rerun.stage_results["content"]
+    assert record["output"] == CONTENT.model_dump(mode="json")
+    assert record["status"] == "failed" and "provider timed out" in record["error"]
+
+    response = AnalysisResponse.model_validate(rerun)
+    assert response.failed_stages == ["content"]
+    assert response.pending_stages == []
+    assert not service._is_quick(rerun)
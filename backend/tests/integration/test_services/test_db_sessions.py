@@ -0,0 +1,171 @@
+import asyncio
+import pytest
+from io import BytesIO
+from unittest.mock import patch
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Analysis, User, Resume
+from app.db.repositories import AnalysisRepository
+from app.agents import PipelineResult, ParsedResumeData, ParsedJobData, MatchAnalysis
+from app.schemas.analysis import AnalysisRequest
+from app.services.analysis import AnalysisService
+from app.services.resume import ResumeService
+
+
+@pytest.fixture
+async def user(session):
+    user = User(id=uuid4(), email="test@example.com", hashed_password="x")
+    session.add(user)
+    await session.commit()
+    # Simulate get_current_user: a SELECT leaves a transaction open on the session
+    await session.execute(select(User).where(User.id == user.id))
+    return user
+
+
+@pytest.mark.asyncio
+async def test_no_connection_held_while_analysis_pipeline_runs(engine, session, user):
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add(resume)
+    await session.commit()
+    await session.execute(select(User))
+
+    checked_out = []
+
+    async def fake_pipeline(resume_text, job_description, previous, quick, checkpoint):
+        checked_out.append(engine.pool.checkedout())
+        result = PipelineResult(
+            resume_data=ParsedResumeData(name="John Doe"),
+            job_data=ParsedJobData(title="Engineer"),
+            match_analysis=MatchAnalysis(match_score=75, overall_assessment="Good"),
+        )
+        await checkpoint(result)
+        checked_out.append(engine.pool.checkedout())
+        await checkpoint(result)
+        checked_out.append(engine.pool.checkedout())
+        return result
+
+    with patch("app.services.analysis.run_analysis_pipeline", side_effect=fake_pipeline):
+        analysis = await AnalysisService(session).create_analysis(
+            AnalysisRequest(resume_id=resume.id, job_description="x" * 60), user
+        )
+
+    assert checked_out == [0, 0, 0]
+    assert analysis.match_score == 75
+
+
+@pytest.mark.asyncio
+async def test_no_connection_held_while_resume_is_parsed(engine, session, user):
+    checked_out = []
+
+    async def fake_parse(text):
+        checked_out.append(engine.pool.checkedout())
+        return ParsedResumeData(name="John Doe")
+
+    upload = UploadFile(BytesIO(b"%PDF"), filename="cv.pdf")
+    with patch("app.services.resume.extract_text_from_file", return_value="resume text"), \
+         patch("app.agents.parse_resume", side_effect=fake_parse):
+        resume = await ResumeService(session).upload_resume(upload, user)
+
+    assert checked_out == [0]
+    assert resume.parsed_data["name"] == "John Doe"
+
+
+@pytest.mark.asyncio
+async def test_shared_analysis_work_uses_its_own_session(engine, session, user):
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add(resume)
+    await session.commit()
+
+    # Coalesced callers await work started by the first request, which may
+    # end (closing its session) first; the work must not use that session
+    sessions = []
+    create = AnalysisRepository.create
+
+    async def spy_create(repo, obj):
+        sessions.append(repo.db)
+        return await create(repo, obj)
+
+    async def fake_pipeline(resume_text, job_description, previous, quick, checkpoint):
+        result = PipelineResult(
+            resume_data=ParsedResumeData(name="John Doe"),
+            job_data=ParsedJobData(title="Engineer"),
+            match_analysis=MatchAnalysis(match_score=75, overall_assessment="Good"),
+        )
+        await checkpoint(result)
+        return result
+
+    with patch("app.services.analysis.run_analysis_pipeline", side_effect=fake_pipeline), \
+         patch.object(AnalysisRepository, "create", spy_create):
+        analysis = await AnalysisService(session).create_analysis(
+            AnalysisRequest(resume_id=resume.id, job_description="x" * 60), user
+        )
+
+    assert len(sessions) == 1 and sessions[0] is not session
+    async with AsyncSession(engine) as check:
+        assert (await check.execute(select(Analysis.id))).scalars().all() == [analysis.id]
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_reused_for_different_request_is_rejected(session, user):
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add(resume)
+    await session.commit()
+
+    async def fake_pipeline(resume_text, job_description, previous, quick, checkpoint):
+        result = PipelineResult(
+            resume_data=ParsedResumeData(name="John Doe"),
+            job_data=ParsedJobData(title="Engineer"),
+            match_analysis=MatchAnalysis(match_score=75, overall_assessment="Good"),
+        )
+        await checkpoint(result)
+        return result
+
+    service = AnalysisService(session)
+    key = f"key-{uuid4()}"
+    with patch("app.services.analysis.run_analysis_pipeline", side_effect=fake_pipeline):
+        analysis = await service.create_analysis(AnalysisRequest(resume_id=resume.id, job_description="x" * 60), user, key)
+        retried = await service.create_analysis(AnalysisRequest(resume_id=resume.id, job_description="x" * 60), user, key)
+        with pytest.raises(HTTPException) as exc_info:
+            await service.create_analysis(AnalysisRequest(resume_id=resume.id, job_description="y" * 60), user, key)
+
+    assert retried.id == analysis.id
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_different_job_urls_are_not_coalesced(engine, session, user):
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add(resume)
+    await session.commit()
+
+    started = []
+    both_started = asyncio.Event()
+
+    async def fake_pipeline(resume_text, job_description, previous, quick, checkpoint):
+        started.append(job_description)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        result = PipelineResult(
+            resume_data=ParsedResumeData(name="John Doe"),
+            job_data=ParsedJobData(title="Engineer"),
+            match_analysis=MatchAnalysis(match_score=75, overall_assessment="Good"),
+        )
+        await checkpoint(result)
+        return result
+
+    async def create(job_url):
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            request = AnalysisRequest(resume_id=resume.id, job_description="x" * 60, job_url=job_url)
+            return await AnalysisService(db).create_analysis(request, user)
+
+    with patch("app.services.analysis.run_analysis_pipeline", side_effect=fake_pipeline):
+        first, second = await asyncio.gather(create("https://a.test/job"), create("https://b.test/job"))
+
+    assert len(started) == 2
+    assert first.id != second.id
+    assert (first.job_url, second.job_url) == ("https://a.test/job", "https://b.test/job")
@@ -0,0 +1,42 @@
+import pytest
+from uuid import uuid4
+
+from app.core.response_cache import CachedResponse, detail_cache
+from app.db.models import User, Resume
+from app.services.analysis import AnalysisService
+from app.services.resume import ResumeService
+
+
+@pytest.fixture
+async def user(session):
+    user = User(id=uuid4(), email="test@example.com", hashed_password="x")
+    session.add(user)
+    await session.commit()
+    yield user
+    detail_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_resume_invalidates_it_and_its_analyses(session, user):
+    resume = Resume(user_id=user.id, filename="cv.pdf")
+    session.add(resume)
+    await session.commit()
+    analysis_id = uuid4()
+    await detail_cache.set("resume", user.id, resume.id, CachedResponse('"r"', b"{}"))
+    await detail_cache.set("analysis", user.id, analysis_id, CachedResponse('"a"', b"{}"))
+
+    await ResumeService(session).delete_resume(resume.id, user)
+
+    assert await detail_cache.get("resume", user.id, resume.id) is None
+    assert await detail_cache.get("analysis", user.id, analysis_id) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_keeps_cached_analysis(session, user):
+    analysis_id = uuid4()
+    await detail_cache.set("analysis", user.id, analysis_id, CachedResponse('"a"', b"{}"))
+
+    with pytest.raises(Exception):
+        await AnalysisService(session).delete_analysis(uuid4(), user)
+
+    assert await detail_cache.get("analysis", user.id, analysis_id) is not None
@@ -0,0 +1,94 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import select, func
+
+from app.db.models import Analysis, User, Resume, JobDescription
+from app.agents import ParsedResumeData, ParsedJobData, MatchAnalysis
+from app.schemas.analysis import AnalysisRequest, AnalysisUpdateRequest, AnalysisMode, AnalysisStagesResponse
+from app.services.analysis import AnalysisService
+
+JOB_TEXT = "Backend engineer with Python and FastAPI experience, remote friendly team."
+
+
+@pytest.fixture
+def mock_agents():
+    with patch("app.agents.pipeline.parse_resume", new_callable=AsyncMock,
+               return_value=ParsedResumeData(name="John Doe")), \
+         patch("app.agents.pipeline.analyze_job_description", new_callable=AsyncMock,
+               return_value=ParsedJobData(title="Backend Engineer")) as job, \
+         patch("app.agents.pipeline.analyze_skill_gap", new_callable=AsyncMock,
+               return_value=MatchAnalysis(match_score=70, overall_assessment="Good")):
+        yield job
+
+
+@pytest.mark.asyncio
+async def test_same_posting_is_stored_and_parsed_once(session, mock_agents):
+    users = [User(id=uuid4(), email=f"user{i}@example.com", hashed_password="x") for i in range(2)]
+    resumes = [Resume(user_id=user.id, filename="cv.pdf", content_text="resume text") for user in users]
+    session.add_all(users + resumes)
+    await session.commit()
+
+    service = AnalysisService(session)
+    first = await service.create_analysis(
+        AnalysisRequest(resume_id=resumes[0].id, job_description=JOB_TEXT, mode=AnalysisMode.quick), users[0]
+    )
+    # Same posting pasted with different whitespace by another user
+    second = await service.create_analysis(
+        AnalysisRequest(resume_id=resumes[1].id, job_description=f"  {JOB_TEXT}\n", mode=AnalysisMode.quick),
+        users[1],
+    )
+
+    assert first.job_description_id == second.job_description_id
+    assert second.job_description == JOB_TEXT
+    assert await session.scalar(select(func.count()).select_from(JobDescription)) == 1
+    assert mock_agents.call_count == 1
+    assert "job" in second.stage_results
+
+    reloaded = await service.get_analysis(second.id, users[1])
+    assert reloaded.job_description == JOB_TEXT
+
+    updated = await service.update_analysis(
+        second.id, AnalysisUpdateRequest(job_description=f"{JOB_TEXT} Visa sponsorship."), users[1]
+    )
+    assert updated.job_description == f"{JOB_TEXT} Visa sponsorship."
+    assert await session.scalar(select(func.count()).select_from(JobDescription)) == 2
+
+
+@pytest.mark.asyncio
+async def test_parses_are_stored_once_not_per_analysis(session, mock_agents):
+    user = User(id=uuid4(), email="user@example.com", hashed_password="x")
+    resume = Resume(user_id=user.id, filename="cv.pdf", content_text="resume text")
+    session.add_all([user, resume])
+    await session.commit()
+
+    service = AnalysisService(session)
+    with patch("app.agents.pipeline.parse_resume", new_callable=AsyncMock,
+               return_value=ParsedResumeData(name="John Doe")) as parse:
+        analysis = await service.create_analysis(
+            AnalysisRequest(resume_id=resume.id, job_description=JOB_TEXT, mode=AnalysisMode.quick), user
+        )
+        # The parses live on the resume and job description; the analysis keeps fingerprints
+        parsed_data = await session.scalar(select(Resume.parsed_data).where(Resume.id == resume.id))
+        assert parsed_data["name"] == "John Doe"
+        for stage in ("resume", "job"):
+            record = analysis.stage_results[stage]
+            assert record["output"] is None
+            assert record["fingerprint"] and record["status"] == "completed"
+
+        await service.regenerate_stage(analysis.id, "match", user)
+
+    assert parse.call_count == 1
+    assert mock_agents.call_count == 1
+
+    # The opt-in view still returns both parses, from the resume and job description
+    stages = AnalysisStagesResponse.model_validate(
+        await service.get_analysis_with_stage_outputs(analysis.id, user)
+    ).stages
+    assert stages["resume"].output["name"] == "John Doe"
+    assert stages["job"].output["title"] == "Backend Engineer"
+    assert stages["match"].output is not None
+    # Filled in for the response only
+    stored = await session.scalar(select(Analysis.stage_results).where(Analysis.id == analysis.id))
+    assert stored["resume"]["output"] is None
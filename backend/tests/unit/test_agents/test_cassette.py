@@ -0,0 +1,39 @@
+import pytest
+from unittest.mock import patch
+
+from app.agents.cassette import Cassette, CassetteMissError, MODE_RECORD, MODE_REPLAY
+from app.agents.pipeline import run_analysis_pipeline
+from benchmarks.data import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME_TEXT
+from benchmarks.fake_llm import FakeLLM
+
+
+@pytest.mark.asyncio
+async def test_recorded_pipeline_replays_offline(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+
+    fake = FakeLLM()
+    with fake.install(), patch("app.agents.base.cassette", Cassette(path, MODE_RECORD)):
+        recorded = await run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION)
+    calls = sum(fake.calls.values())
+
+    replay = Cassette(path, MODE_REPLAY)
+    assert sum(map(len, replay.interactions.values())) == calls
+    interaction = next(iter(replay.interactions.values()))[0]
+    assert interaction.model.startswith("fake-")
+    assert interaction.usage["requests"] == 1
+
+    # No model override: any call not served from the cassette would hit the network
+    with patch("app.agents.base.cassette", replay):
+        replayed = await run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION)
+
+    assert replayed.to_stage_records() == recorded.to_stage_records()
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_raises(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    path.write_text("")
+
+    with patch("app.agents.base.cassette", Cassette(str(path), MODE_REPLAY)):
+        with pytest.raises(CassetteMissError):
+            await run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION, quick=True)
@@ -0,0 +1,28 @@
+import pytest
+
+from app.agents.pipeline import run_analysis_pipeline, PIPELINE_STAGES
+from benchmarks.data import CANNED_OUTPUTS, SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME_TEXT
+from benchmarks.fake_llm import FakeLLM
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_runs_the_real_pipeline():
+    """The benchmark fake drives every agent, including JSON extraction and validation."""
+    fake = FakeLLM()
+    with fake.install():
+        result = await run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION)
+
+    assert result.errors == {}
+    assert result.match_analysis == CANNED_OUTPUTS["skill_gap"]
+    assert result.content == CANNED_OUTPUTS["content_generator"]
+    assert set(fake.calls) == set(CANNED_OUTPUTS)
+    assert set(result.to_stage_records()) == set(PIPELINE_STAGES)
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_custom_replies_reach_the_parsers():
+    fake = FakeLLM(replies={"job_analyzer": lambda: "not json"})
+    with fake.install():
+        with pytest.raises(Exception):
+            await run_analysis_pipeline(SAMPLE_RESUME_TEXT, SAMPLE_JOB_DESCRIPTION, quick=True)
+    assert fake.calls["job_analyzer"] >= 1
@@ -0,0 +1,63 @@
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from app.agents.job_analyzer import analyze_job_description, job_analyzer_agent
+from benchmarks.data import CANNED_OUTPUTS, SAMPLE_JOB_DESCRIPTION
+from benchmarks.fake_openai import LatencyProfile, ServerConfig, create_app
+
+
+def fake_client(config: ServerConfig) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(config)), base_url="http://fake/v1")
+
+
+@pytest.mark.asyncio
+async def test_agent_runs_against_fake_server():
+    """The fake speaks the OpenAI protocol well enough for pydantic-ai, and matches the system prompt."""
+    async with fake_client(ServerConfig(latency=LatencyProfile(0.0, 0.0))) as client:
+        model = OpenAIChatModel(
+            "fake-model",
+            provider=OpenAIProvider(openai_client=AsyncOpenAI(base_url="http://fake/v1", api_key="x", http_client=client)),
+        )
+        with job_analyzer_agent.override(model=model):
+            job = await analyze_job_description(SAMPLE_JOB_DESCRIPTION)
+
+        assert job == CANNED_OUTPUTS["job_analyzer"]
+        assert (await client.get("http://fake/stats")).json() == {"fake-model:200": 1}
+
+
+@pytest.mark.asyncio
+async def test_streaming_reply_reassembles():
+    async with fake_client(ServerConfig(latency=LatencyProfile(0.0, 0.0), stream_chunks=5)) as client:
+        response = await client.post("/chat/completions", json={
+            "model": "fake-model",
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            "messages": [{"role": "user", "content": "hi"}],
+        })
+
+    events = [line.removeprefix("data: ") for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [httpx.Response(200, content=event).json() for event in events[:-1]]
+    assert "".join(c["choices"][0]["delta"].get("content", "") for c in chunks) == "OK"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert "usage" in chunks[-1]
+
+
+@pytest.mark.asyncio
+async def test_injected_failures_and_rate_limit_headers():
+    async with fake_client(ServerConfig(latency=LatencyProfile(0.0, 0.0), rate_429=1.0, retry_after=2)) as client:
+        response = await client.post("/chat/completions", json={"model": "m", "messages": []})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+    async with fake_client(ServerConfig(latency=LatencyProfile(0.0, 0.0), requests_per_minute=1)) as client:
+        first = await client.post("/chat/completions", json={"model": "m", "messages": []})
+        second = await client.post("/chat/completions", json={"model": "m", "messages": []})
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "1"
+    assert second.status_code == 429
+    assert second.headers["X-RateLimit-Remaining"] == "0"
+    assert int(second.headers["Retry-After"]) > 0
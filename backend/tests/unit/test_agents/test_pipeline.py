@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.agents.pipeline import run_analysis_pipeline
+from app.agents.resume_parser import ParsedResumeData
+from app.agents.job_analyzer import ParsedJobData
+from app.agents.skill_gap import MatchAnalysis
+from app.agents.strategy_planner import ImprovementStrategy
+from app.agents.content_generator import GeneratedContent
+
+
+RESUME = ParsedResumeData(name="John Doe", skills=["Python"])
+JOB = ParsedJobData(title="Backend Engineer")
+MATCH = MatchAnalysis(match_score=80, overall_assessment="Good fit")
+STRATEGY = ImprovementStrategy(
+    resume_improvements=["Quantify impact"],
+    skill_development_plan=[],
+    interview_focus_areas=["APIs"],
+    project_ideas=[],
+)
+CONTENT = GeneratedContent(
+    cold_email="Email",
+    linkedin_dm="DM",
+    interview_questions=["Why FastAPI?"],
+    elevator_pitch="Pitch",
+)
+
+
+@pytest.fixture
+def mock_agents():
+    with patch("app.agents.pipeline.parse_resume", new_callable=AsyncMock, return_value=RESUME) as resume, \
+         patch("app.agents.pipeline.analyze_job_description", new_callable=AsyncMock, return_value=JOB) as job, \
+         patch("app.agents.pipeline.analyze_skill_gap", new_callable=AsyncMock, return_value=MATCH) as match, \
+         patch("app.agents.pipeline.plan_strategy", new_callable=AsyncMock, return_value=STRATEGY) as strategy, \
+         patch("app.agents.pipeline.generate_content", new_callable=AsyncMock, return_value=CONTENT) as content:
+        yield {"resume": resume, "job": job, "match": match, "strategy": strategy, "content": content}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reuses_unchanged_stages(mock_agents):
+    first = await run_analysis_pipeline("resume text", "job description")
+    records = first.to_stage_records()
+
+    assert records["content"]["output"]["elevator_pitch"] == "Pitch"
+    assert all(mock.call_count == 1 for mock in mock_agents.values())
+
+    second = await run_analysis_pipeline("resume text", "job description", previous=records)
+
+    assert set(second.reused_stages) == {"resume", "job", "match", "strategy", "content"}
+    assert all(mock.call_count == 1 for mock in mock_agents.values())
+
+
+@pytest.mark.asyncio
+async def test_pipeline_force_regenerates_single_stage(mock_agents):
+    records = (await run_analysis_pipeline("resume text", "job description")).to_stage_records()
+
+    result = await run_analysis_pipeline(
+        "resume text", "job description", previous=records, force=["content"]
+    )
+
+    assert "content" not in result.reused_stages
+    assert mock_agents["content"].call_count == 2
+    assert mock_agents["strategy"].call_count == 1
+    assert mock_agents["resume"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_quick_mode_defers_strategy_and_content(mock_agents):
+    quick = await run_analysis_pipeline("resume text", "job description", quick=True)
+
+    assert quick.strategy is None and quick.content is None
+    assert mock_agents["strategy"].call_count == 0
+    assert mock_agents["content"].call_count == 0
+
+    full = await run_analysis_pipeline(
+        "resume text", "job description", previous=quick.to_stage_records()
+    )
+
+    assert full.content == CONTENT
+    assert set(full.reused_stages) == {"resume", "job", "match"}
+    assert mock_agents["match"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_failed_stage_and_retries_from_checkpoint(mock_agents):
+    mock_agents["strategy"].side_effect = Exception("Provider 500")
+    checkpoints = []
+
+    async def checkpoint(partial):
+        checkpoints.append(partial.to_stage_records())
+
+    failed = await run_analysis_pipeline("resume text", "job description", checkpoint=checkpoint)
+    records = failed.to_stage_records()
+
+    assert failed.failed_stages == ["strategy"]
+    assert records["strategy"]["status"] == "failed"
+    assert "Provider 500" in records["strategy"]["error"]
+    assert records["content"]["status"] == "pending"
+    assert checkpoints[0]["match"]["status"] == "completed"
+    assert checkpoints[-1] == records
+    assert mock_agents["content"].call_count == 0
+
+    mock_agents["strategy"].side_effect = None
+    retried = await run_analysis_pipeline("resume text", "job description", previous=records)
+
+    assert retried.failed_stages == []
+    assert retried.content == CONTENT
+    assert set(retried.reused_stages) == {"resume", "job", "match"}
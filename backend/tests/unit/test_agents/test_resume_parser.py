@@ -55,3 +55,124 @@ async def test_parse_resume_failure():
         
         with pytest.raises(Exception):
             await parse_resume("text")
+
+@pytest.mark.asyncio
+async def test_parse_resume_long_resume_by_sections():
+    experience_lines = "\n".join(f"Engineer at Company {i} (2015 - 2016) built services" for i in range(80))
+    resume_text = (
+        "John Doe\njohn@example.com\n\n"
+        "Skills\nPython, FastAPI\n\n"
+        f"Experience\n{experience_lines}\n\n"
+        "Education\nBSc Computer Science, State University\n"
+    )
+
+    responses = {
+        "name": '{"name": "John Doe", "email": "john@example.com", "skills": ["Python", "FastAPI"]}',
+        "experience": '{"experience": [{"company": "Company 0", "title": "Engineer", "duration": "2015 - 2016"}]}',
+        "education": '{"education": [{"institution": "State University", "degree": "BSc", "field": "Computer Science"}]}',
+    }
+
+    async def fake_run(prompt):
+        fields = prompt.split("Extract ONLY these fields: ")[1].split(".")[0]
+        result = MagicMock()
+        result.output = responses[fields.split(",")[0]]
+        return result
+
+    with patch("app.agents.resume_parser.resume_parser_agent.run", new_callable=AsyncMock) as mock_run:
+        mock_run.side_effect = fake_run
+
+        result = await parse_resume(resume_text)
+
+        assert mock_run.call_count == 3
+        assert result.name == "John Doe"
+        assert result.skills == ["Python", "FastAPI"]
+        assert result.experience[0].company == "Company 0"
+        assert result.education[0].institution == "State University"
+
+
+def test_segment_resume_detects_headers():
+    from app.utils.resume_sections import segment_resume, HEADER_SECTION
+
+    sections = segment_resume(
+        "Jane Smith\njane@example.com\n"
+        "WORK EXPERIENCE\nEngineer at Acme\n"
+        "Technical Skills:\nPython\n"
+        "Projects\nResume parser\n"
+    )
+
+    assert sections[HEADER_SECTION] == "Jane Smith\njane@example.com"
+    assert sections["experience"] == "Engineer at Acme"
+    assert sections["skills"] == "Python"
+    assert sections["projects"] == "Resume parser"
+
+
+@pytest.mark.asyncio
+async def test_parse_resume_falls_back_to_single_prompt_when_a_section_fails():
+    experience_lines = "\n".join(f"Engineer at Company {i} (2015 - 2016) built services" for i in range(80))
+    resume_text = (
+        "John Doe\njohn@example.com\n\n"
+        "Skills\nPython, FastAPI\n\n"
+        f"Experience\n{experience_lines}\n\n"
+        "Education\nBSc Computer Science, State University\n"
+    )
+
+    responses = {
+        "name": '{"name": "John Doe", "email": "john@example.com", "skills": ["Python", "FastAPI"]}',
+        "experience": "Sorry, I can't help with that.",  # Invalid reply for one group
+        "education": '{"education": [{"institution": "State University", "degree": "BSc", "field": "Computer Science"}]}',
+    }
+    full_parse = '{"name": "John Doe (full)", "skills": ["Python"], "experience": [], "education": []}'
+
+    async def fake_run(prompt):
+        result = MagicMock()
+        if "Extract ONLY these fields: " in prompt:
+            fields = prompt.split("Extract ONLY these fields: ")[1].split(".")[0]
+            result.output = responses[fields.split(",")[0]]
+        else:
+            result.output = full_parse
+        return result
+
+    with patch("app.agents.resume_parser.resume_parser_agent.run", new_callable=AsyncMock) as mock_run:
+        mock_run.side_effect = fake_run
+
+        result = await parse_resume(resume_text)
+
+        assert mock_run.call_count == 4  # Three section groups, then the single prompt
+        assert result.name == "John Doe (full)"
+
+
+@pytest.mark.asyncio
+async def test_failed_section_cancels_the_other_section_calls():
+    import asyncio
+
+    experience_lines = "\n".join(f"Engineer at Company {i} (2015 - 2016) built services" for i in range(80))
+    resume_text = (
+        "John Doe\njohn@example.com\n\n"
+        "Skills\nPython, FastAPI\n\n"
+        f"Experience\n{experience_lines}\n\n"
+        "Education\nBSc Computer Science, State University\n"
+    )
+    cancelled = []
+
+    async def fake_run(prompt):
+        result = MagicMock()
+        if "Extract ONLY these fields: " not in prompt:
+            result.output = '{"name": "John Doe (full)", "skills": [], "experience": [], "education": []}'
+            return result
+        group = prompt.split("Extract ONLY these fields: ")[1].split(".")[0].split(",")[0]
+        if group == "experience":
+            result.output = "Sorry, I can't help with that."
+            return result
+        try:
+            await asyncio.sleep(5)  # A slow call still in flight when another group fails
+        except asyncio.CancelledError:
+            cancelled.append(group)
+            raise
+
+    with patch("app.agents.resume_parser.resume_parser_agent.run", new_callable=AsyncMock) as mock_run:
+        mock_run.side_effect = fake_run
+
+        result = await asyncio.wait_for(parse_resume(resume_text), timeout=2)
+
+    assert result.name == "John Doe (full)"
+    assert sorted(cancelled) == ["education", "name"]
@@ -0,0 +1,102 @@
+import httpx
+import openai
+import pytest
+from unittest.mock import patch
+
+from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from app.agents.base import run_agent
+from app.agents.job_analyzer import job_analyzer_agent
+from app.agents.retry import RetryBudget, RetryPolicy
+
+
+class RecordingSleep:
+    def __init__(self):
+        self.waits = []
+
+    async def __call__(self, seconds):
+        self.waits.append(seconds)
+
+
+def _http_error(status_code, retry_after=None):
+    """ModelHTTPError raised from the OpenAI client error, as the OpenAI model raises it."""
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    response = httpx.Response(status_code, headers=headers, request=httpx.Request("POST", "https://llm.test"))
+    error = ModelHTTPError(status_code, "m")
+    error.__cause__ = openai.APIStatusError("error", response=response, body=None)
+    return error
+
+
+def _failing(*errors):
+    """Model raising each of `errors` in turn, then answering "ok"."""
+    remaining = list(errors)
+
+    def respond(messages, info):
+        if remaining:
+            raise remaining.pop(0)
+        return ModelResponse(parts=[TextPart("ok")])
+
+    return FunctionModel(respond)
+
+
+@pytest.mark.asyncio
+async def test_run_agent_retries_by_failure_class():
+    sleep = RecordingSleep()
+    policy = RetryPolicy(max_retries=3, base_delay=0.5, max_delay=20, seed=1, sleep=sleep)
+    model = _failing(
+        _http_error(429, retry_after="2"),
+        _http_error(503),
+    )
+
+    with patch("app.agents.base.retry_policy", policy), job_analyzer_agent.override(model=model):
+        result = await run_agent(job_analyzer_agent, "hi")
+
+    assert result.output == "ok"
+    assert 2 <= sleep.waits[0] <= 2.5  # Retry-After plus jitter
+    assert 0 <= sleep.waits[1] <= 1.0  # Second retry: full jitter up to base * 2
+    stats = policy.stats()
+    assert stats["failures"]["rate_limit"]["retries"] == 1
+    assert stats["failures"]["server_error"]["retries"] == 1
+    assert stats["budget"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_failures_fail_fast():
+    sleep = RecordingSleep()
+    policy = RetryPolicy(max_retries=3, max_delay=20, sleep=sleep)
+
+    for error in (
+        ModelHTTPError(400, "m"),
+        _http_error(429, retry_after="120"),  # Longer than max_delay
+        UnexpectedModelBehavior("Exceeded maximum retries (3) for output validation"),
+    ):
+        with patch("app.agents.base.retry_policy", policy), job_analyzer_agent.override(model=_failing(error)):
+            with pytest.raises(type(error)):
+                await run_agent(job_analyzer_agent, "hi")
+
+    assert sleep.waits == []
+    failures = policy.stats()["failures"]
+    assert failures["client_error"]["gave_up"] == 1
+    assert failures["rate_limit"]["gave_up"] == 1
+    assert failures["validation"]["gave_up"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_retries_across_calls():
+    sleep = RecordingSleep()
+    policy = RetryPolicy(max_retries=3, budget=RetryBudget(ratio=0.1, burst=2), sleep=sleep)
+
+    async def outage():
+        raise ModelHTTPError(500, "m")
+
+    for _ in range(10):
+        with pytest.raises(ModelHTTPError):
+            await policy.call("job_analyzer", outage)
+
+    # Two burst retries plus 0.1 per call; without a budget: 30 retries
+    budget = policy.stats()["budget"]
+    assert budget["retries"] == 2
+    assert budget["denied"] == 10
+    assert len(sleep.waits) == 2
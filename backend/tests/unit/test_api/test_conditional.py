@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.api.compression import accepted_encodings
+from app.api.conditional import entity_tag, etag_matches
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_entity_tag_changes_with_version():
+    id = uuid4()
+
+    assert entity_tag(id, NOW, None) == entity_tag(id, NOW, None)
+    assert entity_tag(id, NOW, None) != entity_tag(id, NOW, NOW)
+    assert entity_tag(id, NOW, None) != entity_tag(uuid4(), NOW, None)
+
+
+def test_etag_matches_lists_weak_and_encoded_tags():
+    etag = entity_tag(uuid4(), NOW, None)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches(etag[:-1] + '-br"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_accepted_encodings_drops_refused_codings():
+    assert accepted_encodings("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert accepted_encodings("br;q=0.5, gzip;q=1.0") == {"br", "gzip"}
+    assert accepted_encodings("") == set()
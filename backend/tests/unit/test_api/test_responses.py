@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from app.agents import ParsedResumeData
+from app.api.responses import FastJSONResponse, dump_json, type_adapter
+from app.db.models import Analysis, Resume
+from app.schemas.analysis import AnalysisResponse, AnalysisListResponse
+from app.schemas.resume import ResumeResponse
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_analysis(**overrides) -> Analysis:
+    values = dict(
+        id=uuid4(),
+        resume_id=uuid4(),
+        job_description="Backend engineer",
+        match_score=72.5,
+        skill_gaps=[{"skill": "Rust", "importance": "high", "current_level": "none", "recommendation": "Learn"}],
+        suggestions=["Quantify impact"],
+        cold_email="Hello",
+        interview_questions=["Why us?"],
+        stage_results={
+            "match": {"fingerprint": "abc", "output": {"match_score": 72.5}, "status": "completed", "error": None},
+            "strategy": {"fingerprint": None, "output": None, "status": "failed", "error": "timeout"},
+        },
+        created_at=NOW,
+    )
+    values.update(overrides)
+    return Analysis(**values)
+
+
+def test_dump_json_matches_validated_output():
+    analysis = make_analysis()
+
+    dumped = json.loads(dump_json(AnalysisResponse, analysis))
+
+    assert dumped == AnalysisResponse.model_validate(analysis).model_dump(mode="json")
+    assert dumped["failed_stages"] == ["strategy"]
+
+
+def test_dump_json_handles_rows_and_model_instances():
+    resume = Resume(
+        id=uuid4(), filename="cv.pdf", created_at=NOW,
+        parsed_data=ParsedResumeData(name="John Doe", skills=["Python"]).model_dump(mode="json"),
+    )
+    validated = ResumeResponse.model_validate(resume)
+    assert dump_json(ResumeResponse, resume) == dump_json(ResumeResponse, validated)
+
+    analyses = [make_analysis(), make_analysis()]
+    assert json.loads(dump_json(List[AnalysisListResponse], analyses)) == [
+        AnalysisListResponse.model_validate(a).model_dump(mode="json") for a in analyses
+    ]
+
+
+def test_type_adapters_are_cached_and_bytes_pass_through():
+    assert type_adapter(List[AnalysisListResponse]) is type_adapter(List[AnalysisListResponse])
+
+    assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+    assert json.loads(FastJSONResponse({"a": [1, 2]}).body) == {"a": [1, 2]}
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+import httpx
+
+from app.core.jwks import JWKSManager, JWKS_PATHS, cache_ttl
+
+
+def make_manager(handler, **kwargs) -> JWKSManager:
+    manager = JWKSManager("https://example.supabase.co", "key", **kwargs)
+    manager._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return manager
+
+
+def test_cache_ttl_from_cache_control():
+    assert cache_ttl("public, max-age=600", 3600) == 600
+    assert cache_ttl("no-store", 3600) == 0
+    assert cache_ttl(None, 3600) == 3600
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetch_is_coalesced_and_rate_limited():
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"keys": [{"kid": "a"}]})
+
+    manager = make_manager(handler, min_refresh_interval=60)
+    manager._jwks = {"keys": []}
+    manager._expires_at = float("inf")
+
+    keys = await asyncio.gather(*(manager.get_key("a") for _ in range(10)))
+    assert keys == [{"kid": "a"}] * 10
+    assert manager.fetches == 1
+
+    # Unknown kids within the refresh interval don't refetch
+    assert await manager.get_key("forged") is None
+    assert manager.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_working_path_is_remembered_and_cache_control_honoured():
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        if request.url.path != JWKS_PATHS[2]:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"keys": []}, headers={"Cache-Control": "max-age=0"})
+
+    manager = make_manager(handler, min_refresh_interval=0)
+    await manager.get_jwks()
+    assert requests == JWKS_PATHS
+
+    requests.clear()
+    await manager.get_jwks()  # Expired immediately (max-age=0)
+    assert requests == [JWKS_PATHS[2]]
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_stale_keys():
+    async def handler(request):
+        return httpx.Response(503)
+
+    manager = make_manager(handler)
+    manager._jwks = {"keys": [{"kid": "a"}]}
+
+    assert await manager.refresh() == {"keys": [{"kid": "a"}]}
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_survives_unexpected_errors():
+    async def handler(request):
+        if manager.fetches < 3:
+            return httpx.Response(200, content=b"<html>not json</html>")
+        return httpx.Response(200, json={"keys": [{"kid": "b"}]})
+
+    manager = make_manager(handler, min_refresh_interval=0.01)
+    manager._jwks = {"keys": [{"kid": "a"}]}
+    manager._refresh_task = asyncio.create_task(manager._refresh_loop())
+
+    for _ in range(100):
+        if manager._jwks == {"keys": [{"kid": "b"}]}:
+            break
+        await asyncio.sleep(0.01)
+
+    assert manager.fetches == 3  # Two JSON errors (with backoff), then the keys
+    assert manager._jwks == {"keys": [{"kid": "b"}]}
+    assert not manager._refresh_task.done()
+    await manager.stop()
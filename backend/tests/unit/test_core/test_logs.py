@@ -0,0 +1,115 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from app.core.logs import BackgroundSink, Sampler, add_request_id, json_line
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+
+@pytest.fixture
+def capture():
+    """Route loguru through a BackgroundSink writing JSON lines to a buffer."""
+    stream = io.StringIO()
+    sink = BackgroundSink(stream, formatter=json_line, maxsize=100)
+    handler_id = logger.add(sink, level="INFO", format="{message}")
+    patched = logger.patch(add_request_id)
+    yield patched, sink, stream
+    logger.remove(handler_id)
+    sink.stop()
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_background_sink_writes_json_lines(capture):
+    log, sink, stream = capture
+    log.bind(stage="match").info("Stage {} done", "match")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Failed")
+    sink.flush()
+
+    info, error = lines(stream)
+    assert info["message"] == "Stage match done"
+    assert info["level"] == "INFO"
+    assert info["request_id"] == "N/A"
+    assert info["extra"] == {"stage": "match"}
+    assert error["level"] == "ERROR"
+    assert "ValueError: boom" in error["exception"]
+
+
+def test_lazy_debug_is_not_formatted_below_level(capture):
+    log, sink, stream = capture
+    calls = []
+    log.opt(lazy=True).debug("Raw: {}", lambda: calls.append(1) or "x")
+    sink.flush()
+    assert calls == []
+    assert stream.getvalue() == ""
+
+
+def test_full_queue_drops_instead_of_blocking():
+    stream = io.StringIO()
+    sink = BackgroundSink(stream, formatter=lambda record: f"{record['message']}\n", maxsize=2)
+    sink.stop()  # No writer: the queue fills up
+    for n in range(4):
+        sink(type("Message", (str,), {"record": {"message": n}})(""))
+    assert sink.dropped == 2
+
+    sink.flush()
+    assert stream.getvalue() == "[logging] 2 records dropped (queue full)\n0\n1\n"
+
+
+def test_bad_record_is_reported_and_the_rest_are_written(capsys):
+    def formatter(record):
+        if record["message"] == "bad":
+            raise ValueError("cannot format")
+        return f"{record['message']}\n"
+
+    stream = io.StringIO()
+    sink = BackgroundSink(stream, formatter=formatter)
+    sink.stop()
+    for message in ("first", "bad", "last"):
+        sink(type("Message", (str,), {"record": {"message": message}})(""))
+
+    sink.flush()
+    assert stream.getvalue() == "first\nlast\n"
+    err = capsys.readouterr().err
+    assert "Logging error in background sink" in err
+    assert "ValueError: cannot format" in err and "'bad'" in err
+
+
+def test_sampler_uses_longest_prefix_and_keeps_warnings():
+    sampler = Sampler({"app.agents": 0.0, "app.agents.pipeline": 1.0})
+    assert sampler.rate("app.agents.pipeline") == 1.0
+    assert sampler.rate("app.agents.resume_parser") == 0.0
+    assert sampler.rate("app.services.resume") == 1.0
+    assert sampler.rate("app.agentsx") == 1.0
+
+    class Level:
+        def __init__(self, no):
+            self.no = no
+
+    assert not sampler({"name": "app.agents.skill_gap", "level": Level(20)})
+    assert sampler({"name": "app.agents.skill_gap", "level": Level(30)})
+    assert Sampler.parse(" app.utils=0.1, app.db=0.5 ").rates == [("app.utils", 0.1), ("app.db", 0.5)]
+
+
+def test_import_time_records_respect_configured_level():
+    # A fresh interpreter: importing the app builds every agent (which logs)
+    env = {**os.environ, "LOG_LEVEL": "WARNING", "DATABASE_URL": "sqlite+aiosqlite:///:memory:"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "DEBUG" not in result.stderr
@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+
+import pytest
+from uuid import uuid4
+
+from app.core.response_cache import CachedResponse, ResponseCache, SQLiteResponseStore
+
+
+@pytest.mark.asyncio
+async def test_local_tier_hits_and_invalidation():
+    cache = ResponseCache(maxsize=10, ttl=60)
+    user_id, id = uuid4(), uuid4()
+
+    assert await cache.get("analysis", user_id, id) is None
+    await cache.set("analysis", user_id, id, CachedResponse('"v1"', b"{}"))
+    assert await cache.get("analysis", user_id, id) == CachedResponse('"v1"', b"{}")
+    assert await cache.get("analysis", uuid4(), id) is None  # Keyed by owner too
+
+    await cache.invalidate("analysis", user_id, id)
+    assert await cache.get("analysis", user_id, id) is None
+    assert cache.stats()["local"] == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+
+
+@pytest.mark.asyncio
+async def test_set_is_skipped_after_concurrent_invalidation():
+    cache = ResponseCache()
+    user_id, id = uuid4(), uuid4()
+
+    read = cache.start_read()
+    await cache.invalidate("analysis", user_id, id)  # A write lands while the read is in flight
+    await cache.set("analysis", user_id, id, CachedResponse('"stale"', b"{}"), read)
+
+    assert await cache.get("analysis", user_id, id) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_drops_only_that_users_entries_of_kind():
+    cache = ResponseCache()
+    user_id, other_id = uuid4(), uuid4()
+    ids = [uuid4(), uuid4()]
+    for id in ids:
+        await cache.set("analysis", user_id, id, CachedResponse('"a"', b"{}"))
+    await cache.set("resume", user_id, ids[0], CachedResponse('"r"', b"{}"))
+    await cache.set("analysis", other_id, ids[0], CachedResponse('"o"', b"{}"))
+
+    await cache.invalidate_user("analysis", user_id)
+
+    assert [await cache.get("analysis", user_id, id) for id in ids] == [None, None]
+    assert await cache.get("resume", user_id, ids[0]) is not None
+    assert await cache.get("analysis", other_id, ids[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_is_visible_to_other_workers(tmp_path):
+    path = str(tmp_path / "responses.db")
+    worker_a = ResponseCache(shared=SQLiteResponseStore(path, ttl=60), local_ttl=5)
+    worker_b = ResponseCache(shared=SQLiteResponseStore(path, ttl=60), local_ttl=5)
+    user_id, id = uuid4(), uuid4()
+
+    await worker_a.set("resume", user_id, id, CachedResponse('"v1"', b'{"id": 1}'))
+    assert await worker_b.get("resume", user_id, id) == CachedResponse('"v1"', b'{"id": 1}')
+    assert worker_b.stats()["shared"]["hits"] == 1
+    assert worker_b.local.ttl == 5
+
+    await worker_a.invalidate("resume", user_id, id)
+    worker_b.local.clear()  # Local copies expire after local_ttl
+    assert await worker_b.get("resume", user_id, id) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_rejects_reads_started_before_another_workers_invalidation(tmp_path):
+    path = str(tmp_path / "responses.db")
+    worker_a = ResponseCache(shared=SQLiteResponseStore(path, ttl=60), local_ttl=5)
+    worker_b = ResponseCache(shared=SQLiteResponseStore(path, ttl=60), local_ttl=5)
+    user_id, id, other_id = uuid4(), uuid4(), uuid4()
+
+    read = worker_b.start_read()  # B starts loading the pre-update record
+    await worker_a.invalidate("analysis", user_id, id)  # A updates it
+    await worker_b.set("analysis", user_id, id, CachedResponse('"stale"', b"{}"), read)
+    assert await worker_a.get("analysis", user_id, id) is None  # Not published to the shared tier
+
+    read = worker_b.start_read()
+    await worker_a.invalidate_user("analysis", user_id)
+    await worker_b.set("analysis", user_id, other_id, CachedResponse('"stale"', b"{}"), read)
+    assert await worker_a.get("analysis", user_id, other_id) is None
+
+    # Reads that start after the invalidation are stored as usual
+    await worker_b.set("analysis", user_id, id, CachedResponse('"v2"', b"{}"), worker_b.start_read())
+    assert await worker_a.get("analysis", user_id, id) == CachedResponse('"v2"', b"{}")
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_lock_waits_do_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "responses.db")
+    cache = ResponseCache(shared=SQLiteResponseStore(path, ttl=60), local_ttl=5)
+    user_id, id = uuid4(), uuid4()
+
+    # Another worker holds the write lock for a while
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    asyncio.get_running_loop().call_later(0.3, blocker.execute, "COMMIT")
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    await cache.invalidate("analysis", user_id, id)  # Waits for the lock
+    ticker.cancel()
+    blocker.close()
+
+    assert ticks >= 10
+    await cache.set("analysis", user_id, id, CachedResponse('"v2"', b"{}"), cache.start_read())
+    cache.local.clear()
+    assert await cache.get("analysis", user_id, id) == CachedResponse('"v2"', b"{}")
@@ -0,0 +1,95 @@
+import json
+import pytest
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from asgi_correlation_id.context import correlation_id
+
+from app.agents import run_analysis_pipeline, ParsedResumeData, ParsedJobData, MatchAnalysis
+from app.api.server_timing import server_timing
+from app.core.tracing import (
+    JSONLSpanExporter, OTLPSpanExporter, Tracer, request_spans, span, traced, tracer,
+)
+
+
+@pytest.fixture
+def collected():
+    spans = []
+    token = request_spans.set(spans)
+    yield spans
+    request_spans.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_and_carry_the_correlation_id(collected):
+    token = correlation_id.set("0123456789abcdef0123456789abcdef")
+
+    @traced("work.sync")
+    def sync_work():
+        return 1
+
+    @traced("work.async")
+    async def async_work():
+        return sync_work() + 1
+
+    try:
+        async with span("outer", user="u1") as outer:
+            assert await async_work() == 2
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+    finally:
+        correlation_id.reset(token)
+
+    by_name = {s.name: s for s in collected}
+    assert [s.name for s in collected] == ["work.sync", "work.async", "outer", "failing"]
+    assert by_name["work.async"].parent_id == outer.span_id
+    assert by_name["work.sync"].parent_id == by_name["work.async"].span_id
+    assert {s.trace_id for s in collected} == {"0123456789abcdef0123456789abcdef"}
+    assert outer.attributes == {"user": "u1"}
+    assert by_name["failing"].error == "ValueError: boom"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_a_span_per_stage(collected):
+    with patch("app.agents.pipeline.parse_resume", new_callable=AsyncMock) as parse_resume, \
+         patch("app.agents.pipeline.analyze_job_description", new_callable=AsyncMock) as analyze_job, \
+         patch("app.agents.pipeline.analyze_skill_gap", new_callable=AsyncMock) as analyze_gap:
+        parse_resume.return_value = ParsedResumeData(name="John Doe")
+        analyze_job.return_value = ParsedJobData(title="Engineer")
+        analyze_gap.return_value = MatchAnalysis(match_score=70, overall_assessment="Good")
+
+        await run_analysis_pipeline("resume", "job", quick=True)
+
+    assert {s.name for s in collected} == {"stage.resume", "stage.job", "stage.match"}
+    timing = server_timing(collected, total_ms=12.5)
+    assert "stage.match;dur=" in timing
+    assert timing.endswith("total;dur=12.5")
+
+
+@pytest.mark.asyncio
+async def test_exporters_write_jsonl_and_otlp(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    path = tmp_path / "spans.jsonl"
+    otlp = OTLPSpanExporter(
+        "http://collector:4318",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    local = Tracer([JSONLSpanExporter(str(path)), otlp])
+
+    with patch("app.core.tracing.tracer", local):
+        with span("db.query", statement="SELECT"):
+            pass
+    await local.stop()
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["attributes"] == {"statement": "SELECT"}
+    (exported,) = requests[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert exported["name"] == "db.query"
+    assert len(exported["traceId"]) == 32
+    assert tracer.exporters == []  # Nothing exported unless configured